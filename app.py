@@ -1,156 +1,483 @@
+import time
+_import_started = time.perf_counter()
+
 import streamlit as st
 import pandas as pd
 import numpy as np
-import pickle
 import datetime 
-from catboost import CatBoostClassifier
-from neo4j import GraphDatabase
-import plotly.express as px
-import plotly.graph_objects as go
-from streamlit_agraph import agraph, Node, Edge, Config
+import io
+import csv
+import tempfile
+import os
+import uuid
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from config import db_uri, db_user, db_pass, db_name, RISK_THRESHOLD, SNAPSHOT_TTL, GRAPH_VERSION_TTL, QUERY_CACHE_TTL, QUERY_CACHE_MAX_MB, GRAPH_BACKEND, LOCAL_DATA_PATH, LOCAL_DRIVERS_PATH, LOCAL_DRIVER_SUMMARY_PATH, LOCAL_NEIGHBORS_PATH, SPAN_LOG_PATH, ADMIN_TOKEN, QUERY_WORKERS, DRIFT_BASELINE_PATH, DRIFT_LIVE_PATH, SHARED_CACHE_DIR, SHARED_CACHE_MAX_MB
+from query_cache import QueryCache, make_key
+from shared_cache import SharedCache
+from risk_index import build_risk_index
+from queries import QUERIES, GRAPH_REL_TYPES
+from backends import Neo4jBackend, LocalBackend
+from resilience import CircuitOpenError, is_pool_timeout
+from startup import Startup
+from instrumentation import Tracer, JsonlExporter
+from graph_explorer import GraphExplorer, parse_node_id, node_style, EDGE_COLOR
+
+# catboost, neo4j, plotly dan streamlit_agraph diimport saat pertama dipakai
+_import_ms = (time.perf_counter() - _import_started) * 1000
 
 st.set_page_config(page_title="HR Strategic Dashboard", layout="wide", page_icon="🏢")
 
+@st.cache_resource
+def get_tracer():
+    return Tracer(exporter=JsonlExporter(SPAN_LOG_PATH) if SPAN_LOG_PATH else None)
+
+tracer = get_tracer()
+# query yang gagal di rerun ini; ditampilkan sebagai banner, bukan sekadar hasil kosong
+query_errors = {}
+session_id = st.session_state.setdefault("session_id", uuid.uuid4().hex[:8])
+tracer.begin_rerun(session_id)
+
 st.markdown("""
     <style>
     .metric-card {background-color: #f0f2f6; border-radius: 10px; padding: 20px; text-align: center;}
     .high-risk {color: #ff4b4b; font-weight: bold;}
-    .stTabs [data-baseweb="tab-list"] button [data-testid="stMarkdownContainer"] p {
+    div[role="radiogroup"] label p {
     font-size: 1.1rem;
     }
     #MainMenu {visibility: hidden;}
     </style>
 """, unsafe_allow_html=True)
 
-db_uri = "neo4j+s://f1092891.databases.neo4j.io"
-db_user = "neo4j"
-db_pass = "RJlbxkjZP74VnrD6R87vajPEbRS3Xs5YE2UyVZUT2K4"
-db_name = "neo4j"
+def connect_backend():
+    # error koneksi diteruskan agar tampil di halaman (bukan None yang tersimpan selamanya)
+    if GRAPH_BACKEND in ("auto", "neo4j"):
+        try:
+            return Neo4jBackend.connect(db_uri, db_user, db_pass, db_name)
+        except Exception as e:
+            if GRAPH_BACKEND == "neo4j":
+                raise
+            fallback_error = f"{type(e).__name__}: {e}"
+    backend = LocalBackend.from_csv(LOCAL_DATA_PATH, LOCAL_DRIVERS_PATH, LOCAL_DRIVER_SUMMARY_PATH,
+                                    LOCAL_NEIGHBORS_PATH)
+    if GRAPH_BACKEND == "auto":
+        # ditampilkan sebagai banner agar data CSV tidak terbaca sebagai data live
+        backend.fallback_error = fallback_error
+    return backend
 
-@st.cache_resource
-def get_driver(uri, user, password):
+def load_model_files():
     try:
-        driver = GraphDatabase.driver(uri, auth=(user, password))
-        driver.verify_connectivity()
-        return driver
+        from model_store import load_model_bundle
+        return load_model_bundle()
     except:
         return None
 
-def run_cypher(query, params=None):
-    driver = get_driver(db_uri, db_user, db_pass)
-    if driver:
+@st.cache_resource
+def get_startup():
+    # model & koneksi database dimuat paralel di background sejak rerun pertama
+    return Startup({
+        "backend": ("connect", connect_backend),
+        "model": ("model_load", load_model_files),
+    })
+
+@st.cache_resource
+def get_query_cache():
+    return QueryCache(max_bytes=QUERY_CACHE_MAX_MB * 1024 * 1024, default_ttl=QUERY_CACHE_TTL)
+
+@st.cache_resource
+def get_shared_cache():
+    # tier kedua dipakai bersama semua worker Streamlit di host ini; None bila dimatikan
+    if not SHARED_CACHE_DIR:
+        return None
+    try:
+        return SharedCache(SHARED_CACHE_DIR, max_bytes=SHARED_CACHE_MAX_MB * 1024 * 1024,
+                           default_ttl=QUERY_CACHE_TTL)
+    except OSError:
+        return None
+
+def shared_key(backend, *parts):
+    # worker yang membaca sumber data berbeda tidak boleh berbagi entry
+    source = f"{db_uri}/{db_name}" if backend.name == "neo4j" else os.path.abspath(LOCAL_DATA_PATH)
+    return "|".join([backend.name, source, *map(str, parts)])
+
+def get_backend():
+    return get_startup()["backend"].get()
+
+@st.cache_resource
+def get_query_pool():
+    # dipakai bersama semua sesi; dibatasi agar tidak membanjiri pool koneksi Neo4j
+    return ThreadPoolExecutor(max_workers=QUERY_WORKERS, thread_name_prefix="query")
+
+def run_query(name, params=None):
+    return execute_query(get_backend(), get_query_cache(), get_shared_cache(), name, params)
+
+def run_queries(requests):
+    """Jalankan beberapa query independen sekaligus di thread pool.
+    requests: {kunci: (nama_query, params)} -> {kunci: rows}; latensi = query paling lambat."""
+    backend, cache, shared = get_backend(), get_query_cache(), get_shared_cache()
+    if len(requests) <= 1:
+        return {key: execute_query(backend, cache, shared, name, params) for key, (name, params) in requests.items()}
+    pool = get_query_pool()
+    # copy_context: span dari thread pool tetap tercatat di rerun sesi ini
+    futures = {
+        key: pool.submit(contextvars.copy_context().run, execute_query, backend, cache, shared, name, params)
+        for key, (name, params) in requests.items()
+    }
+    return {key: future.result() for key, future in futures.items()}
+
+def execute_query(backend, cache, shared, name, params=None):
+    if backend is None:
+        return []
+    query = QUERIES.get(name)
+    use_cache = backend.cacheable and query.ttl != 0
+    with tracer.span(f"query:{name}", "query", backend=backend.name) as span:
+        if use_cache:
+            hit, rows = cache.get(query.cypher, params)
+            span["cache_hit"] = hit
+            if hit:
+                span["rows"] = len(rows)
+                return rows
+        started = time.perf_counter()
         try:
-            with driver.session(database=db_name) as session:
-                result = session.run(query, params)
-                return [r.data() for r in result]
+            if use_cache and shared is not None:
+                # single-flight: dari semua worker di host ini hanya satu yang menjalankan query
+                rows, computed = shared.get_or_compute(
+                    shared_key(backend, make_key(query.cypher, params)),
+                    lambda: backend.run(name, params), query.ttl)
+                span["shared_hit"] = not computed
+            else:
+                rows, computed = backend.run(name, params), True
         except Exception as e:
+            # halaman tetap jalan dengan hasil kosong; error tercatat di span & banner
+            span["error"] = f"{type(e).__name__}: {e}"
+            query_errors[name] = describe_error(backend, e)
             return []
-    return []
+        if computed:
+            QUERIES.record(name, time.perf_counter() - started, len(rows))
+        span["rows"] = len(rows)
+        if use_cache:
+            span["bytes"] = cache.put(query.cypher, params, rows, query.ttl)
+    return rows
+
+def describe_error(backend, e):
+    if isinstance(e, CircuitOpenError):
+        return str(e)
+    if is_pool_timeout(e):
+        return f"semua {backend.pool_size} koneksi pool sedang dipakai, coba beberapa saat lagi ({e})"
+    return f"{type(e).__name__}: {e}"
+
+def stream_query_csv(name, params=None):
+    # dipanggil oleh st.download_button saat diklik; baris ditulis langsung dari cursor
+    backend = get_backend()
+
+    def build():
+        buf = tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+        text = io.TextIOWrapper(buf, encoding="utf-8", newline="")
+        writer = csv.writer(text)
+        columns, rows = backend.stream(name, params)
+        writer.writerow(columns)
+        writer.writerows(rows)
+        text.flush()
+        text.detach()
+        buf.seek(0)
+        return buf
+
+    return build
+
+@st.cache_data(ttl=GRAPH_VERSION_TTL, show_spinner=False)
+def get_graph_version():
+    rows = run_query("graph_version")
+    return rows[0]["version"] if rows else None
+
+@st.cache_resource(ttl=SNAPSHOT_TTL, show_spinner=False)
+def load_risk_index(graph_version):
+    # satu scan per versi graph; metrik untuk threshold apa pun dihitung dari indeks ini
+    def build():
+        rows = run_query("risk_distribution")
+        if not rows:
+            return None
+        with tracer.span("frame:risk_index", "frame", rows=len(rows)):
+            return build_risk_index(rows, graph_version)
+
+    shared = get_shared_cache()
+    if shared is None:
+        return build()
+    # array indeks dibaca lewat mmap: satu salinan di memori untuk semua worker
+    key = shared_key(get_backend(), "risk_index", graph_version)
+    index, _ = shared.get_or_compute(key, build, SNAPSHOT_TTL)
+    if index is None:
+        shared.invalidate(key)
+    return index
+
+@st.cache_data(ttl=SNAPSHOT_TTL, show_spinner=False)
+def load_driver_summary(graph_version):
+    # agregat SHAP per dept x role dari shap_batch.py; kosong bila belum dijalankan
+    rows = run_query("driver_summary")
+    with tracer.span("frame:driver_summary", "frame", rows=len(rows)):
+        return pd.DataFrame(rows)
+
+def invalidate_snapshot():
+    get_graph_version.clear()
+    load_risk_index.clear()
+    load_driver_summary.clear()
+
+def invalidate_data():
+    # panggil setelah data di Neo4j di-load / di-score ulang; driver & pool koneksi tetap dipakai
+    get_query_cache().invalidate()
+    shared = get_shared_cache()
+    if shared is not None:
+        shared.invalidate()
+    invalidate_snapshot()
+    if get_backend().name == "local":
+        # mode lokal: data ada di memori backend, jadi file CSV dibaca ulang
+        get_startup()["backend"].reset()
+
+def get_model_bundle():
+    return get_startup()["model"].get()
 
-@st.cache_resource
 def load_ml_models():
-    model = CatBoostClassifier()
-    feature_names = []
-    try:
-        model.load_model("catboost_optimized.cbm")
-        with open('feature_names.pkl', 'rb') as f:
-            feature_names = pickle.load(f)
-    except:
-        pass
-    return model, feature_names
+    bundle = get_model_bundle()
+    if bundle is None:
+        return None, []
+    return bundle.model, bundle.feature_names
+
+@st.cache_data(show_spinner=False)
+def feature_importance(model_version, _model, feature_names):
+    # importance global cukup dihitung sekali per versi model (tab3 & tab4)
+    with tracer.span("model:feature_importance", "model"):
+        return pd.DataFrame({
+            'Fitur': feature_names,
+            'Pentingnya': _model.get_feature_importance()
+        }).sort_values(by='Pentingnya', ascending=False)
+
+def format_drivers(names, shap):
+    return ", ".join(f"{name} ({value:+.2f})" for name, value in zip(names, shap))
+
+def driver_breakdown(summary, dept=None, role=None):
+    """Rata-rata kontribusi SHAP per fitur untuk karyawan high risk di dept/role terpilih."""
+    cells = summary
+    if dept:
+        cells = cells[cells['dept'] == dept]
+    if role:
+        cells = cells[cells['role'] == role]
+    agg = cells.groupby('feature')[['risk_shap_sum', 'risk_n']].sum()
+    agg = agg[agg['risk_n'] > 0]
+    return pd.DataFrame({
+        'Fitur': agg.index,
+        'Kontribusi': (agg['risk_shap_sum'] / agg['risk_n']).to_numpy(),
+    }).sort_values('Kontribusi', ascending=False)
+
+def file_mtime(path):
+    return os.path.getmtime(path) if path and os.path.exists(path) else None
+
+@st.cache_data(show_spinner=False)
+def load_drift(baseline_mtime, live_mtime):
+    # ringkasan drift.py; di-cache per mtime file sehingga hasil batch scoring baru langsung terbaca
+    from drift import DriftSummary, drift_report, score_report, aligned_counts
+    with tracer.span("frame:drift", "frame"):
+        baseline, live = DriftSummary.load(DRIFT_BASELINE_PATH), DriftSummary.load(DRIFT_LIVE_PATH)
+        histograms = {name: aligned_counts(sketch, live.features[name])
+                      for name, sketch in baseline.features.items() if name in live.features}
+        return {"report": drift_report(baseline, live), "score": score_report(baseline, live),
+                "histograms": histograms, "rows": (baseline.rows, live.rows), "meta": live.meta}
 
-model, feature_names = load_ml_models()
+@st.cache_resource
+def get_prediction_service():
+    # satu service per proses: submit dari banyak sesi digabung jadi micro-batch
+    from prediction_service import PredictionService
+    bundle = get_model_bundle()
+    return PredictionService(bundle.model, bundle.feature_names, threshold=bundle.threshold)
+
+startup = get_startup()
+startup.timer.record("import", _import_ms, once=True)
 
 st.title("HR Strategic Intelligence System")
 st.markdown("Sistem pendukung keputusan berbasis Graph Database & Machine Learning untuk retensi karyawan.")
 st.caption("Kelompok 9 - Analisis Attrition")
 
-if not get_driver(db_uri, db_user, db_pass):
-    st.error("❌ Gagal terhubung ke Database. Periksa kredensial di dalam kode source.")
+error_slot = st.empty()
+
+_connect_started = time.perf_counter()
+try:
+    backend = get_backend()
+except Exception as e:
+    # kegagalan tidak disimpan: rerun berikutnya mencoba terhubung lagi
+    startup["backend"].reset()
+    st.error(f"❌ Gagal terhubung ke database: {type(e).__name__}: {e}")
+    st.button("🔁 Coba lagi", key="retry_connect")
     st.stop()
+startup.timer.record("wait_backend", (time.perf_counter() - _connect_started) * 1000, once=True)
+
+if backend.fallback_error:
+    st.error(f"⚠️ Neo4j tidak bisa dihubungi ({backend.fallback_error}). Dashboard menampilkan data CSV lokal "
+             f"`{LOCAL_DATA_PATH}`, BUKAN data live dari database.")
+    if st.button("🔁 Hubungkan ulang ke Neo4j", key="retry_neo4j"):
+        # backend & snapshot dimuat ulang; tetap CSV lokal bila Neo4j masih tidak bisa dihubungi
+        startup["backend"].reset()
+        invalidate_snapshot()
+        st.rerun()
+
+with st.sidebar:
+    if backend.name == "local":
+        st.info(f"💻 Mode lokal: data dibaca dari `{LOCAL_DATA_PATH}` (tanpa Neo4j).")
+
+    if st.button("🔄 Muat Ulang Data", help="Hapus cache query & snapshot lalu ambil ulang dari database"):
+        invalidate_data()
+
+    cache_stats = get_query_cache().stats()
+    st.caption(
+        f"Cache query: {cache_stats['hits']} hit / {cache_stats['misses']} miss "
+        f"({cache_stats['hit_rate']:.0%}) · {cache_stats['entries']} entry · "
+        f"{cache_stats['bytes'] / 1024:.0f} KB"
+    )
+    shared = get_shared_cache()
+    if shared is not None:
+        shared_stats = shared.stats()
+        st.caption(
+            f"Cache bersama host: {shared_stats['hits'] + shared_stats['waits']} hit / "
+            f"{shared_stats['computes']} hitung ulang · {shared_stats['entries']} entry · "
+            f"{shared_stats['bytes'] / 1024:.0f} KB"
+        )
 
-kpi_data = run_cypher("""
-MATCH (e:Employee)
-RETURN 
-    count(e) as total, 
-    sum(case when e.AttritionRisk >= 0.279 then 1 else 0 end) as risk_count,
-    avg(e.AttritionRisk) as avg_risk
-""")
-
-if kpi_data:
-    kpi = kpi_data[0]
-    total = kpi['total']
-    risk = kpi['risk_count']
-    risk_pct = (risk / total * 100) if total > 0 else 0
+    health = backend.health()
+    if health:
+        with st.expander("🩺 Koneksi Neo4j"):
+            breaker = health["breaker"]
+            st.caption(
+                f"Circuit breaker: **{breaker['state']}** · {breaker['consecutive_failures']} gagal beruntun · "
+                f"{breaker['rejected']} ditolak · sesi aktif {health['in_flight']} "
+                f"(puncak {health['peak_in_flight']}) dari pool {health['pool_size']}"
+            )
+            st.dataframe(pd.DataFrame([
+                {"tahap": "antre pool", "p50_ms": health["acquire_p50_ms"], "p95_ms": health["acquire_p95_ms"]},
+                {"tahap": "query", "p50_ms": health["query_p50_ms"], "p95_ms": health["query_p95_ms"]},
+            ]).round(1), hide_index=True, use_container_width=True)
+            st.caption(
+                f"{health['calls']} panggilan · {health['retries']} retry · {health['errors']} error · "
+                f"{health['pool_timeouts']} timeout pool"
+            )
+            if health["last_error"]:
+                st.caption(f"Error terakhir: {health['last_error']}")
+
+    with st.expander("⏱️ Waktu Query"):
+        query_stats = QUERIES.stats()
+        if query_stats:
+            st.dataframe(
+                pd.DataFrame(query_stats)[["query", "calls", "avg_ms", "max_ms", "last_ms", "rows"]].round(1),
+                hide_index=True, use_container_width=True
+            )
+        else:
+            st.caption("Belum ada query yang dijalankan.")
+
+    with st.expander("🚀 Waktu Startup"):
+        startup_report = startup.timer.report()
+        if startup_report:
+            st.dataframe(pd.DataFrame(startup_report).round(1), hide_index=True, use_container_width=True)
+        if startup['model'].ready():
+            bundle = get_model_bundle()
+            st.caption(f"Model: {bundle.version if bundle else 'gagal dimuat'}")
+        else:
+            st.caption("Model: memuat di background…")
+
+risk_index = load_risk_index(get_graph_version())
+if risk_index is None:
+    # jangan simpan hasil kosong (mis. koneksi putus) selama TTL snapshot
+    load_risk_index.clear()
+
+# threshold model aktif (artefak train.py) sama dengan tab kalkulator & PredictionService.
+# Selama model masih dimuat di background, dibaca dari metadata.json (tanpa import catboost)
+# agar rerun tidak menunggu model. Dibulatkan ke step slider.
+if startup["model"].ready() and get_model_bundle() is not None:
+    model_threshold = get_model_bundle().threshold
+else:
+    from model_store import artifact_threshold
+    model_threshold = artifact_threshold()
+model_threshold = round(model_threshold, 3)
+
+with st.sidebar:
+    st.markdown("---")
+    st.session_state.setdefault("risk_threshold", model_threshold)
+    threshold = st.slider(
+        "🎚️ Threshold Risiko", 0.05, 0.95, step=0.001, format="%.3f", key="risk_threshold",
+        help="Karyawan dengan AttritionRisk ≥ threshold dihitung high risk. Semua metrik dihitung ulang dari indeks di memori."
+    )
+    if threshold != model_threshold:
+        st.button("↺ Kembali ke threshold model", on_click=st.session_state.update,
+                  kwargs={"risk_threshold": model_threshold}, key="reset_threshold")
+
+with tracer.span("frame:snapshot", "frame"):
+    snap = risk_index.snapshot(threshold) if risk_index else None
+
+if snap:
+    total = snap.total
+    risk = snap.risk_count
+    risk_pct = snap.risk_pct
     
     col1, col2, col3, col4 = st.columns(4)
     col1.metric("Total Karyawan", f"{total:,}")
     col2.metric("Karyawan High Risk", f"{risk}", delta=f"{risk_pct:.1f}%", delta_color="inverse")
-    col3.metric("Rata-rata Risiko Organisasi", f"{kpi['avg_risk']:.2%}")
-    col4.metric("Threshold Model", "27.9%")
+    col3.metric("Rata-rata Risiko Organisasi", f"{snap.avg_risk or 0:.2%}")
+    col4.metric("Threshold", f"{threshold:.1%}",
+                delta=None if threshold == model_threshold else f"{threshold - model_threshold:+.1%} vs model",
+                delta_color="off")
     st.divider()
 
-tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
+# hanya view yang dipilih yang dieksekusi; st.tabs menjalankan keenam tab di setiap rerun
+VIEWS = [
     "Peta Risiko Departemen", 
     "Monitor Karyawan High-Risk", 
     "Analisis Akar Masalah", 
     "Laporan & Solusi",
     "Kalkulator Risiko Individu",
     "Graph Explorer"
-])
+]
+active_view = st.radio("Tampilan", VIEWS, horizontal=True, key="active_view", label_visibility="collapsed")
 
-with tab1:
+if active_view == VIEWS[0]:
     st.subheader("Peta Risiko Departemen")
     
     c1, c2 = st.columns([2, 1])
     
     with c1:
-        q_sunburst = """
-        MATCH (e:Employee)
-        WHERE e.AttritionRisk >= 0.279
-        RETURN e.Department as Dept, e.JobRole as Role, count(e) as Jumlah
-        """
-        df_sun = pd.DataFrame(run_cypher(q_sunburst))
+        df_sun = snap.risk_hierarchy() if snap else pd.DataFrame()
         
         if not df_sun.empty:
-            fig_sun = px.sunburst(
-                df_sun, 
-                path=['Dept', 'Role'], 
-                values='Jumlah',
-                color='Jumlah',
-                color_continuous_scale='Reds',
-                title="Hierarki Karyawan Berisiko Tinggi (Klik untuk Drill-down)"
-            )
-            st.plotly_chart(fig_sun, use_container_width=True)
+            import plotly.express as px
+            with tracer.span("chart:tab1_sunburst", "chart", rows=len(df_sun)):
+                fig_sun = px.sunburst(
+                    df_sun, 
+                    path=['Dept', 'Role'], 
+                    values='Jumlah',
+                    color='Jumlah',
+                    color_continuous_scale='Reds',
+                    title="Hierarki Karyawan Berisiko Tinggi (Klik untuk Drill-down)"
+                )
+                st.plotly_chart(fig_sun, use_container_width=True)
         else:
             st.info("Data tidak cukup untuk visualisasi hierarki.")
 
     with c2:
         st.subheader("Top 5 Job Role Kritis")
-        q_role = """
-        MATCH (e:Employee)-[:HAS_ROLE]->(r:JobRole)
-        WHERE e.AttritionRisk >= 0.279
-        RETURN r.name as Role, count(e) as Count
-        ORDER BY Count DESC LIMIT 5
-        """
-        df_role = pd.DataFrame(run_cypher(q_role))
+        df_role = snap.top_roles(5) if snap else pd.DataFrame()
         if not df_role.empty:
             st.dataframe(df_role.style.background_gradient(cmap="Reds"), use_container_width=True)
 
-q_mapping = """
-MATCH (d:Department)<-[:WORKS_IN]-(e:Employee)-[:HAS_ROLE]->(r:JobRole)
-RETURN d.name AS dept, collect(DISTINCT r.name) AS roles
-ORDER BY dept
-"""
-mapping_raw = run_cypher(q_mapping)
+dept_to_roles = snap.dept_to_roles if snap else {}
 
-dept_to_roles = { row["dept"]: row["roles"] for row in mapping_raw }
+def _tab2_next_page():
+    cursor = st.session_state.get("tab2_next_cursor")
+    if cursor:
+        st.session_state["tab2_cursors"].append(cursor)
 
-with tab2:
+def _tab2_prev_page():
+    if len(st.session_state["tab2_cursors"]) > 1:
+        st.session_state["tab2_cursors"].pop()
+
+if active_view == VIEWS[1]:
     st.subheader("Analisis Jaringan Karyawan")
     st.markdown("Mengidentifikasi karyawan kunci dalam jaringan.")
     
-    col_sel1, col_sel2 = st.columns(2)
+    col_sel1, col_sel2, col_sel3 = st.columns([2, 2, 1])
 
     with col_sel1:
         dept_filter = st.selectbox(
@@ -171,54 +498,106 @@ with tab2:
             key="tab2_role_filter"
         )
 
-    q_graph = """
-    MATCH (e:Employee)-[:WORKS_IN]->(d:Department)
-    MATCH (e)-[:HAS_ROLE]->(r:JobRole)
-    WHERE toFloat(e.AttritionRisk) >= 0.279
-    """
+    with col_sel3:
+        page_size = st.selectbox("Baris per halaman:", [25, 50, 100, 250], key="tab2_page_size")
 
-    if dept_filter != "Semua":
-        q_graph += f" AND d.name = '{dept_filter}'" 
+    filter_params = {
+        "threshold": threshold,
+        "dept": None if dept_filter == "Semua" else dept_filter,
+        "role": None if role_filter == "Semua" else role_filter,
+    }
 
-    if role_filter != "Semua":
-        q_graph += f" AND r.name = '{role_filter}'" 
+    page_key = (dept_filter, role_filter, page_size, threshold)
+    if st.session_state.get("tab2_page_key") != page_key:
+        st.session_state["tab2_page_key"] = page_key
+        st.session_state["tab2_cursors"] = [None]
+    cursors = st.session_state["tab2_cursors"]
+    after = cursors[-1] or {"after_risk": None, "after_id": None}
 
-    q_graph += """ 
-    RETURN e.EmployeeID, r.name as Role, d.name as Dept, e.MonthlyIncome as Gaji, 
-           toFloat(e.AttritionRisk) as Risk 
-    ORDER BY Risk DESC 
-    """ 
-        
-    df_graph = pd.DataFrame(run_cypher(q_graph))
+    # jumlah dari indeks risiko (tanpa query); keyset pagination: (Risk, EmployeeID) baris terakhir halaman sebelumnya
+    total_match = risk_index.count(threshold, filter_params["dept"], filter_params["role"]) if risk_index else 0
+    page_rows = run_query("high_risk_page", {**filter_params, "limit": page_size + 1, **after})
+    has_next = len(page_rows) > page_size
+    with tracer.span("frame:tab2_page", "frame", rows=min(len(page_rows), page_size)):
+        df_graph = pd.DataFrame(page_rows[:page_size])
     if not df_graph.empty:
-        df_graph.index = np.arange(1, len(df_graph) + 1)
-        st.caption(f"Menampilkan **{len(df_graph)}** Karyawan Berisiko Tertinggi:")
+        last = df_graph.iloc[-1]
+        st.session_state["tab2_next_cursor"] = (
+            {"after_risk": float(last['Risk']), "after_id": int(last['e.EmployeeID'])} if has_next else None
+        )
+
+        page_ids = {"ids": [int(i) for i in df_graph['e.EmployeeID']]}
+        page_extra = run_queries({
+            "drivers": ("employee_drivers", page_ids),
+            "similar": ("similar_attrition", page_ids),
+        })
+        if page_extra["drivers"]:
+            drivers = {row['id']: format_drivers(row['drivers'], row['shap']) for row in page_extra["drivers"]}
+            df_graph['Pemicu Utama'] = df_graph['e.EmployeeID'].map(drivers).fillna("-")
+        if page_extra["similar"]:
+            similar_left = {row['id']: f"{row['left']}/{row['k']}" for row in page_extra["similar"]}
+            df_graph['Rekan Serupa Keluar'] = df_graph['e.EmployeeID'].map(similar_left).fillna("-")
+
+        start = (len(cursors) - 1) * page_size
+        df_graph.index = np.arange(start + 1, start + len(df_graph) + 1)
+        st.caption(
+            f"Menampilkan **{start + 1}–{start + len(df_graph)}** dari **{total_match}** Karyawan Berisiko Tertinggi:"
+        )
         
-        df_graph['Risk'] = df_graph['Risk'].apply(lambda x: f"{x:.1%}")
-        df_graph['Gaji'] = df_graph['Gaji'].apply(lambda x: f"${x:,}")
+        df_graph['Risk'] = (df_graph['Risk'] * 100).round(1).astype(str) + "%"
+        df_graph['Gaji'] = "$" + df_graph['Gaji'].map("{:,}".format)
         
-        st.dataframe(df_graph, use_container_width=True)
+        with tracer.span("chart:tab2_table", "chart", rows=len(df_graph)):
+            st.dataframe(df_graph, use_container_width=True)
+
+        nav1, nav2, nav3 = st.columns([1, 1, 3])
+        nav1.button("⬅️ Sebelumnya", on_click=_tab2_prev_page, disabled=len(cursors) == 1, key="tab2_prev")
+        nav2.button("Berikutnya ➡️", on_click=_tab2_next_page, disabled=not has_next, key="tab2_next")
+        with nav3:
+            st.download_button(
+                label="📥 Ekspor Semua (.csv)",
+                data=stream_query_csv("high_risk_export", filter_params),
+                file_name=f"high_risk_{datetime.date.today()}.csv",
+                mime="text/csv",
+                key="tab2_export"
+            )
+
+        if page_extra["similar"]:
+            st.markdown("##### 🔎 Karyawan Serupa")
+            similar_for = st.selectbox("Bandingkan dengan rekan paling mirip:", df_graph['e.EmployeeID'].tolist(),
+                                       key="tab2_similar_for")
+            similar_rows = run_query("similar_employees", {"id": int(similar_for), "limit": 10})
+            if similar_rows:
+                df_similar = pd.DataFrame(similar_rows)
+                n_left = int(df_similar['Attrition'].fillna(0).sum())
+                st.caption(f"**{n_left}** dari {len(df_similar)} rekan paling mirip dengan karyawan {similar_for} "
+                           f"tercatat keluar (Attrition).")
+                df_similar['Risk'] = (df_similar['Risk'] * 100).round(1).astype(str) + "%"
+                df_similar['Attrition'] = df_similar['Attrition'].map({1: "Keluar", 0: "Bertahan"}).fillna("-")
+                st.dataframe(
+                    df_similar.rename(columns={"id": "EmployeeID", "score": "Kemiripan"}).drop(columns="rank"),
+                    hide_index=True, use_container_width=True
+                )
     else:
         st.info("Tidak ada data karyawan berisiko pada filter ini.")
         
-with tab3:
+if active_view == VIEWS[2]:
     st.subheader("Alasan Akar Masalah Karyawan Keluar")
     st.caption("Analisis dilakukan menggunakan Model CatBoost untuk mengetahui akar masalah.")
     
+    model, feature_names = load_ml_models()
     if model:
-        feat_imp = model.get_feature_importance()
-        df_imp = pd.DataFrame({
-            'Fitur': feature_names,
-            'Pentingnya': feat_imp
-        }).sort_values(by='Pentingnya', ascending=False).head(10)
+        import plotly.express as px
+        df_imp = feature_importance(get_model_bundle().version, model, feature_names).head(10)
         
-        fig_imp = px.bar(
-            df_imp, x='Pentingnya', y='Fitur', orientation='h',
-            title="10 Faktor Utama Penyebab Attrition",
-            color='Pentingnya', color_continuous_scale='Blues'
-        )
-        fig_imp.update_layout(yaxis=dict(autorange="reversed")) 
-        st.plotly_chart(fig_imp, use_container_width=True)
+        with tracer.span("chart:tab3_importance", "chart", rows=len(df_imp)):
+            fig_imp = px.bar(
+                df_imp, x='Pentingnya', y='Fitur', orientation='h',
+                title="10 Faktor Utama Penyebab Attrition",
+                color='Pentingnya', color_continuous_scale='Blues'
+            )
+            fig_imp.update_layout(yaxis=dict(autorange="reversed")) 
+            st.plotly_chart(fig_imp, use_container_width=True)
         
         if not df_imp.empty:
             top_factor = df_imp.iloc[0]['Fitur']
@@ -226,17 +605,56 @@ with tab3:
     else:
         st.error("Model tidak ditemukan.")
 
-with tab4:
+    st.markdown("---")
+    st.subheader("Pemicu Risiko per Departemen & Role")
+    driver_summary = load_driver_summary(snap.version if snap else None)
+    if driver_summary.empty:
+        st.caption("Belum ada penjelasan SHAP. Jalankan `python shap_batch.py` untuk menghitungnya.")
+    else:
+        # risk_n dihitung shap_batch.py pada threshold saat itu; tidak ikut slider
+        shap_threshold = (driver_summary['threshold'].dropna().iloc[0]
+                          if 'threshold' in driver_summary and driver_summary['threshold'].notna().any() else None)
+        if shap_threshold is None:
+            st.caption("⚠️ Threshold high risk saat `shap_batch.py` dijalankan tidak tercatat; jalankan ulang untuk melabeli panel ini.")
+        elif round(shap_threshold, 3) != threshold:
+            st.caption(
+                f"⚠️ Panel ini memakai threshold {shap_threshold:.1%} saat `shap_batch.py` dijalankan, "
+                f"bukan threshold slider ({threshold:.1%}); jumlah high risk bisa berbeda dengan KPI di atas."
+            )
+        col_d, col_r = st.columns(2)
+        with col_d:
+            shap_dept = st.selectbox("Departemen:", ["Semua"] + list(dept_to_roles.keys()), key="tab3_dept")
+        with col_r:
+            shap_roles = ["Semua"] + (dept_to_roles[shap_dept] if shap_dept != "Semua" else [])
+            shap_role = st.selectbox("Job Role:", shap_roles, key="tab3_role")
+        df_drv = driver_breakdown(
+            driver_summary,
+            None if shap_dept == "Semua" else shap_dept,
+            None if shap_role == "Semua" else shap_role,
+        ).head(10)
+        if df_drv.empty:
+            st.info("Tidak ada karyawan high risk pada kelompok ini.")
+        else:
+            import plotly.express as px
+            with tracer.span("chart:tab3_drivers", "chart", rows=len(df_drv)):
+                fig_drv = px.bar(
+                    df_drv, x='Kontribusi', y='Fitur', orientation='h',
+                    title="Rata-rata Kontribusi SHAP pada Karyawan High Risk"
+                          + (f" (risk ≥ {shap_threshold:.1%})" if shap_threshold is not None else ""),
+                    color='Kontribusi', color_continuous_scale='RdBu_r', color_continuous_midpoint=0
+                )
+                fig_drv.update_layout(yaxis=dict(autorange="reversed"))
+                st.plotly_chart(fig_drv, use_container_width=True)
+            st.caption("Nilai positif mendorong risiko naik (skala log-odds model).")
+
+if active_view == VIEWS[3]:
     st.subheader("Laporan & Rekomendasi Tindakan")
     
     rekomendasi = []
     
     try:
-        avg_income_risk_data = run_cypher("MATCH (e:Employee) WHERE e.AttritionRisk >= 0.279 RETURN avg(e.MonthlyIncome) as inc")
-        avg_income_safe_data = run_cypher("MATCH (e:Employee) WHERE e.AttritionRisk < 0.279 RETURN avg(e.MonthlyIncome) as inc")
-        
-        avg_income_risk = avg_income_risk_data[0]['inc'] if avg_income_risk_data else 0
-        avg_income_safe = avg_income_safe_data[0]['inc'] if avg_income_safe_data else 0
+        avg_income_risk = snap.avg_income_risk if snap else 0
+        avg_income_safe = snap.avg_income_safe if snap else 0
         
         if avg_income_risk and avg_income_safe:
             gap = (avg_income_safe - avg_income_risk) / avg_income_safe
@@ -251,8 +669,7 @@ with tab4:
         pass
             
     try:
-        ot_risk_data = run_cypher("MATCH (e:Employee) WHERE e.AttritionRisk >= 0.279 AND e.OverTime = 'Yes' RETURN count(e) as c")
-        ot_risk = ot_risk_data[0]['c'] if ot_risk_data else 0
+        ot_risk = snap.overtime_risk if snap else 0
         if ot_risk > (risk / 2 if risk > 0 else 0): 
             rekomendasi.append({
                 "Area": "⏰ Work-Life Balance",
@@ -264,8 +681,7 @@ with tab4:
         pass
         
     try:
-        sat_risk_data = run_cypher("MATCH (e:Employee) WHERE e.AttritionRisk >= 0.279 RETURN avg(e.EnvironmentSatisfaction) as s")
-        sat_risk = sat_risk_data[0]['s'] if sat_risk_data else 0
+        sat_risk = snap.avg_env_satisfaction_risk if snap else 0
         if sat_risk is not None and sat_risk < 2.5:
             rekomendasi.append({
                 "Area": "🏢 Lingkungan Kerja",
@@ -284,12 +700,79 @@ with tab4:
     else:
         st.success("Berdasarkan data saat ini, tidak ada anomali ekstrem yang terdeteksi secara otomatis.")
 
-    q_dept_txt = "MATCH (e:Employee) WHERE e.AttritionRisk >= 0.279 RETURN e.Department as Dept, count(e) as Jumlah ORDER BY Jumlah DESC LIMIT 3"
-    dept_txt_data = pd.DataFrame(run_cypher(q_dept_txt))
+    if risk_index:
+        st.markdown("---")
+        st.subheader("Trade-off Threshold")
+        with tracer.span("frame:tradeoff", "frame"):
+            df_curve = risk_index.tradeoff(np.round(np.arange(0.05, 0.951, 0.005), 3))
+            current = risk_index.tradeoff([threshold]).iloc[0]
+        m1, m2, m3 = st.columns(3)
+        m1.metric("Ditandai High Risk", f"{int(current['Flagged']):,}", delta=f"{current['Share']:.1%}", delta_color="off")
+        if risk_index.has_labels:
+            m2.metric("Precision", f"{current['Precision']:.1%}")
+            m3.metric("Recall", f"{current['Recall']:.1%}")
+        import plotly.express as px
+        curve_cols = ["Porsi Ditandai", "Precision", "Recall"] if risk_index.has_labels else ["Porsi Ditandai"]
+        with tracer.span("chart:tab4_tradeoff", "chart", rows=len(df_curve)):
+            fig_curve = px.line(
+                df_curve.rename(columns={"Share": "Porsi Ditandai"}), x="Threshold", y=curve_cols,
+                labels={"value": "Nilai", "variable": "Metrik"},
+                title="Porsi Karyawan Ditandai, Precision & Recall per Threshold"
+            )
+            fig_curve.add_vline(x=threshold, line_dash="dash", line_color="red")
+            fig_curve.update_yaxes(tickformat=".0%")
+            st.plotly_chart(fig_curve, use_container_width=True)
+        if risk_index.has_labels:
+            st.caption("Precision/recall dihitung terhadap label Attrition historis di data yang juga dipakai melatih model, "
+                       "sehingga cenderung optimistis. Geser slider threshold di sidebar untuk membandingkan.")
+
+    st.markdown("---")
+    st.subheader("Monitor Drift Data")
+    drift_mtimes = (file_mtime(DRIFT_BASELINE_PATH), file_mtime(DRIFT_LIVE_PATH))
+    if None in drift_mtimes:
+        st.caption("Belum ada ringkasan drift. Jalankan `python drift.py baseline`, lalu `python drift.py update` "
+                   "atau `python batch_scoring.py ... --drift drift_live.json`.")
+    else:
+        drift = load_drift(*drift_mtimes)
+        df_drift, score_drift = drift["report"], drift["score"]
+        n_drift = int((df_drift["Status"] == "DRIFT").sum())
+        n_shift = int((df_drift["Status"] == "BERGESER").sum())
+        dm1, dm2, dm3, dm4 = st.columns(4)
+        dm1.metric("Fitur Drift", f"{n_drift}/{len(df_drift)}", delta=f"{n_shift} bergeser", delta_color="off")
+        if score_drift["psi"] is not None:
+            dm2.metric("PSI Skor Risiko", f"{score_drift['psi']:.3f}")
+            dm3.metric(f"High Risk (≥ {score_drift['threshold']:.1%})", f"{score_drift['share_live']:.1%}",
+                       delta=f"{score_drift['share_live'] - score_drift['share_baseline']:+.1%} vs training",
+                       delta_color="inverse")
+        if score_drift["precision_live"] is not None and score_drift["precision_baseline"] is not None:
+            dm4.metric("Precision @threshold", f"{score_drift['precision_live']:.1%}",
+                       delta=f"{score_drift['precision_live'] - score_drift['precision_baseline']:+.1%} vs training")
+        st.dataframe(
+            df_drift.style.format({"PSI": "{:.3f}", "KS": "{:.3f}", "Kosong": "{:.1%}"}, na_rep="-"),
+            hide_index=True, use_container_width=True
+        )
+        drift_feature = st.selectbox("Bandingkan distribusi fitur:", df_drift["Fitur"].tolist(), key="tab4_drift_feature")
+        base_counts, live_counts, bin_labels = drift["histograms"][drift_feature]
+        df_hist = pd.DataFrame({
+            "Bin": bin_labels * 2,
+            "Porsi": np.concatenate([np.asarray(base_counts) / max(sum(base_counts), 1),
+                                     np.asarray(live_counts) / max(sum(live_counts), 1)]),
+            "Data": ["Training"] * len(bin_labels) + ["Live"] * len(bin_labels),
+        })
+        import plotly.express as px
+        with tracer.span("chart:tab4_drift", "chart", rows=len(df_hist)):
+            fig_drift = px.bar(df_hist, x="Bin", y="Porsi", color="Data", barmode="group",
+                               title=f"Distribusi {drift_feature}: Training vs Live")
+            fig_drift.update_yaxes(tickformat=".0%")
+            st.plotly_chart(fig_drift, use_container_width=True)
+        base_rows, live_rows = drift["rows"]
+        st.caption(f"Training {base_rows:,} baris vs live {live_rows:,} baris "
+                   f"(diperbarui {drift['meta'].get('updated_at', '-')}). PSI < 0.1 stabil, 0.1–0.25 bergeser, > 0.25 drift.")
+
+    dept_txt_data = snap.top_departments(3) if snap else pd.DataFrame()
     dept_str = "\n".join([f"   - {row['Dept']}: {row['Jumlah']} orang" for i, row in dept_txt_data.iterrows()]) if not dept_txt_data.empty else "   - Tidak ada data"
 
-    q_role_txt = "MATCH (e:Employee)-[:HAS_ROLE]->(r:JobRole) WHERE e.AttritionRisk >= 0.279 RETURN r.name as Role, count(e) as Count ORDER BY Count DESC LIMIT 5"
-    role_txt_data = pd.DataFrame(run_cypher(q_role_txt))
+    role_txt_data = snap.top_roles(5) if snap else pd.DataFrame()
     role_str = "\n".join([f"   - {row['Role']}: {row['Count']} orang" for i, row in role_txt_data.iterrows()]) if not role_txt_data.empty else "   - Tidak ada data"
 
     rec_str = ""
@@ -307,14 +790,14 @@ with tab4:
 Dibuat oleh : HR Strategic Intelligence System (Kelompok 9)
 Tanggal     : {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 Database    : {db_name}
-Model Threshold: 27.9%
+Threshold   : {threshold:.1%} (model: {model_threshold:.1%})
 
 -------------------------------------------------------------
 1. RINGKASAN KINERJA ORGANISASI (KPI)
 -------------------------------------------------------------
 - Total Karyawan      : {total}
 - Karyawan High Risk  : {risk} ({risk_pct:.2f}%)
-- Rata-rata Risiko    : {kpi['avg_risk']:.2%}
+- Rata-rata Risiko    : {snap.avg_risk or 0:.2%}
 
 -------------------------------------------------------------
 2. PETA RISIKO (Graph Insights)
@@ -332,11 +815,11 @@ Faktor-faktor yang paling memengaruhi keputusan karyawan untuk keluar
 berdasarkan model Machine Learning:
 
 """
+    model, feature_names = load_ml_models()
     if model:
-        fi = model.get_feature_importance()
-        df_fi = pd.DataFrame({'F': feature_names, 'I': fi}).sort_values('I', ascending=False).head(5)
+        df_fi = feature_importance(get_model_bundle().version, model, feature_names).head(5)
         for i, row in df_fi.iterrows():
-            report_content += f"   - {row['F']} (Score: {row['I']:.2f})\n"
+            report_content += f"   - {row['Fitur']} (Score: {row['Pentingnya']:.2f})\n"
 
     report_content += f"""
 -------------------------------------------------------------
@@ -354,7 +837,7 @@ berdasarkan model Machine Learning:
         mime="text/plain"
     )
 
-with tab5:
+if active_view == VIEWS[4]:
     st.subheader("Simulasi Prediksi Karyawan")
     st.caption("Masukkan data profil karyawan untuk memprediksi risiko attrition menggunakan model CatBoost.")
     
@@ -404,47 +887,29 @@ with tab5:
 
         submit_btn = st.form_submit_button("🔍 Analisis Risiko Sekarang", use_container_width=True)
     
+    data = {
+        'Age': age, 'MonthlyIncome': income, 'TotalWorkingYears': total_working_years, 
+        'OverTime': overtime, 'Department': dept, 'JobRole': role, 
+        'MaritalStatus': marital_status, 'DistanceFromHome': distance, 
+        'Education': education, 'EducationField': edu_field, 
+        'BusinessTravel': travel, 'StockOptionLevel': stock, 
+        'JobLevel': job_level, 'JobSatisfaction': js, 
+        'EnvironmentSatisfaction': es, 'RelationshipSatisfaction': rs, 
+        'JobInvolvement': ji, 'NumCompaniesWorked': num_comp, 
+        'TrainingTimesLastYear': training, 'WorkLifeBalance': wlb, 
+        'YearsAtCompany': years_at_company, 'YearsInCurrentRole': years_in_role, 
+        'YearsSinceLastPromotion': years_promo, 'YearsWithCurrManager': years_manager
+    }
+
     if submit_btn:
+        model, feature_names = load_ml_models()
         if model is None or feature_names is None:
             st.error("⚠️ Model belum dimuat. Pastikan file 'catboost_optimized.cbm' dan 'feature_names.pkl' ada.")
         else:
-            data = {
-                'Age': age, 'MonthlyIncome': income, 'TotalWorkingYears': total_working_years, 
-                'OverTime': overtime, 'Department': dept, 'JobRole': role, 
-                'MaritalStatus': marital_status, 'DistanceFromHome': distance, 
-                'Education': education, 'EducationField': edu_field, 
-                'BusinessTravel': travel, 'StockOptionLevel': stock, 
-                'JobLevel': job_level, 'JobSatisfaction': js, 
-                'EnvironmentSatisfaction': es, 'RelationshipSatisfaction': rs, 
-                'JobInvolvement': ji, 'NumCompaniesWorked': num_comp, 
-                'TrainingTimesLastYear': training, 'WorkLifeBalance': wlb, 
-                'YearsAtCompany': years_at_company, 'YearsInCurrentRole': years_in_role, 
-                'YearsSinceLastPromotion': years_promo, 'YearsWithCurrManager': years_manager
-            }
-            
-            df_pred = pd.DataFrame([data])
-            
-            df_pred['TotalSatisfaction'] = (
-                df_pred['JobSatisfaction'] + df_pred['EnvironmentSatisfaction'] + 
-                df_pred['RelationshipSatisfaction'] + df_pred['JobInvolvement']
-            )
-            
-            years_at_comp_safe = df_pred['YearsAtCompany'].replace(0, 0.1)
-            total_working_safe = df_pred['TotalWorkingYears'].replace(0, 1)
-            age_safe = df_pred['Age'].replace(0, 18) 
-            
-            df_pred['CareerStability'] = df_pred['YearsInCurrentRole'] / years_at_comp_safe
-            df_pred['LoyaltyRatio'] = df_pred['YearsAtCompany'] / total_working_safe
-            df_pred['IncomePerAge'] = df_pred['MonthlyIncome'] / age_safe
-            
             try:
-                for col in feature_names:
-                    if col not in df_pred.columns:
-                        df_pred[col] = 0 
-                
-                df_final = df_pred[feature_names]
-                
-                probabilitas = model.predict_proba(df_final)[0][1]
+                with tracer.span("model:predict", "model", rows=1):
+                    prediksi = get_prediction_service().predict(data, timeout=30)
+                probabilitas = prediksi.probability
                 
                 st.markdown("---")
                 col_res1, col_res2 = st.columns([1, 2])
@@ -453,7 +918,7 @@ with tab5:
                     st.metric("Probabilitas Attrition", f"{probabilitas:.1%}")
                 
                 with col_res2:
-                    if probabilitas >= 0.279: 
+                    if prediksi.high_risk: 
                         st.error("🔴 **BERISIKO TINGGI (HIGH RISK)**")
                         st.write("Karyawan ini memiliki kemungkinan besar untuk meninggalkan perusahaan. Disarankan intervensi segera.")
                     else:
@@ -463,9 +928,97 @@ with tab5:
             except Exception as e:
                 st.error(f"Terjadi kesalahan saat memproses data: {e}")
 
-from streamlit_agraph import agraph, Node, Edge, Config
+    st.markdown("---")
+    st.subheader("🧪 Simulasi Intervensi (What-If)")
+    st.caption("Menilai semua kombinasi kenaikan gaji, lembur, opsi saham dan promosi dalam satu panggilan model.")
+
+    sw1, sw2 = st.columns([1, 2])
+    with sw1:
+        sweep_source = st.radio("Sumber profil:", ["Data form di atas", "EmployeeID"], key="tab5_sweep_source")
+        sweep_emp_id = None
+        if sweep_source == "EmployeeID":
+            sweep_emp_id = st.number_input("EmployeeID", min_value=1, value=1, step=1, key="tab5_sweep_emp")
+        sweep_btn = st.button("▶️ Jalankan Sweep", key="tab5_sweep_run")
+
+    if sweep_btn:
+        bundle = get_model_bundle()
+        record, missing = data, []
+        if sweep_emp_id is not None:
+            rows = run_query("employee_record", {"id": int(sweep_emp_id)})
+            record = rows[0]["e"] if rows else None
+            if record is not None:
+                # node yang dimuat lewat LOAD CSV di query-neo4j.md tidak punya semua input model;
+                # tanpa input itu skor risiko tidak bermakna, jadi sweep ditolak
+                missing = [name for name in data if record.get(name) is None]
+        if bundle is None:
+            st.error("⚠️ Model belum dimuat.")
+        elif record is None:
+            st.warning(f"Karyawan {sweep_emp_id} tidak ditemukan.")
+        elif missing:
+            st.error(
+                f"Data karyawan {sweep_emp_id} di graph belum lengkap ({len(missing)} input model kosong: "
+                f"{', '.join(missing)}). Muat ulang semua properti dengan "
+                "`python bulk_loader.py --csv final_employee_data.csv`, atau pakai sumber \"Data form di atas\"."
+            )
+        else:
+            from scenarios import sweep
+            try:
+                with tracer.span("model:sweep", "model") as span:
+                    result = sweep(bundle.model, bundle.feature_names, record, bundle.threshold)
+                    span["rows"] = len(result.surface) + 1
+                st.session_state["tab5_sweep"] = (record, result)
+            except Exception as e:
+                st.session_state.pop("tab5_sweep", None)
+                st.error(f"Simulasi gagal dijalankan: {type(e).__name__}: {e}")
+
+    if "tab5_sweep" in st.session_state:
+        record, result = st.session_state["tab5_sweep"]
+        with sw2:
+            st.metric("Risiko Saat Ini", f"{result.baseline_risk:.1%}")
+            if result.cheapest is None:
+                st.error(f"Tidak ada kombinasi intervensi di grid yang menurunkan risiko di bawah {result.threshold:.1%}.")
+            elif result.cheapest["Cost"] == 0:
+                st.success("Risiko sudah di bawah threshold tanpa intervensi.")
+            else:
+                from scenarios import describe_intervention
+                st.success(
+                    f"**Intervensi termurah:** {describe_intervention(record, result.cheapest)} → "
+                    f"risiko {result.cheapest['Risk']:.1%} (estimasi biaya ${result.cheapest['Cost']:,.0f}/tahun)"
+                )
+
+        import plotly.express as px
+        surface = result.surface.assign(Promosi=result.surface["PromotionReset"].map({False: "Tanpa promosi", True: "Promosi"}))
+        with tracer.span("chart:tab5_sweep", "chart", rows=len(surface)):
+            fig_sweep = px.line(
+                surface, x="RaisePct", y="Risk", color="StockOptionLevel",
+                facet_col="OverTime", facet_row="Promosi", markers=True,
+                labels={"RaisePct": "Kenaikan Gaji (%)", "Risk": "Risiko", "StockOptionLevel": "Opsi Saham"},
+                title="Permukaan Risiko per Kombinasi Intervensi"
+            )
+            fig_sweep.add_hline(y=result.threshold, line_dash="dash", line_color="red")
+            fig_sweep.update_yaxes(tickformat=".0%")
+            st.plotly_chart(fig_sweep, use_container_width=True)
+        with st.expander("📋 Tabel Skenario"):
+            st.dataframe(
+                result.surface[result.surface["Feasible"]].drop(columns="Feasible").sort_values("Cost"),
+                hide_index=True, use_container_width=True
+            )
+
+def fetch_graph_neighborhood(node_id, limit):
+    kind, key = parse_node_id(node_id)
+    if kind == "emp":
+        rows = run_query("similar_employees", {"id": key, "limit": limit})
+        return get_graph_explorer().similar_neighborhood(node_id, rows)
+    if kind != "role":
+        return None
+    dept, role = key
+    rows = run_query("graph_role_members", {"dept": dept, "role": role, "limit": limit})
+    return get_graph_explorer().employee_neighborhood(node_id, rows)
+
+def get_graph_explorer():
+    return st.session_state["graph_explorer"]
 
-with tab6:
+if active_view == VIEWS[5]:
     st.subheader("Graph Explorer")
     st.caption("Visualisasi topologi jaringan berdasarkan jenis relasi.")
 
@@ -473,18 +1026,36 @@ with tab6:
     
     with c_ctrl1:
         st.markdown("**Pengaturan Graph**")
-        
-        rel_type = st.selectbox(
-            "Pilih Pola Relasi:",
-            [
-                "SEMUA RELASI",
-                "HAS_ROLE (Employee ➡ JobRole)", 
-                "WORKS_IN (Employee ➡ Department)",
-                "INCLUDES_ROLE (Department ➡ JobRole)"
-            ]
+
+        graph_mode = st.radio(
+            "Mode:",
+            ["Jelajah Bertingkat", "Pola Relasi"],
+            help="Jelajah Bertingkat dimulai dari ringkasan Departemen ➡ Job Role; klik Job Role untuk memuat karyawannya.",
+            key="tab6_mode"
         )
-        
-        limit_nodes = st.slider("Jumlah Limit Path", 10, 100, 25)
+
+        if graph_mode == "Pola Relasi":
+            rel_type = st.selectbox(
+                "Pilih Pola Relasi:",
+                [
+                    "SEMUA RELASI",
+                    "HAS_ROLE (Employee ➡ JobRole)", 
+                    "WORKS_IN (Employee ➡ Department)",
+                    "INCLUDES_ROLE (Department ➡ JobRole)"
+                ]
+            )
+            
+            limit_nodes = st.slider("Jumlah Limit Path", 10, 100, 25)
+        else:
+            member_limit = st.slider("Maks Karyawan per Ekspansi", 5, 100, 25, key="tab6_member_limit")
+            explorer = st.session_state.get("graph_explorer")
+            if (explorer is None or explorer.member_limit != member_limit or explorer.threshold != threshold
+                    or st.button("↺ Reset Tampilan")):
+                explorer = GraphExplorer(threshold, member_limit)
+                st.session_state["graph_explorer"] = explorer
+                st.session_state.pop("graph_last_click", None)
+            if snap:
+                explorer.load_overview(snap.cells, snap.version)
         
         st.markdown("""
         <span style='color:#ef476f'>■</span> High Risk Emp
@@ -495,108 +1066,120 @@ with tab6:
                 
         <span style='color:#ffd166'>■</span> Job Role
         """, unsafe_allow_html=True)
+        if graph_mode == "Jelajah Bertingkat":
+            st.caption("Klik karyawan untuk memuat rekan paling mirip (edge SIMILAR_TO); ★ = tercatat keluar.")
 
     with c_ctrl2:
-        base_query = ""
-        
-        if "HAS_ROLE" in rel_type:
-            base_query = f"""
-            MATCH (a)-[r:HAS_ROLE]->(b)
-            RETURN a, labels(a) as a_labels, type(r) as rel, b, labels(b) as b_labels
-            LIMIT {limit_nodes}
-            """
-        elif "WORKS_IN" in rel_type:
-            base_query = f"""
-            MATCH (a)-[r:WORKS_IN]->(b)
-            RETURN a, labels(a) as a_labels, type(r) as rel, b, labels(b) as b_labels
-            LIMIT {limit_nodes}
-            """
-        elif "INCLUDES_ROLE" in rel_type:
-            base_query = f"""
-            MATCH (a)-[r:INCLUDES_ROLE]->(b)
-            RETURN a, labels(a) as a_labels, type(r) as rel, b, labels(b) as b_labels
-            LIMIT {limit_nodes}
-            """
-        else:
-            base_query = f"""
-            MATCH (a)-[r:HAS_ROLE|WORKS_IN|INCLUDES_ROLE]->(b)
-            RETURN a, labels(a) as a_labels, type(r) as rel, b, labels(b) as b_labels
-            LIMIT {limit_nodes}
-            """
+        from streamlit_agraph import agraph, Node, Edge, Config
 
-        results = run_cypher(base_query)
-        
-        nodes = []
-        edges = []
-        added_ids = set()
+        config = Config(
+            width="100%",
+            height=600,
+            directed=True, 
+            physics=True, 
+            hierarchical=False,
+            nodeHighlightBehavior=True,
+            highlightColor="#F7A7A6"
+        )
+
+        if graph_mode == "Jelajah Bertingkat":
+            if not explorer.nodes:
+                st.warning("⚠️ Data ringkasan belum tersedia.")
+            else:
+                nodes = [Node(**node) for node in explorer.nodes.values()]
+                edges = [Edge(source=e["source"], target=e["target"], label=e["label"], color=EDGE_COLOR)
+                         for e in explorer.edges.values()]
+                graph_stats = explorer.stats()
+                st.caption(
+                    f"{graph_stats['nodes']} node · {graph_stats['edges']} edge · "
+                    f"{graph_stats['expanded']} diperluas · {graph_stats['fetches']} query ekspansi"
+                )
+                with tracer.span("chart:tab6_explorer", "chart", rows=len(nodes)):
+                    selected = agraph(nodes=nodes, edges=edges, config=config)
 
-        if not results:
-            st.warning("⚠️ Data tidak ditemukan untuk relasi ini. Pastikan relasi (Edge) tersebut sudah dibuat di database.")
+                if selected and selected != st.session_state.get("graph_last_click"):
+                    st.session_state["graph_last_click"] = selected
+                    kind, key = parse_node_id(selected)
+                    if kind == "emp":
+                        st.session_state["graph_selected_employee"] = key
+                    explorer.toggle(selected, fetch_graph_neighborhood)
+                    st.rerun()
+
+                selected_emp = st.session_state.get("graph_selected_employee")
+                if selected_emp is not None:
+                    detail = run_query("graph_employee_detail", {"id": selected_emp})
+                    if detail:
+                        with st.expander(f"👤 Detail Karyawan {selected_emp}", expanded=True):
+                            st.json(detail[0])
         else:
-            for row in results:
-                def process_node(node_data, node_labels):
-                    n_id = ""
-                    n_label = ""
-                    n_color = "#999999"
-                    n_shape = "dot"
-                    n_title = ""
-                    
-                    if "Employee" in node_labels:
-                        n_id = str(node_data.get('EmployeeID', 'Unknown'))
-                        risk = node_data.get('AttritionRisk', 0)
-                        n_label = f"Emp {n_id}"
-                        # Updated Colors
-                        n_color = "#ef476f" if risk >= 0.279 else "#06d6a0"
-                        n_shape = "dot"
-                        n_title = f"Risk: {risk:.1%}"
-                    
-                    elif "Department" in node_labels:
-                        n_id = node_data.get('name', 'Unknown Dept')
-                        n_label = n_id
-                        n_color = "#26547c" # Updated
-                        n_shape = "hexagon"
-                    
-                    elif "JobRole" in node_labels:
-                        n_id = node_data.get('name', 'Unknown Role')
-                        n_label = n_id
-                        n_color = "#ffd166" # Updated
-                        n_shape = "diamond"
-                    
-                    else:
-                        n_id = str(node_data.get('name', str(node_data)))
-                        n_label = n_id
-                    
-                    return n_id, n_label, n_shape, n_color, n_title
-
-                src_id, src_lbl, src_shape, src_col, src_title = process_node(row['a'], row['a_labels'])
-                if src_id not in added_ids:
-                    nodes.append(Node(id=src_id, label=src_lbl, shape=src_shape, color=src_col, title=src_title, size=20))
-                    added_ids.add(src_id)
-
-                tgt_id, tgt_lbl, tgt_shape, tgt_col, tgt_title = process_node(row['b'], row['b_labels'])
-                if tgt_id not in added_ids:
-                    nodes.append(Node(id=tgt_id, label=tgt_lbl, shape=tgt_shape, color=tgt_col, title=tgt_title, size=20))
-                    added_ids.add(tgt_id)
-
-                rel_name = row['rel']
-                edge_id = f"{src_id}-{rel_name}-{tgt_id}"
-                edges.append(Edge(source=src_id, target=tgt_id, label=rel_name, color="#bdc3c7"))
-
-            config = Config(
-                width="100%",
-                height=600,
-                directed=True, 
-                physics=True, 
-                hierarchical=False,
-                nodeHighlightBehavior=True,
-                highlightColor="#F7A7A6"
-            )
-            
-            st.success(f"Menampilkan **{len(results)}** lintasan relasi.")
-            agraph(nodes=nodes, edges=edges, config=config)
+            rel_types = [t for t in GRAPH_REL_TYPES if t in rel_type] or GRAPH_REL_TYPES
+            graph_params = {"rel_types": rel_types, "limit": limit_nodes}
+
+            results = run_query("graph_paths", graph_params)
             
-            with st.expander("🔍 Lihat Query Cypher yang Dijalankan"):
-                st.code(base_query, language='cypher')
+            nodes = []
+            edges = []
+            added_ids = set()
+
+            if not results:
+                st.warning("⚠️ Data tidak ditemukan untuk relasi ini. Pastikan relasi (Edge) tersebut sudah dibuat di database.")
+            else:
+                for row in results:
+                    src_id, src_lbl, src_shape, src_col, src_title = node_style(row['a'], row['a_labels'], threshold)
+                    if src_id not in added_ids:
+                        nodes.append(Node(id=src_id, label=src_lbl, shape=src_shape, color=src_col, title=src_title, size=20))
+                        added_ids.add(src_id)
+
+                    tgt_id, tgt_lbl, tgt_shape, tgt_col, tgt_title = node_style(row['b'], row['b_labels'], threshold)
+                    if tgt_id not in added_ids:
+                        nodes.append(Node(id=tgt_id, label=tgt_lbl, shape=tgt_shape, color=tgt_col, title=tgt_title, size=20))
+                        added_ids.add(tgt_id)
+
+                    edges.append(Edge(source=src_id, target=tgt_id, label=row['rel'], color=EDGE_COLOR))
+
+                st.success(f"Menampilkan **{len(results)}** lintasan relasi.")
+                with tracer.span("chart:tab6_paths", "chart", rows=len(nodes)):
+                    agraph(nodes=nodes, edges=edges, config=config)
+                
+                with st.expander("🔍 Lihat Query Cypher yang Dijalankan"):
+                    st.code(QUERIES.get("graph_paths").cypher, language='cypher')
+                    st.json(graph_params)
 
 st.markdown("---")
-st.caption("© 2025 Kelompok 9 - Final Project RSBP")
\ No newline at end of file
+st.caption("© 2025 Kelompok 9 - Final Project RSBP")
+
+startup.timer.record("first_rerun", (time.perf_counter() - _import_started) * 1000, once=True)
+if query_errors:
+    # cache snapshot bisa berisi hasil kosong dari query yang gagal; ambil ulang di rerun berikutnya
+    invalidate_snapshot()
+    with error_slot.container():
+        st.error(
+            "⚠️ Sebagian data gagal dimuat, jadi tabel atau grafik yang kosong di halaman ini belum tentu "
+            "berarti tidak ada data.\n\n" + "\n".join(f"- `{name}`: {msg}" for name, msg in query_errors.items())
+        )
+        st.button("🔁 Coba lagi", key="retry_failed_queries")
+
+tracer.end_rerun()
+
+if ADMIN_TOKEN and st.query_params.get("admin") == ADMIN_TOKEN:
+    with st.sidebar:
+        with st.expander("🩺 Profiling (Admin)", expanded=False):
+            session_stat = tracer.session_stats(session_id)
+            if session_stat:
+                st.caption(
+                    f"Sesi {session_id}: {session_stat['reruns']} rerun · p50 {session_stat['p50_ms']:.0f} ms · "
+                    f"p95 {session_stat['p95_ms']:.0f} ms · terakhir {session_stat['last_ms']:.0f} ms"
+                )
+            last_n = st.slider("Rerun terakhir", 1, tracer.reruns_per_session, 5, key="admin_last_reruns")
+            scope = st.radio("Cakupan", ["Sesi ini", "Semua sesi"], horizontal=True, key="admin_scope")
+            slowest = tracer.slowest(session_id if scope == "Sesi ini" else None, last_reruns=last_n)
+            if slowest:
+                cols = ["name", "kind", "ms", "rows", "bytes", "error", "rerun"]
+                df_slow = pd.DataFrame(slowest).reindex(columns=cols)
+                st.dataframe(df_slow.round(1), hide_index=True, use_container_width=True)
+            st.markdown("**Statistik bergulir (p50/p95)**")
+            rolling = tracer.stats()
+            if rolling:
+                st.dataframe(pd.DataFrame(rolling).round(1), hide_index=True, use_container_width=True)
+            if SPAN_LOG_PATH:
+                st.caption(f"Log span: `{SPAN_LOG_PATH}`")
\ No newline at end of file
@@ -0,0 +1,350 @@
+"""Backend data untuk query di registry (queries.py).
+
+Neo4jBackend menjalankan Cypher di server. LocalBackend memuat
+final_employee_data.csv ke array kolom NumPy dan menjawab query yang sama
+di memori, tanpa jaringan (demo, analisis offline, load test).
+"""
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from columnar import read_frame
+from config import (NEO4J_POOL_SIZE, NEO4J_ACQUIRE_TIMEOUT, NEO4J_CONNECT_TIMEOUT, NEO4J_FETCH_SIZE,
+                    NEO4J_QUERY_TIMEOUT, NEO4J_RETRIES, NEO4J_RETRY_BACKOFF, NEO4J_BREAKER_FAILURES,
+                    NEO4J_BREAKER_RESET)
+from features import RAW_FEATURES, attrition_labels
+from queries import QUERIES, GRAPH_REL_TYPES
+from resilience import AccessMetrics, CircuitBreaker, is_transient, retry
+
+
+class GraphBackend:
+    name = "base"
+    # hasil backend lambat (jaringan) layak disimpan di QueryCache
+    cacheable = False
+    # alasan Neo4j tidak dipakai bila backend ini fallback GRAPH_BACKEND=auto
+    fallback_error = None
+
+    def run(self, query_name, params=None):
+        raise NotImplementedError
+
+    def stream(self, query_name, params=None):
+        """Kembalikan (nama_kolom, iterator tuple baris) untuk ekspor besar."""
+        raise NotImplementedError
+
+    def health(self):
+        """Metrik akses (pool, latensi, breaker); None untuk backend tanpa jaringan."""
+        return None
+
+
+class Neo4jBackend(GraphBackend):
+    name = "neo4j"
+    cacheable = True
+
+    def __init__(self, driver, database, fetch_size=NEO4J_FETCH_SIZE, query_timeout=NEO4J_QUERY_TIMEOUT,
+                 retries=NEO4J_RETRIES, pool_size=NEO4J_POOL_SIZE, breaker=None):
+        self.driver = driver
+        self.database = database
+        self.fetch_size = fetch_size
+        self.query_timeout = query_timeout or None
+        self.retries = retries
+        self.pool_size = pool_size
+        self.breaker = breaker or CircuitBreaker(NEO4J_BREAKER_FAILURES, NEO4J_BREAKER_RESET)
+        self.metrics = AccessMetrics()
+
+    @classmethod
+    def connect(cls, uri, user, password, database):
+        """Driver dengan pool dari config; error koneksi diteruskan ke pemanggil."""
+        from neo4j import GraphDatabase
+        driver = GraphDatabase.driver(
+            uri, auth=(user, password),
+            max_connection_pool_size=NEO4J_POOL_SIZE,
+            connection_acquisition_timeout=NEO4J_ACQUIRE_TIMEOUT,
+            connection_timeout=NEO4J_CONNECT_TIMEOUT,
+        )
+        try:
+            driver.verify_connectivity()
+        except Exception:
+            driver.close()
+            raise
+        return cls(driver, database)
+
+    def _session(self):
+        from neo4j import READ_ACCESS
+        # semua query di registry read-only: di cluster (URI neo4j://) dirutekan ke follower
+        return self.driver.session(database=self.database, default_access_mode=READ_ACCESS,
+                                   fetch_size=self.fetch_size)
+
+    def _read_once(self, query, params):
+        self.metrics.begin()
+        started = acquired = time.perf_counter()
+        try:
+            with self._session() as session:
+                with session.begin_transaction(timeout=self.query_timeout) as tx:
+                    # begin_transaction = antre pool + routing; sisanya waktu query & fetch
+                    acquired = time.perf_counter()
+                    rows = [r.data() for r in tx.run(query, params)]
+        except Exception as e:
+            self.metrics.end((acquired - started) * 1000, error=e)
+            raise
+        self.metrics.end((acquired - started) * 1000, (time.perf_counter() - acquired) * 1000)
+        return rows
+
+    def run_cypher(self, query, params=None):
+        def attempt():
+            return retry(lambda: self._read_once(query, params), self.retries, NEO4J_RETRY_BACKOFF,
+                         on_retry=lambda e, delay: self.metrics.retried())
+        return self.breaker.call(attempt)
+
+    def run(self, query_name, params=None):
+        return self.run_cypher(QUERIES.get(query_name).cypher, params)
+
+    def stream(self, query_name, params=None):
+        probe = self.breaker.before_call()
+        session = self._session()
+        try:
+            result = session.run(QUERIES.get(query_name).cypher, params)
+            columns = list(result.keys())
+        except Exception as e:
+            session.close()
+            if is_transient(e):
+                self.breaker.record_failure(probe)
+            else:
+                self.breaker.release(probe)
+            raise
+        self.breaker.record_success(probe)
+
+        def rows():
+            try:
+                for record in result:
+                    yield tuple(record.values())
+            finally:
+                session.close()
+
+        return columns, rows()
+
+    def health(self):
+        return dict(self.metrics.stats(), breaker=self.breaker.stats(), pool_size=self.pool_size)
+
+
+class LocalBackend(GraphBackend):
+    name = "local"
+
+    def __init__(self, df, version=None, drivers=None, driver_summary=None, neighbors=None):
+        self.version = version
+        self.n = len(df)
+        self.columns = {col: df[col].to_numpy() for col in df.columns}
+
+        self.employee_id = df["EmployeeID"].to_numpy(dtype=np.int64)
+        self.risk = df["AttritionRisk"].to_numpy(dtype=np.float64)
+        self.income = df["MonthlyIncome"].to_numpy(dtype=np.float64)
+        self.overtime = (df["OverTime"] == "Yes").to_numpy()
+        self.env_sat = df["EnvironmentSatisfaction"].to_numpy(dtype=np.float64)
+        self.attrition = (attrition_labels(df["Attrition"]) if "Attrition" in df.columns
+                          else np.full(self.n, np.nan))
+        self.dept_code, self.dept_names = pd.factorize(df["Department"], sort=True)
+        self.role_code, self.role_names = pd.factorize(df["JobRole"], sort=True)
+        self.dept_names = list(self.dept_names)
+        self.role_names = list(self.role_names)
+
+        # urutan global (Risk DESC, EmployeeID ASC) = urutan tampilan tab2
+        self.order = np.lexsort((self.employee_id, -self.risk))
+        # adjacency Department -> Employee dan JobRole -> Employee, sudah terurut
+        self.dept_members = self._group_index(self.dept_code, len(self.dept_names))
+        self.role_members = self._group_index(self.role_code, len(self.role_names))
+
+        pair_code = self.dept_code * len(self.role_names) + self.role_code
+        self.dept_role_pairs = [
+            (self.dept_names[code // len(self.role_names)], self.role_names[code % len(self.role_names)])
+            for code in np.unique(pair_code)
+        ]
+
+        # penjelasan SHAP (opsional): EmployeeID -> (nama fitur, nilai SHAP)
+        self.drivers = {}
+        if drivers is not None:
+            names = drivers.filter(regex=r"^Driver\d+$").to_numpy()
+            values = drivers.filter(regex=r"^Driver\d+Shap$").to_numpy(dtype=np.float64)
+            self.drivers = {
+                int(emp_id): (list(n), [float(v) for v in vals])
+                for emp_id, n, vals in zip(drivers["EmployeeID"], names, values)
+            }
+        self.driver_summary = [] if driver_summary is None else driver_summary.to_dict("records")
+
+        # karyawan serupa (opsional, similarity.py): edge terurut (EmployeeID, Rank)
+        self.neighbors = None
+        if neighbors is not None:
+            neighbors = neighbors.sort_values(["EmployeeID", "Rank"], kind="stable")
+            positions = pd.Index(self.employee_id).get_indexer(neighbors["NeighborID"].to_numpy())
+            keep = positions >= 0
+            self.neighbors = {
+                "source": neighbors["EmployeeID"].to_numpy(dtype=np.int64)[keep],
+                "position": positions[keep],
+                "rank": neighbors["Rank"].to_numpy(dtype=np.int64)[keep],
+                "score": neighbors["Similarity"].to_numpy(dtype=np.float64)[keep],
+            }
+
+    @classmethod
+    def from_csv(cls, path, drivers_path=None, summary_path=None, neighbors_path=None):
+        def optional(p):
+            return read_frame(p) if p and os.path.exists(p) else None
+
+        paths = [p for p in (path, drivers_path, summary_path, neighbors_path) if p and os.path.exists(p)]
+        return cls(read_frame(path), version=max(os.path.getmtime(p) for p in paths),
+                   drivers=optional(drivers_path), driver_summary=optional(summary_path),
+                   neighbors=optional(neighbors_path))
+
+    def _group_index(self, codes, n_groups):
+        ordered_codes = codes[self.order]
+        return [self.order[ordered_codes == g] for g in range(n_groups)]
+
+    def run(self, query_name, params=None):
+        handler = getattr(self, "_q_" + query_name, None)
+        if handler is None:
+            raise NotImplementedError(f"query '{query_name}' belum didukung LocalBackend")
+        return handler(**(params or {}))
+
+    def stream(self, query_name, params=None):
+        rows = self.run(query_name, params)
+        columns = list(rows[0].keys()) if rows else []
+        return columns, (tuple(row.values()) for row in rows)
+
+    def _q_graph_version(self):
+        return [{"version": self.version}]
+
+    def _q_risk_distribution(self):
+        n_roles = len(self.role_names)
+        cell = self.dept_code * n_roles + self.role_code
+        order = np.argsort(cell, kind="stable")
+        bounds = np.flatnonzero(np.diff(cell[order])) + 1
+        rows = []
+        for members in np.split(order, bounds):
+            if not len(members):
+                continue
+            code = cell[members[0]]
+            rows.append({
+                "dept": self.dept_names[code // n_roles], "role": self.role_names[code % n_roles],
+                "total": len(members), "risk": self.risk[members], "income": self.income[members],
+                "overtime": self.overtime[members], "env_sat": self.env_sat[members],
+                "attrition": self.attrition[members],
+            })
+        return rows
+
+    def _high_risk_positions(self, threshold, dept=None, role=None, after_risk=None, after_id=None):
+        candidates = self.order
+        if dept is not None:
+            if dept not in self.dept_names:
+                return candidates[:0]
+            candidates = self.dept_members[self.dept_names.index(dept)]
+        if role is not None:
+            if role not in self.role_names:
+                return candidates[:0]
+            role_code = self.role_names.index(role)
+            candidates = candidates[self.role_code[candidates] == role_code]
+
+        # kandidat terurut Risk DESC -> filter threshold = prefix
+        cut = np.searchsorted(-self.risk[candidates], -threshold, side="right")
+        candidates = candidates[:cut]
+        if after_risk is not None:
+            risk = self.risk[candidates]
+            keep = (risk < after_risk) | ((risk == after_risk) & (self.employee_id[candidates] > after_id))
+            candidates = candidates[keep]
+        return candidates
+
+    def _employee_rows(self, positions):
+        return [
+            {
+                "e.EmployeeID": int(self.employee_id[i]),
+                "Role": self.role_names[self.role_code[i]],
+                "Dept": self.dept_names[self.dept_code[i]],
+                "Gaji": int(self.income[i]),
+                "Risk": float(self.risk[i]),
+            }
+            for i in positions
+        ]
+
+    def _q_high_risk_page(self, threshold, limit, dept=None, role=None, after_risk=None, after_id=None):
+        positions = self._high_risk_positions(threshold, dept, role, after_risk, after_id)
+        return self._employee_rows(positions[:limit])
+
+    def _q_high_risk_export(self, threshold, dept=None, role=None):
+        return self._employee_rows(self._high_risk_positions(threshold, dept, role))
+
+    def _q_graph_role_members(self, dept, role, limit):
+        positions = self._high_risk_positions(-np.inf, dept, role)[:limit]
+        return [{"id": int(self.employee_id[i]), "risk": float(self.risk[i])} for i in positions]
+
+    def _q_graph_employee_detail(self, id):
+        positions = np.flatnonzero(self.employee_id == id)
+        fields = ["EmployeeID", "Department", "JobRole", "Age", "MonthlyIncome",
+                  "OverTime", "YearsAtCompany", "AttritionRisk"]
+        return [{f: self._employee_node(i).get(f) for f in fields} for i in positions[:1]]
+
+    def _q_employee_record(self, id):
+        positions = np.flatnonzero(self.employee_id == id)
+        fields = ["EmployeeID"] + RAW_FEATURES
+        return [{"e": {f: self._employee_node(i).get(f) for f in fields}} for i in positions[:1]]
+
+    def _q_employee_drivers(self, ids):
+        rows = []
+        for emp_id in ids:
+            if int(emp_id) in self.drivers:
+                names, values = self.drivers[int(emp_id)]
+                rows.append({"id": int(emp_id), "drivers": names, "shap": values})
+        return rows
+
+    def _q_driver_summary(self):
+        return self.driver_summary
+
+    def _neighbor_edges(self, emp_id):
+        """Posisi tetangga, rank dan skor edge SIMILAR_TO milik satu karyawan."""
+        if self.neighbors is None:
+            return np.zeros(0, dtype=np.int64), [], []
+        source = self.neighbors["source"]
+        edges = slice(np.searchsorted(source, emp_id, side="left"), np.searchsorted(source, emp_id, side="right"))
+        return self.neighbors["position"][edges], self.neighbors["rank"][edges], self.neighbors["score"][edges]
+
+    def _q_similar_employees(self, id, limit):
+        positions, ranks, scores = self._neighbor_edges(int(id))
+        return [
+            {
+                "id": int(self.employee_id[i]), "rank": int(rank), "score": float(score),
+                "Dept": self.dept_names[self.dept_code[i]], "Role": self.role_names[self.role_code[i]],
+                "Risk": float(self.risk[i]),
+                "Attrition": None if np.isnan(self.attrition[i]) else int(self.attrition[i]),
+            }
+            for i, rank, score in list(zip(positions, ranks, scores))[:limit]
+        ]
+
+    def _q_similar_attrition(self, ids):
+        rows = []
+        for emp_id in ids:
+            positions = self._neighbor_edges(int(emp_id))[0]
+            if len(positions):
+                rows.append({"id": int(emp_id), "k": len(positions),
+                             "left": int(np.nansum(self.attrition[positions]))})
+        return rows
+
+    def _employee_node(self, i):
+        return {col: values[i].item() if hasattr(values[i], "item") else values[i]
+                for col, values in self.columns.items()}
+
+    def _q_graph_paths(self, rel_types=GRAPH_REL_TYPES, limit=25):
+        rows = []
+        for rel in rel_types:
+            if len(rows) >= limit:
+                break
+            remaining = limit - len(rows)
+            if rel == "INCLUDES_ROLE":
+                for dept, role in self.dept_role_pairs[:remaining]:
+                    rows.append({"a": {"name": dept}, "a_labels": ["Department"], "rel": rel,
+                                 "b": {"name": role}, "b_labels": ["JobRole"]})
+                continue
+            for i in range(min(remaining, self.n)):
+                if rel == "HAS_ROLE":
+                    target, label = self.role_names[self.role_code[i]], "JobRole"
+                else:
+                    target, label = self.dept_names[self.dept_code[i]], "Department"
+                rows.append({"a": self._employee_node(i), "a_labels": ["Employee"], "rel": rel,
+                             "b": {"name": target}, "b_labels": [label]})
+        return rows
@@ -0,0 +1,271 @@
+"""Batch scoring ulang AttritionRisk untuk seluruh karyawan.
+
+    python batch_scoring.py --source csv --output scored.csv
+    python batch_scoring.py --source neo4j --write-neo4j --chunk-size 5000
+    python batch_scoring.py --source csv --csv hr_feed.csv --write-neo4j --incremental
+
+Mode --incremental menyimpan FeatureHash (fingerprint vektor input model +
+versi model + threshold) di samping AttritionRisk dan hanya men-score ulang
+karyawan yang baru atau fiturnya berubah.
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from catboost import Pool
+
+from columnar import iter_frames, read_frame
+from config import db_uri, db_user, db_pass, db_name, RISK_THRESHOLD, DRIFT_BASELINE_PATH
+from features import (RAW_FEATURES, CATEGORICAL_FEATURES, add_engineered_features, attrition_labels,
+                      build_feature_frame, with_missing_categories)
+from model_store import load_model, load_model_bundle
+from snapshot import BUMP_GRAPH_VERSION_QUERY
+
+DEFAULT_CHUNK_SIZE = 5000
+
+READ_EMPLOYEES_QUERY = """
+MATCH (e:Employee)
+WHERE e.EmployeeID > $after
+RETURN e {{.EmployeeID, .FeatureHash, .AttritionRisk, {props}}} AS e
+ORDER BY e.EmployeeID
+LIMIT $limit
+""".format(props=", ".join("." + col for col in RAW_FEATURES))
+
+WRITE_SCORES_QUERY = """
+UNWIND $rows AS row
+MATCH (e:Employee {EmployeeID: row.EmployeeID})
+SET e.AttritionRisk = row.AttritionRisk,
+    e.Prediction = row.Prediction,
+    e.FeatureHash = row.FeatureHash,
+    e.ScoredAt = datetime()
+"""
+
+READ_FINGERPRINTS_QUERY = """
+UNWIND $ids AS id
+MATCH (e:Employee {EmployeeID: id})
+RETURN e.EmployeeID AS EmployeeID, e.FeatureHash AS FeatureHash, e.AttritionRisk AS AttritionRisk
+"""
+
+RECORD_SCORING_RUN_QUERY = """
+MERGE (m:GraphMeta {key: 'scoring'})
+SET m += $stats, m.updated_at = datetime()
+"""
+
+PREVIOUS_COLUMNS = ["FeatureHash", "AttritionRisk"]
+
+
+def iter_csv_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    # .parquet dibaca per batch dari snapshot kolumnar, selain itu CSV
+    yield from iter_frames(path, chunk_size)
+
+
+def iter_neo4j_chunks(driver, chunk_size=DEFAULT_CHUNK_SIZE, database=db_name):
+    # keyset pagination pada EmployeeID, bukan SKIP, supaya tiap chunk O(chunk)
+    after = -1
+    with driver.session(database=database, default_access_mode="READ") as session:
+        while True:
+            rows = session.run(READ_EMPLOYEES_QUERY, after=after, limit=chunk_size).data()
+            if not rows:
+                break
+            df = pd.DataFrame([row["e"] for row in rows])
+            after = int(df["EmployeeID"].iloc[-1])
+            yield df
+
+
+def score_features(model, X, threshold=RISK_THRESHOLD, thread_count=-1):
+    pool = Pool(X, cat_features=model.get_cat_feature_indices())
+    proba = model.predict_proba(pool, thread_count=thread_count)[:, 1]
+    return proba, (proba >= threshold).astype(np.int64)
+
+
+def score_frame(model, feature_names, df, threshold=RISK_THRESHOLD, thread_count=-1):
+    X = build_feature_frame(add_engineered_features(df), feature_names)
+    return score_features(model, X, threshold, thread_count)
+
+
+def feature_fingerprint(X, model_key):
+    """Hash int64 per baris dari vektor input model. model_key (versi model +
+    threshold) ikut di-hash supaya ganti model memaksa score ulang semua baris."""
+    X = X.copy()
+    for col in X.columns:
+        if col not in CATEGORICAL_FEATURES:
+            # int (CSV) vs float (Neo4j) vs float32 (Parquet) harus menghasilkan hash yang
+            # sama; CatBoost sendiri membaca fitur sebagai float32
+            X[col] = pd.to_numeric(X[col], errors="coerce").astype(np.float32)
+    X["_model"] = model_key
+    return pd.util.hash_pandas_object(X, index=False).to_numpy().view(np.int64)
+
+
+def model_fingerprint_key(version, threshold):
+    return f"{version}|{threshold!r}"
+
+
+def csv_previous(path):
+    """Lookup skor sebelumnya dari CSV hasil run lain (harus punya FeatureHash)."""
+    prev = read_frame(path, columns=["EmployeeID"] + PREVIOUS_COLUMNS).set_index("EmployeeID")
+    return lambda ids: prev.reindex(ids)
+
+
+def neo4j_previous(driver, database=db_name):
+    def lookup(ids):
+        with driver.session(database=database, default_access_mode="READ") as session:
+            rows = session.run(READ_FINGERPRINTS_QUERY, ids=[int(i) for i in ids]).data()
+        prev = pd.DataFrame(rows, columns=["EmployeeID"] + PREVIOUS_COLUMNS).set_index("EmployeeID")
+        return prev.reindex(ids)
+    return lookup
+
+
+def changed_rows(df, hashes, previous=None):
+    """Mask baris baru/berubah. Tanpa `previous`, FeatureHash dibaca dari chunk itu sendiri."""
+    if previous is not None:
+        prev = previous(df["EmployeeID"].to_numpy())
+    elif "FeatureHash" in df.columns:
+        prev = df
+    else:
+        return np.ones(len(df), dtype=bool), np.full(len(df), np.nan)
+    prev_hash = pd.to_numeric(prev["FeatureHash"], errors="coerce").to_numpy()
+    prev_risk = pd.to_numeric(prev["AttritionRisk"], errors="coerce").to_numpy(dtype=np.float64, copy=True)
+    unchanged = (prev_hash == hashes) & ~np.isnan(prev_risk)
+    return ~unchanged, prev_risk
+
+
+def write_scores(driver, employee_ids, proba, preds, hashes=None, database=db_name, batch_size=DEFAULT_CHUNK_SIZE):
+    if hashes is None:
+        hashes = [None] * len(proba)
+    rows = [
+        {"EmployeeID": int(emp_id), "AttritionRisk": float(p), "Prediction": int(pred),
+         "FeatureHash": None if h is None else int(h)}
+        for emp_id, p, pred, h in zip(employee_ids, proba, preds, hashes)
+    ]
+    with driver.session(database=database) as session:
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            session.execute_write(lambda tx: tx.run(WRITE_SCORES_QUERY, rows=batch).consume())
+
+
+def run_batch(chunks, model, feature_names, threshold=RISK_THRESHOLD, thread_count=-1,
+              driver=None, database=db_name, output=None, model_key=None,
+              incremental=False, previous=None, sync_features=False, drift=None):
+    """Score semua chunk. Dengan incremental=True hanya baris yang FeatureHash-nya
+    berubah (atau belum pernah di-score) yang diprediksi dan ditulis ke Neo4j;
+    sync_features juga meng-upsert properti mentah baris itu (sumber CSV).
+    drift (drift.DriftSummary) diperbarui dengan fitur & skor setiap chunk."""
+    started = time.perf_counter()
+    n_rows = n_risk = n_scored = 0
+    wrote_header = False
+    model_key = model_key or model_fingerprint_key("unknown", threshold)
+    for df in chunks:
+        X = build_feature_frame(add_engineered_features(df), feature_names)
+        hashes = feature_fingerprint(X, model_key)
+        if incremental:
+            changed, proba = changed_rows(df, hashes, previous)
+        else:
+            changed, proba = np.ones(len(df), dtype=bool), np.empty(len(df))
+
+        if changed.any():
+            proba[changed], _ = score_features(model, X[changed], threshold, thread_count)
+        preds = (proba >= threshold).astype(np.int64)
+        if drift is not None:
+            drift.update(with_missing_categories(X, df), proba, attrition_labels(df["Attrition"]) if "Attrition" in df.columns else None)
+
+        if driver is not None and changed.any():
+            if sync_features:
+                from bulk_loader import load_batch
+                with driver.session(database=database) as session:
+                    load_batch(session, df[changed].drop(columns=PREVIOUS_COLUMNS + ["Prediction"], errors="ignore"))
+            write_scores(driver, df["EmployeeID"][changed], proba[changed], preds[changed],
+                         hashes[changed], database=database)
+        if output is not None:
+            out = df.assign(AttritionRisk=proba, Prediction=preds, FeatureHash=hashes)
+            out.to_csv(output, mode="a" if wrote_header else "w", header=not wrote_header, index=False)
+            wrote_header = True
+        n_rows += len(df)
+        n_scored += int(changed.sum())
+        n_risk += int(preds.sum())
+        elapsed = time.perf_counter() - started
+        print(f"  {n_rows:,} karyawan diproses, {n_scored:,} di-score ulang ({n_rows / elapsed:,.0f} baris/detik)")
+
+    summary = {"rows": n_rows, "rescored": n_scored, "skipped": n_rows - n_scored,
+               "high_risk": n_risk, "seconds": time.perf_counter() - started}
+    if driver is not None:
+        with driver.session(database=database) as session:
+            session.run(RECORD_SCORING_RUN_QUERY, stats=dict(summary, model=model_key)).consume()
+            if n_scored:
+                session.run(BUMP_GRAPH_VERSION_QUERY).consume()
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hitung ulang AttritionRisk secara batch.")
+    parser.add_argument("--source", choices=["csv", "neo4j"], default="csv")
+    parser.add_argument("--csv", default="final_employee_data.csv", help="file input untuk --source csv")
+    parser.add_argument("--output", help="tulis hasil scoring ke CSV ini")
+    parser.add_argument("--write-neo4j", action="store_true", help="tulis AttritionRisk/Prediction ke node Employee")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--threads", type=int, default=-1, help="thread CatBoost (-1 = semua core)")
+    parser.add_argument("--threshold", type=float, help="default: threshold artefak model")
+    parser.add_argument("--artifact", help="direktori artefak train.py (default: models/LATEST)")
+    parser.add_argument("--model", help="file .cbm legacy (bersama --feature-names)")
+    parser.add_argument("--feature-names")
+    parser.add_argument("--incremental", action="store_true",
+                        help="hanya score ulang karyawan baru/berubah (berdasarkan FeatureHash)")
+    parser.add_argument("--previous", help="CSV hasil run sebelumnya sebagai sumber FeatureHash "
+                                           "(default: Neo4j bila --write-neo4j, atau kolom di input)")
+    parser.add_argument("--drift", help="tulis ringkasan drift data yang di-score ke file ini (mis. drift_live.json)")
+    args = parser.parse_args(argv)
+
+    if args.model:
+        model, feature_names = load_model(args.model, args.feature_names)
+        threshold, version = RISK_THRESHOLD, f"{os.path.basename(args.model)}@{os.path.getmtime(args.model):.0f}"
+    else:
+        bundle = load_model_bundle(args.artifact)
+        model, feature_names, threshold, version = bundle
+    if args.threshold is not None:
+        threshold = args.threshold
+
+    drift = drift_baseline = None
+    if args.drift:
+        from drift import DriftSummary
+        drift_baseline = DriftSummary.load(DRIFT_BASELINE_PATH)
+        drift = drift_baseline.empty(meta={"source": args.csv if args.source == "csv" else "neo4j", "model": version})
+
+    driver = None
+    if args.source == "neo4j" or args.write_neo4j:
+        from neo4j import GraphDatabase
+        driver = GraphDatabase.driver(db_uri, auth=(db_user, db_pass))
+
+    try:
+        if args.source == "neo4j":
+            chunks = iter_neo4j_chunks(driver, args.chunk_size)
+        else:
+            chunks = iter_csv_chunks(args.csv, args.chunk_size)
+
+        previous = None
+        if args.incremental and args.previous:
+            previous = csv_previous(args.previous)
+        elif args.incremental and args.source == "csv" and args.write_neo4j:
+            previous = neo4j_previous(driver)
+        summary = run_batch(
+            chunks, model, feature_names, threshold, args.threads,
+            driver=driver if args.write_neo4j else None, output=args.output,
+            model_key=model_fingerprint_key(version, threshold),
+            incremental=args.incremental, previous=previous,
+            sync_features=args.incremental and args.source == "csv", drift=drift,
+        )
+    finally:
+        if driver is not None:
+            driver.close()
+
+    print(f"Selesai: {summary['rows']:,} karyawan ({summary['rescored']:,} di-score ulang, "
+          f"{summary['skipped']:,} dilewati), {summary['high_risk']:,} high risk, "
+          f"{summary['seconds']:.1f} detik")
+    if drift is not None:
+        drift.save(args.drift)
+        from drift import print_report
+        print_report(drift_baseline, drift)
+
+
+if __name__ == "__main__":
+    main()
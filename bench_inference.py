@@ -0,0 +1,103 @@
+"""Benchmark latensi CatBoostClassifier (jalur tab5) vs FastModel NumPy.
+
+    python bench_inference.py --rows 500 --repeat 20 --json bench_inference.json
+"""
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from columnar import read_frame
+from fast_inference import FastModel, FAST_MODEL_PATH
+from features import RAW_FEATURES, add_engineered_features, build_feature_frame
+from model_store import load_model_bundle
+
+
+def latency_stats(samples):
+    ms = np.asarray(samples) * 1000
+    return {"p50_ms": float(np.percentile(ms, 50)), "p99_ms": float(np.percentile(ms, 99)),
+            "mean_ms": float(ms.mean())}
+
+
+def time_single(fn, records):
+    samples = []
+    for record in records:
+        started = time.perf_counter()
+        fn(record)
+        samples.append(time.perf_counter() - started)
+    return latency_stats(samples)
+
+
+def time_batch(fn, records, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn(records)
+    elapsed = time.perf_counter() - started
+    return {"rows_per_sec": len(records) * repeat / elapsed, "seconds": elapsed}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", default="final_employee_data.csv")
+    parser.add_argument("--fast-model", default=FAST_MODEL_PATH)
+    parser.add_argument("--rows", type=int, default=500, help="jumlah sampel latensi single-row")
+    parser.add_argument("--repeat", type=int, default=20, help="pengulangan batch penuh")
+    parser.add_argument("--tolerance", type=float, default=1e-9)
+    parser.add_argument("--json", help="simpan hasil ke file JSON")
+    args = parser.parse_args(argv)
+
+    df = read_frame(args.data)
+    records = df[RAW_FEATURES].to_dict("records")
+    # model aktif yang sama dengan yang dikompilasi fast_inference.py
+    bundle = load_model_bundle()
+    model, feature_names = bundle.model, bundle.feature_names
+    fast = FastModel.load(args.fast_model)
+
+    def catboost_single(record):
+        X = build_feature_frame(add_engineered_features(pd.DataFrame([record])), feature_names)
+        return model.predict_proba(X)[0][1]
+
+    def catboost_batch(batch):
+        X = build_feature_frame(add_engineered_features(pd.DataFrame(batch)), feature_names)
+        return model.predict_proba(X)[:, 1]
+
+    def fast_single(record):
+        return fast.predict_proba([record])[0]
+
+    reference = catboost_batch(records)
+    candidate = fast.predict_proba(records)
+    max_diff = float(np.abs(reference - candidate).max())
+
+    sample = records[:args.rows]
+    report = {
+        "model_version": bundle.version,
+        "rows": len(records),
+        "max_abs_diff": max_diff,
+        "within_tolerance": max_diff <= args.tolerance,
+        "catboost": {
+            "single": time_single(catboost_single, sample),
+            "batch": time_batch(catboost_batch, records, args.repeat),
+        },
+        "fast": {
+            "single": time_single(fast_single, sample),
+            "batch": time_batch(fast.predict_proba, records, args.repeat),
+        },
+    }
+
+    for engine in ("catboost", "fast"):
+        single, batch = report[engine]["single"], report[engine]["batch"]
+        print(f"{engine:>9}: single p50 {single['p50_ms']:.3f} ms, p99 {single['p99_ms']:.3f} ms | "
+              f"batch {batch['rows_per_sec']:,.0f} baris/detik")
+    print(f"model {bundle.version}, selisih probabilitas maks: {max_diff:.2e} (toleransi {args.tolerance:.0e})")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0 if report["within_tolerance"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,242 @@
+"""Benchmark end-to-end pada data sintetis: ingest, query dashboard, scoring, rerun app.
+
+    python bench_suite.py --sizes 10000 100000 --dept-scale 5 --json logs/bench_suite.json
+    python bench_suite.py --sizes 100000 --target neo4j --wipe     # HANYA untuk container Neo4j benchmark
+
+Target "local" memakai LocalBackend di proses yang sama; target "neo4j" memuat
+data lewat bulk_loader ke database di config.py (NEO4J_URI dkk.). Hasil disimpan
+sebagai JSON beserta commit git (default logs/bench_suite.json) supaya bisa
+dibandingkan antar commit.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from bench_inference import latency_stats
+from queries import QUERIES, GRAPH_REL_TYPES
+
+DEFAULT_SIZES = [10_000, 100_000]
+DEFAULT_JSON = os.path.join("logs", "bench_suite.json")
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def query_params(df, threshold):
+    """Parameter representatif untuk setiap query di registry (sama dengan pemakaian di app.py)."""
+    top = df.sort_values("AttritionRisk", ascending=False)
+    dept, role = top["Department"].iloc[0], top["JobRole"].iloc[0]
+    emp_id = int(top["EmployeeID"].iloc[0])
+    page = {"threshold": threshold, "dept": None, "role": None}
+    return {
+        "graph_version": {},
+        "risk_distribution": {},
+        "high_risk_page": {**page, "limit": 26, "after_risk": None, "after_id": None},
+        "high_risk_export": page,
+        "graph_paths": {"rel_types": GRAPH_REL_TYPES, "limit": 25},
+        "graph_role_members": {"dept": dept, "role": role, "limit": 25},
+        "graph_employee_detail": {"id": emp_id},
+        "employee_record": {"id": emp_id},
+        "employee_drivers": {"ids": [int(i) for i in top["EmployeeID"].iloc[:25]]},
+        "driver_summary": {},
+        "similar_employees": {"id": emp_id, "limit": 10},
+        "similar_attrition": {"ids": [int(i) for i in top["EmployeeID"].iloc[:25]]},
+    }
+
+
+def bench_queries(backend, params, repeat):
+    results = {}
+    for name in QUERIES.names():
+        if name not in params:
+            results[name] = {"skipped": "parameter benchmark belum didefinisikan"}
+            continue
+        samples, rows = [], 0
+        for _ in range(repeat):
+            started = time.perf_counter()
+            rows = len(backend.run(name, params[name]))
+            samples.append(time.perf_counter() - started)
+        results[name] = dict(latency_stats(samples), rows=rows)
+    return results
+
+
+def bench_ingest_local(path):
+    from backends import LocalBackend
+    started = time.perf_counter()
+    backend = LocalBackend.from_csv(path)
+    elapsed = time.perf_counter() - started
+    return backend, {"rows": backend.n, "seconds": elapsed, "rows_per_sec": backend.n / elapsed}
+
+
+def bench_ingest_neo4j(path, wipe):
+    from neo4j import GraphDatabase
+    from backends import Neo4jBackend
+    from bulk_loader import load_csv
+    from config import db_uri, db_user, db_pass, db_name
+
+    driver = GraphDatabase.driver(db_uri, auth=(db_user, db_pass))
+    with driver.session(database=db_name) as session:
+        existing = session.run("MATCH (n) RETURN count(n) AS n").single()["n"]
+        if existing and not wipe:
+            driver.close()
+            raise SystemExit(f"database berisi {existing:,} node; pakai --wipe hanya pada container benchmark")
+        if existing:
+            session.run("MATCH (n) CALL { WITH n DETACH DELETE n } IN TRANSACTIONS OF 10000 ROWS").consume()
+    summary = load_csv(driver, path)
+    return Neo4jBackend(driver, db_name), summary
+
+
+def bench_scoring(df, bundle, single_rows, repeat):
+    from batch_scoring import score_frame
+    from features import RAW_FEATURES
+    from prediction_service import PredictionService
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        score_frame(bundle.model, bundle.feature_names, df, bundle.threshold)
+    batch_seconds = (time.perf_counter() - started) / repeat
+
+    service = PredictionService(bundle.model, bundle.feature_names, threshold=bundle.threshold)
+    records = df[RAW_FEATURES].head(single_rows).to_dict("records")
+    single = []
+    for record in records:
+        started = time.perf_counter()
+        service.predict(record, timeout=30)
+        single.append(time.perf_counter() - started)
+    service.close()
+    return {
+        "batch": {"rows": len(df), "seconds": batch_seconds, "rows_per_sec": len(df) / batch_seconds},
+        "single": latency_stats(single),
+    }
+
+
+def bench_rerun(path, target, reruns):
+    """Jalankan app.py lewat AppTest di subprocess (config dibaca dari env saat import)."""
+    env = dict(os.environ, GRAPH_BACKEND=target, LOCAL_DATA_PATH=path, SPAN_LOG_PATH="",
+               LOCAL_DRIVERS_PATH="", LOCAL_DRIVER_SUMMARY_PATH="", LOCAL_NEIGHBORS_PATH="",
+               SHARED_CACHE_DIR="")
+    proc = subprocess.run([sys.executable, __file__, "--rerun-child", "--reruns", str(reruns)],
+                          env=env, capture_output=True, text=True)
+    lines = [line for line in proc.stdout.splitlines() if line.startswith("{")]
+    if proc.returncode != 0 or not lines:
+        return {"error": (proc.stderr or proc.stdout).strip().splitlines()[-1:]}
+    return json.loads(lines[-1])
+
+
+def rerun_child(reruns):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file("app.py", default_timeout=900)
+    started = time.perf_counter()
+    at.run()
+    cold = time.perf_counter() - started
+    warm = []
+    for _ in range(reruns):
+        started = time.perf_counter()
+        at.run()
+        warm.append(time.perf_counter() - started)
+    result = {"cold_ms": cold * 1000, "warm": latency_stats(warm), "exceptions": [str(e.value) for e in at.exception]}
+    print(json.dumps(result))
+
+
+def run_size(n, args, sample, bundle, workdir):
+    from columnar import write_snapshot
+    from synthetic_workforce import generate
+
+    started = time.perf_counter()
+    df = generate(sample, n, args.dept_scale, args.role_scale, args.seed,
+                  bundle.model, bundle.feature_names, bundle.threshold)
+    path = os.path.join(workdir, f"synthetic_{n}.{args.format}")
+    if args.format == "parquet":
+        write_snapshot(df, path)
+    else:
+        df.to_csv(path, index=False)
+    result = {
+        "rows": n,
+        "departments": int(df["Department"].nunique()),
+        "job_roles": int(df["JobRole"].nunique()),
+        "generate_seconds": time.perf_counter() - started,
+    }
+    print(f"[{n:,}] data sintetis siap ({result['departments']} dept, {result['job_roles']} role)")
+
+    if args.target == "neo4j":
+        backend, result["ingest"] = bench_ingest_neo4j(path, args.wipe)
+    else:
+        backend, result["ingest"] = bench_ingest_local(path)
+    print(f"[{n:,}] ingest {result['ingest']['rows_per_sec']:,.0f} baris/detik")
+
+    result["queries"] = bench_queries(backend, query_params(df, bundle.threshold), args.repeat)
+    slowest = max((q for q in result["queries"].items() if "p50_ms" in q[1]), key=lambda q: q[1]["p50_ms"])
+    print(f"[{n:,}] {len(result['queries'])} query, paling lambat {slowest[0]} p50 {slowest[1]['p50_ms']:.1f} ms")
+
+    result["scoring"] = bench_scoring(df, bundle, args.single_rows, args.repeat)
+    print(f"[{n:,}] scoring batch {result['scoring']['batch']['rows_per_sec']:,.0f} baris/detik, "
+          f"single p50 {result['scoring']['single']['p50_ms']:.2f} ms")
+
+    if not args.skip_rerun:
+        result["rerun"] = bench_rerun(path, args.target, args.reruns)
+        if "cold_ms" in result["rerun"]:
+            print(f"[{n:,}] rerun app cold {result['rerun']['cold_ms']:,.0f} ms, "
+                  f"warm p50 {result['rerun']['warm']['p50_ms']:,.0f} ms")
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark dashboard pada data karyawan sintetis.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--dept-scale", type=int, default=1)
+    parser.add_argument("--role-scale", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--target", choices=["local", "neo4j"], default="local")
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv", help="format file data sintetis")
+    parser.add_argument("--wipe", action="store_true", help="kosongkan database Neo4j target sebelum ingest")
+    parser.add_argument("--repeat", type=int, default=5, help="pengulangan per query / batch scoring")
+    parser.add_argument("--single-rows", type=int, default=200, help="sampel latensi single-row")
+    parser.add_argument("--reruns", type=int, default=3, help="rerun hangat app.py per ukuran")
+    parser.add_argument("--skip-rerun", action="store_true")
+    parser.add_argument("--sample", default="final_employee_data.csv")
+    parser.add_argument("--json", default=DEFAULT_JSON)
+    parser.add_argument("--rerun-child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.rerun_child:
+        rerun_child(args.reruns)
+        return
+
+    from model_store import load_model_bundle
+    bundle = load_model_bundle()
+    sample = pd.read_csv(args.sample)
+
+    report = {
+        "commit": git_commit(),
+        "created_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "machine": {"python": platform.python_version(), "platform": platform.platform(),
+                    "cpu_count": os.cpu_count()},
+        "config": {"target": args.target, "format": args.format, "dept_scale": args.dept_scale, "role_scale": args.role_scale,
+                   "seed": args.seed, "repeat": args.repeat, "model_version": bundle.version},
+        "runs": [],
+    }
+    with tempfile.TemporaryDirectory() as workdir:
+        for n in args.sizes:
+            report["runs"].append(run_size(n, args, sample, bundle, workdir))
+
+    os.makedirs(os.path.dirname(args.json) or ".", exist_ok=True)
+    with open(args.json, "w") as f:
+        json.dump(report, f, indent=2, default=float)
+    print(f"Hasil disimpan di {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Bulk loader CSV karyawan -> Neo4j (idempotent, per batch UNWIND).
+
+    python bulk_loader.py --csv final_employee_data.csv --batch-size 10000
+"""
+import argparse
+import time
+
+from columnar import iter_frames
+from config import db_uri, db_user, db_pass, db_name
+from snapshot import BUMP_GRAPH_VERSION_QUERY
+
+DEFAULT_BATCH_SIZE = 10000
+
+SCHEMA_QUERIES = [
+    "CREATE CONSTRAINT employee_id IF NOT EXISTS FOR (e:Employee) REQUIRE e.EmployeeID IS UNIQUE",
+    "CREATE CONSTRAINT department_name IF NOT EXISTS FOR (d:Department) REQUIRE d.name IS UNIQUE",
+    "CREATE CONSTRAINT jobrole_name IF NOT EXISTS FOR (r:JobRole) REQUIRE r.name IS UNIQUE",
+    "CREATE INDEX employee_attrition_risk IF NOT EXISTS FOR (e:Employee) ON (e.AttritionRisk)",
+]
+
+# Department/JobRole unik per batch di-MERGE dulu, sehingga MERGE per-baris
+# di bawah cukup MATCH lewat constraint index.
+MERGE_GROUPS_QUERY = """
+UNWIND $pairs AS pair
+MERGE (d:Department {name: pair.Department})
+MERGE (r:JobRole {name: pair.JobRole})
+MERGE (d)-[:INCLUDES_ROLE]->(r)
+"""
+
+MERGE_EMPLOYEES_QUERY = """
+UNWIND $rows AS row
+MERGE (e:Employee {EmployeeID: row.EmployeeID})
+SET e += row
+WITH e, row
+MATCH (d:Department {name: row.Department})
+MATCH (r:JobRole {name: row.JobRole})
+OPTIONAL MATCH (e)-[old_d:WORKS_IN]->(od:Department) WHERE od.name <> row.Department
+DELETE old_d
+WITH DISTINCT e, row, d, r
+OPTIONAL MATCH (e)-[old_r:HAS_ROLE]->(orr:JobRole) WHERE orr.name <> row.JobRole
+DELETE old_r
+WITH DISTINCT e, d, r
+MERGE (e)-[:WORKS_IN]->(d)
+MERGE (e)-[:HAS_ROLE]->(r)
+"""
+
+
+def create_schema(session):
+    for query in SCHEMA_QUERIES:
+        session.run(query).consume()
+
+
+def frame_to_rows(df):
+    # astype(object) -> tipe Python native (int/float/str), NaN -> None
+    df = df.astype(object).where(df.notna(), None)
+    return df.to_dict("records")
+
+
+def load_batch(session, df):
+    pairs = frame_to_rows(df[["Department", "JobRole"]].drop_duplicates())
+    rows = frame_to_rows(df)
+
+    def work(tx):
+        tx.run(MERGE_GROUPS_QUERY, pairs=pairs).consume()
+        tx.run(MERGE_EMPLOYEES_QUERY, rows=rows).consume()
+
+    session.execute_write(work)
+
+
+def load_csv(driver, path, batch_size=DEFAULT_BATCH_SIZE, database=db_name, with_schema=True):
+    started = time.perf_counter()
+    n_rows = 0
+    with driver.session(database=database) as session:
+        if with_schema:
+            create_schema(session)
+        for df in iter_frames(path, batch_size):
+            if "EmployeeID" not in df.columns:
+                df.insert(0, "EmployeeID", range(n_rows + 1, n_rows + len(df) + 1))
+            load_batch(session, df)
+            n_rows += len(df)
+            elapsed = time.perf_counter() - started
+            print(f"  {n_rows:,} baris dimuat ({n_rows / elapsed:,.0f} baris/detik)")
+        if n_rows:
+            session.run(BUMP_GRAPH_VERSION_QUERY).consume()
+    elapsed = time.perf_counter() - started
+    return {"rows": n_rows, "seconds": elapsed, "rows_per_sec": n_rows / elapsed if elapsed else 0.0}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Muat CSV karyawan ke Neo4j secara bulk.")
+    parser.add_argument("--csv", default="final_employee_data.csv")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--skip-schema", action="store_true", help="jangan buat constraint/index")
+    args = parser.parse_args(argv)
+
+    from neo4j import GraphDatabase
+    with GraphDatabase.driver(db_uri, auth=(db_user, db_pass)) as driver:
+        summary = load_csv(driver, args.csv, args.batch_size, with_schema=not args.skip_schema)
+
+    print(f"Selesai: {summary['rows']:,} baris dalam {summary['seconds']:.1f} detik "
+          f"({summary['rows_per_sec']:,.0f} baris/detik)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import os
+import tempfile
+
+db_uri = os.environ.get("NEO4J_URI", "neo4j+s://f1092891.databases.neo4j.io")
+db_user = os.environ.get("NEO4J_USER", "neo4j")
+db_pass = os.environ.get("NEO4J_PASSWORD", "RJlbxkjZP74VnrD6R87vajPEbRS3Xs5YE2UyVZUT2K4")
+db_name = os.environ.get("NEO4J_DATABASE", "neo4j")
+
+# cutoff hasil optimasi PR-curve di notebook training
+RISK_THRESHOLD = 0.279
+
+SNAPSHOT_TTL = int(os.environ.get("SNAPSHOT_TTL", 600))
+GRAPH_VERSION_TTL = int(os.environ.get("GRAPH_VERSION_TTL", 30))
+
+QUERY_CACHE_TTL = int(os.environ.get("QUERY_CACHE_TTL", 300))
+QUERY_CACHE_MAX_MB = int(os.environ.get("QUERY_CACHE_MAX_MB", 64))
+
+# "neo4j" (default) = gagal terhubung tampil sebagai error; "local" = CSV lokal;
+# "auto" = CSV lokal bila Neo4j tidak bisa dihubungi (hanya untuk development, ditandai banner)
+GRAPH_BACKEND = os.environ.get("GRAPH_BACKEND", "neo4j")
+LOCAL_DATA_PATH = os.environ.get("LOCAL_DATA_PATH", "final_employee_data.csv")
+# hasil shap_batch.py --output-dir untuk mode lokal (opsional)
+LOCAL_DRIVERS_PATH = os.environ.get("LOCAL_DRIVERS_PATH", "employee_drivers.csv")
+LOCAL_DRIVER_SUMMARY_PATH = os.environ.get("LOCAL_DRIVER_SUMMARY_PATH", "driver_summary.csv")
+# hasil similarity.py --output-dir (edge SIMILAR_TO) untuk mode lokal (opsional)
+LOCAL_NEIGHBORS_PATH = os.environ.get("LOCAL_NEIGHBORS_PATH", "employee_neighbors.csv")
+
+# span instrumentation (instrumentation.py): log JSON lines, kosongkan untuk mematikan
+SPAN_LOG_PATH = os.environ.get("SPAN_LOG_PATH", os.path.join("logs", "spans.jsonl"))
+# panel profiling hanya tampil bila URL berisi ?admin=<ADMIN_TOKEN>
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN", "")
+
+# thread pool untuk query independen dalam satu view (app.run_queries)
+QUERY_WORKERS = int(os.environ.get("QUERY_WORKERS", 8))
+
+# ringkasan drift (drift.py): baseline data training & data live hasil batch scoring
+DRIFT_BASELINE_PATH = os.environ.get("DRIFT_BASELINE_PATH", "drift_baseline.json")
+DRIFT_LIVE_PATH = os.environ.get("DRIFT_LIVE_PATH", "drift_live.json")
+
+# cache bersama antar worker Streamlit di host yang sama (shared_cache.py);
+# default di /dev/shm (shared memory), kosongkan untuk mematikan
+SHARED_CACHE_DIR = os.environ.get("SHARED_CACHE_DIR", os.path.join(
+    "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir(), "hr-dashboard-cache"))
+SHARED_CACHE_MAX_MB = int(os.environ.get("SHARED_CACHE_MAX_MB", 256))
+
+# akses Neo4j (backends.Neo4jBackend): pool, fetch size, timeout dan retry
+NEO4J_POOL_SIZE = int(os.environ.get("NEO4J_POOL_SIZE", 50))
+# detik menunggu koneksi bebas di pool sebelum gagal (default driver 60 detik)
+NEO4J_ACQUIRE_TIMEOUT = float(os.environ.get("NEO4J_ACQUIRE_TIMEOUT", 5))
+NEO4J_CONNECT_TIMEOUT = float(os.environ.get("NEO4J_CONNECT_TIMEOUT", 10))
+NEO4J_FETCH_SIZE = int(os.environ.get("NEO4J_FETCH_SIZE", 2000))
+# batas waktu transaksi di server (detik), 0 = tanpa batas
+NEO4J_QUERY_TIMEOUT = float(os.environ.get("NEO4J_QUERY_TIMEOUT", 30))
+NEO4J_RETRIES = int(os.environ.get("NEO4J_RETRIES", 2))
+NEO4J_RETRY_BACKOFF = float(os.environ.get("NEO4J_RETRY_BACKOFF", 0.2))
+# circuit breaker: terbuka setelah N kegagalan beruntun, dicoba lagi setelah M detik
+NEO4J_BREAKER_FAILURES = int(os.environ.get("NEO4J_BREAKER_FAILURES", 5))
+NEO4J_BREAKER_RESET = float(os.environ.get("NEO4J_BREAKER_RESET", 30))
@@ -0,0 +1,449 @@
+"""Monitor drift fitur & skor terhadap distribusi data training.
+
+Ringkasan satu lintasan yang bisa digabung (merge) antar chunk/file:
+histogram bertepi tetap per fitur numerik (tepi = kuantil data training),
+tabel frekuensi per fitur kategori (maks. MAX_CATEGORIES) dan histogram
+AttritionRisk beserta label Attrition per bin. Ukurannya tetap berapa pun
+besar extract, jadi bisa diperbarui per chunk saat batch scoring.
+
+    python drift.py baseline                                  # CSV training -> drift_baseline.json
+    python drift.py update --source csv --csv final_employee_data.csv
+    python drift.py report
+    python batch_scoring.py --source neo4j --write-neo4j --drift drift_live.json
+"""
+import argparse
+import datetime
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from config import DRIFT_BASELINE_PATH, DRIFT_LIVE_PATH
+from features import (CATEGORICAL_FEATURES, add_engineered_features, attrition_labels, build_feature_frame,
+                      with_missing_categories)
+
+TRAINING_DATA = "ML Training & Dataset/HR-Employee-Attrition.csv"
+DEFAULT_BINS = 20
+SCORE_BINS = 50
+MAX_CATEGORIES = 200
+OTHER_CATEGORY = "(lainnya)"
+
+# ambang PSI yang lazim dipakai: < 0.1 stabil, 0.1-0.25 bergeser, > 0.25 drift
+PSI_WARN = 0.1
+PSI_ALERT = 0.25
+
+
+class NumericSketch:
+    """Histogram bertepi tetap: bin 0 = (-inf, edges[0]), bin terakhir = [edges[-1], inf)."""
+
+    kind = "numeric"
+
+    def __init__(self, edges):
+        self.edges = np.asarray(edges, dtype=np.float64)
+        self.counts = np.zeros(len(self.edges) + 1, dtype=np.int64)
+        self.missing = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+
+    @classmethod
+    def from_values(cls, values, bins=DEFAULT_BINS):
+        values = pd.to_numeric(pd.Series(values), errors="coerce").dropna().to_numpy(dtype=np.float64)
+        edges = np.unique(np.quantile(values, np.linspace(0, 1, bins + 1)[1:-1])) if len(values) else []
+        return cls(edges)
+
+    @property
+    def n(self):
+        return int(self.counts.sum())
+
+    @property
+    def mean(self):
+        return self.total / self.n if self.n else None
+
+    def bins(self, values):
+        return np.searchsorted(self.edges, values, side="right")
+
+    def update(self, values):
+        values = pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(dtype=np.float64)
+        valid = ~np.isnan(values)
+        values = values[valid]
+        self.missing += int((~valid).sum())
+        self.counts += np.bincount(self.bins(values), minlength=len(self.counts))
+        self.total += float(values.sum())
+        self.total_sq += float((values ** 2).sum())
+
+    def merge(self, other):
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError("tepi histogram berbeda, ringkasan tidak bisa digabung")
+        self.counts += other.counts
+        self.missing += other.missing
+        self.total += other.total
+        self.total_sq += other.total_sq
+
+    def empty(self):
+        return type(self)(self.edges)
+
+    def labels(self):
+        bounds = ["-∞"] + [f"{e:g}" for e in self.edges] + ["∞"]
+        return [f"[{lo}, {hi})" for lo, hi in zip(bounds[:-1], bounds[1:])]
+
+    def to_dict(self):
+        return {"kind": self.kind, "edges": self.edges.tolist(), "counts": self.counts.tolist(),
+                "missing": self.missing, "total": self.total, "total_sq": self.total_sq}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data["edges"])
+        sketch.counts = np.asarray(data["counts"], dtype=np.int64)
+        sketch.missing, sketch.total, sketch.total_sq = data["missing"], data["total"], data["total_sq"]
+        return sketch
+
+
+class ScoreSketch(NumericSketch):
+    """Histogram AttritionRisk plus jumlah skor dan label Attrition per bin (kalibrasi)."""
+
+    kind = "score"
+
+    def __init__(self, edges):
+        super().__init__(edges)
+        self.score_sum = np.zeros(len(self.counts))
+        self.label_n = np.zeros(len(self.counts), dtype=np.int64)
+        self.label_pos = np.zeros(len(self.counts), dtype=np.int64)
+
+    @classmethod
+    def for_threshold(cls, threshold, bins=SCORE_BINS):
+        # threshold dijadikan tepi bin supaya porsi high risk dihitung tepat
+        return cls(np.union1d(np.linspace(0, 1, bins + 1)[1:-1], [threshold]))
+
+    def update(self, scores, labels=None):
+        scores = np.asarray(scores, dtype=np.float64)
+        super().update(scores)
+        valid = ~np.isnan(scores)
+        bins = self.bins(scores[valid])
+        self.score_sum += np.bincount(bins, weights=scores[valid], minlength=len(self.counts))
+        if labels is not None:
+            labels = np.asarray(labels, dtype=np.float64)[valid]
+            known = ~np.isnan(labels)
+            self.label_n += np.bincount(bins[known], minlength=len(self.counts))
+            self.label_pos += np.bincount(bins[known], weights=labels[known], minlength=len(self.counts)).astype(np.int64)
+
+    def merge(self, other):
+        super().merge(other)
+        self.score_sum += other.score_sum
+        self.label_n += other.label_n
+        self.label_pos += other.label_pos
+
+    def share_above(self, threshold):
+        return float(self.counts[self.bins([threshold])[0]:].sum() / self.n) if self.n else None
+
+    def precision_above(self, threshold):
+        start = self.bins([threshold])[0]
+        labelled = self.label_n[start:].sum()
+        return float(self.label_pos[start:].sum() / labelled) if labelled else None
+
+    def calibration_error(self):
+        """Expected calibration error: selisih rata-rata skor vs laju Attrition aktual, dibobot per bin."""
+        known = self.label_n > 0
+        if not known.any():
+            return None
+        mean_score = self.score_sum[known] / np.maximum(self.counts[known], 1)
+        observed = self.label_pos[known] / self.label_n[known]
+        return float(np.sum(self.label_n[known] * np.abs(mean_score - observed)) / self.label_n[known].sum())
+
+    def to_dict(self):
+        return dict(super().to_dict(), score_sum=self.score_sum.tolist(),
+                    label_n=self.label_n.tolist(), label_pos=self.label_pos.tolist())
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = super().from_dict(data)
+        sketch.score_sum = np.asarray(data["score_sum"], dtype=np.float64)
+        sketch.label_n = np.asarray(data["label_n"], dtype=np.int64)
+        sketch.label_pos = np.asarray(data["label_pos"], dtype=np.int64)
+        return sketch
+
+
+class CategorySketch:
+    """Tabel frekuensi; kategori baru di atas MAX_CATEGORIES digabung ke OTHER_CATEGORY."""
+
+    kind = "category"
+
+    def __init__(self, counts=None, missing=0, max_categories=MAX_CATEGORIES):
+        self.counts = dict(counts or {})
+        self.missing = missing
+        self.max_categories = max_categories
+
+    @property
+    def n(self):
+        return int(sum(self.counts.values()))
+
+    def _add(self, category, count):
+        if category not in self.counts and len(self.counts) >= self.max_categories:
+            category = OTHER_CATEGORY
+        self.counts[category] = self.counts.get(category, 0) + int(count)
+
+    def update(self, values):
+        values = pd.Series(values)
+        self.missing += int(values.isna().sum())
+        for category, count in values.dropna().astype(str).value_counts().items():
+            self._add(category, count)
+
+    def merge(self, other):
+        for category, count in other.counts.items():
+            self._add(category, count)
+        self.missing += other.missing
+
+    def empty(self):
+        return type(self)(max_categories=self.max_categories)
+
+    def to_dict(self):
+        return {"kind": self.kind, "counts": self.counts, "missing": self.missing,
+                "max_categories": self.max_categories}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["counts"], data["missing"], data.get("max_categories", MAX_CATEGORIES))
+
+
+SKETCH_TYPES = {cls.kind: cls for cls in (NumericSketch, ScoreSketch, CategorySketch)}
+
+
+class DriftSummary:
+    """Ringkasan satu populasi: sketch per fitur model + sketch skor."""
+
+    def __init__(self, features, score, threshold, rows=0, meta=None):
+        self.features = features
+        self.score = score
+        self.threshold = threshold
+        self.rows = rows
+        self.meta = dict(meta or {})
+
+    @classmethod
+    def baseline(cls, X, scores, threshold, labels=None, bins=DEFAULT_BINS, meta=None):
+        """Tepi bin numerik diambil dari kuantil X (data training)."""
+        features = {
+            name: CategorySketch() if name in CATEGORICAL_FEATURES else NumericSketch.from_values(X[name], bins)
+            for name in X.columns
+        }
+        summary = cls(features, ScoreSketch.for_threshold(threshold), threshold, meta=meta)
+        summary.update(X, scores, labels)
+        return summary
+
+    def empty(self, meta=None):
+        """Ringkasan kosong dengan tepi bin yang sama (untuk data live)."""
+        return DriftSummary({name: sketch.empty() for name, sketch in self.features.items()},
+                            self.score.empty(), self.threshold, meta=meta)
+
+    def update(self, X, scores=None, labels=None):
+        for name, sketch in self.features.items():
+            if name in X.columns:
+                sketch.update(X[name])
+        if scores is not None:
+            self.score.update(scores, labels)
+        self.rows += len(X)
+
+    def merge(self, other):
+        for name, sketch in self.features.items():
+            if name in other.features:
+                sketch.merge(other.features[name])
+        self.score.merge(other.score)
+        self.rows += other.rows
+
+    def to_dict(self):
+        return {"threshold": self.threshold, "rows": self.rows, "meta": self.meta,
+                "score": self.score.to_dict(),
+                "features": {name: sketch.to_dict() for name, sketch in self.features.items()}}
+
+    @classmethod
+    def from_dict(cls, data):
+        features = {name: SKETCH_TYPES[d["kind"]].from_dict(d) for name, d in data["features"].items()}
+        return cls(features, ScoreSketch.from_dict(data["score"]), data["threshold"], data["rows"], data["meta"])
+
+    def save(self, path):
+        self.meta["updated_at"] = datetime.datetime.now().isoformat(timespec="seconds")
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+
+def _proportions(counts, eps=1e-4):
+    counts = np.asarray(counts, dtype=np.float64)
+    total = counts.sum()
+    return np.clip(counts / total if total else counts, eps, None)
+
+
+def psi(expected, actual):
+    """Population Stability Index antar dua vektor count dengan bin yang sama."""
+    p, q = _proportions(expected), _proportions(actual)
+    return float(np.sum((q - p) * np.log(q / p)))
+
+
+def ks(expected, actual):
+    """Statistik KS pada histogram (selisih CDF terbesar di tepi bin)."""
+    p = np.asarray(expected, dtype=np.float64)
+    q = np.asarray(actual, dtype=np.float64)
+    if not p.sum() or not q.sum():
+        return None
+    return float(np.max(np.abs(np.cumsum(p) / p.sum() - np.cumsum(q) / q.sum())))
+
+
+def aligned_counts(base, live):
+    """Vektor count baseline & live dengan urutan bin/kategori yang sama, plus label bin."""
+    if isinstance(base, CategorySketch):
+        categories = sorted(set(base.counts) | set(live.counts))
+        return ([base.counts.get(c, 0) for c in categories], [live.counts.get(c, 0) for c in categories],
+                categories)
+    return base.counts, live.counts, base.labels()
+
+
+def status(value):
+    if value is None:
+        return "-"
+    if value >= PSI_ALERT:
+        return "DRIFT"
+    if value >= PSI_WARN:
+        return "BERGESER"
+    return "STABIL"
+
+
+def drift_report(baseline, live):
+    """Satu baris per fitur: PSI, KS (numerik), rata-rata / kategori teratas, porsi kosong."""
+    rows = []
+    for name, base in baseline.features.items():
+        sketch = live.features.get(name)
+        if sketch is None or not sketch.n:
+            continue
+        expected, actual, _ = aligned_counts(base, sketch)
+        value = psi(expected, actual)
+        row = {"Fitur": name, "Tipe": "kategori" if isinstance(base, CategorySketch) else "numerik",
+               "PSI": value, "KS": None, "Status": status(value),
+               "Kosong": sketch.missing / (sketch.n + sketch.missing)}
+        if isinstance(base, CategorySketch):
+            row["Baseline"] = max(base.counts, key=base.counts.get) if base.counts else None
+            row["Live"] = max(sketch.counts, key=sketch.counts.get)
+        else:
+            row["KS"] = ks(expected, actual)
+            row["Baseline"] = f"{base.mean:,.2f}" if base.mean is not None else None
+            row["Live"] = f"{sketch.mean:,.2f}"
+        rows.append(row)
+    columns = ["Fitur", "Tipe", "PSI", "KS", "Status", "Baseline", "Live", "Kosong"]
+    return pd.DataFrame(rows, columns=columns).sort_values("PSI", ascending=False).reset_index(drop=True)
+
+
+def score_report(baseline, live, threshold=None):
+    """Drift skor & kalibrasi threshold: PSI/KS histogram AttritionRisk, porsi high risk,
+    precision di atas threshold dan calibration error (bila label Attrition tersedia)."""
+    threshold = baseline.threshold if threshold is None else threshold
+    base, cur = baseline.score, live.score
+    return {
+        "threshold": threshold,
+        "psi": psi(base.counts, cur.counts) if cur.n else None,
+        "ks": ks(base.counts, cur.counts),
+        "share_baseline": base.share_above(threshold),
+        "share_live": cur.share_above(threshold),
+        "precision_baseline": base.precision_above(threshold),
+        "precision_live": cur.precision_above(threshold),
+        "ece_baseline": base.calibration_error(),
+        "ece_live": cur.calibration_error(),
+    }
+
+
+def summarize_frame(summary, df, feature_names, scores=None):
+    """Perbarui ringkasan dari satu chunk data mentah (pipeline fitur sama dengan serving)."""
+    X = build_feature_frame(add_engineered_features(df), feature_names)
+    if scores is None and "AttritionRisk" in df.columns:
+        scores = pd.to_numeric(df["AttritionRisk"], errors="coerce").to_numpy(dtype=np.float64)
+    labels = attrition_labels(df["Attrition"]) if "Attrition" in df.columns else None
+    summary.update(with_missing_categories(X, df), scores, labels)
+
+
+def build_baseline(path, model, feature_names, threshold, bins=DEFAULT_BINS):
+    """Baseline dari CSV training, melalui pipeline fitur yang sama dengan data live."""
+    from batch_scoring import score_features
+
+    df = pd.read_csv(path, encoding="utf-8-sig")
+    X = build_feature_frame(add_engineered_features(df), feature_names)
+    scores, _ = score_features(model, X, threshold)
+    labels = attrition_labels(df["Attrition"]) if "Attrition" in df.columns else None
+    return DriftSummary.baseline(with_missing_categories(X, df), scores, threshold, labels, bins,
+                                 meta={"source": path})
+
+
+def print_report(baseline, live):
+    report = drift_report(baseline, live)
+    scores = score_report(baseline, live)
+    print(f"Baseline {baseline.rows:,} baris vs live {live.rows:,} baris")
+    print(report.to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+    if scores["psi"] is None:
+        # sama dengan panel drift dashboard: tanpa AttritionRisk di data live, skor dilewati
+        print("Skor: belum ada AttritionRisk di ringkasan live")
+        return
+    print(f"Skor: PSI {scores['psi']:.3f} · high risk (>= {scores['threshold']:.3f}) "
+          f"{scores['share_baseline']:.1%} -> {scores['share_live']:.1%}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Monitor drift fitur & skor terhadap data training.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    base = sub.add_parser("baseline", help="hitung ringkasan baseline dari CSV training")
+    base.add_argument("--csv", default=TRAINING_DATA)
+    base.add_argument("--bins", type=int, default=DEFAULT_BINS)
+    base.add_argument("--artifact", help="direktori artefak train.py (default: models/LATEST)")
+    base.add_argument("--out", default=DRIFT_BASELINE_PATH)
+
+    update = sub.add_parser("update", help="ringkas extract live (AttritionRisk yang sudah tersimpan)")
+    update.add_argument("--source", choices=["csv", "neo4j"], default="csv")
+    update.add_argument("--csv", default="final_employee_data.csv", help="file input untuk --source csv")
+    update.add_argument("--chunk-size", type=int, default=5000)
+    update.add_argument("--baseline", default=DRIFT_BASELINE_PATH)
+    update.add_argument("--out", default=DRIFT_LIVE_PATH)
+    update.add_argument("--merge", action="store_true", help="gabungkan dengan ringkasan live yang sudah ada")
+
+    report = sub.add_parser("report", help="cetak laporan PSI/KS")
+    report.add_argument("--baseline", default=DRIFT_BASELINE_PATH)
+    report.add_argument("--live", default=DRIFT_LIVE_PATH)
+    args = parser.parse_args(argv)
+
+    if args.command == "baseline":
+        from model_store import load_model_bundle
+        bundle = load_model_bundle(args.artifact)
+        summary = build_baseline(args.csv, bundle.model, bundle.feature_names, bundle.threshold, args.bins)
+        summary.meta["model"] = bundle.version
+        summary.save(args.out)
+        print(f"Baseline {summary.rows:,} baris, {len(summary.features)} fitur -> {args.out}")
+        return
+
+    baseline = DriftSummary.load(args.baseline)
+    if args.command == "report":
+        print_report(baseline, DriftSummary.load(args.live))
+        return
+
+    from batch_scoring import iter_csv_chunks, iter_neo4j_chunks
+    live = baseline.empty(meta={"source": args.csv if args.source == "csv" else "neo4j"})
+    driver = None
+    if args.source == "neo4j":
+        from neo4j import GraphDatabase
+        from config import db_uri, db_user, db_pass
+        driver = GraphDatabase.driver(db_uri, auth=(db_user, db_pass))
+    try:
+        chunks = iter_neo4j_chunks(driver, args.chunk_size) if driver else iter_csv_chunks(args.csv, args.chunk_size)
+        for df in chunks:
+            summarize_frame(live, df, list(baseline.features))
+    finally:
+        if driver is not None:
+            driver.close()
+    if args.merge and os.path.exists(args.out):
+        previous = DriftSummary.load(args.out)
+        previous.merge(live)
+        live = previous
+    live.save(args.out)
+    print_report(baseline, live)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""Inference CatBoost tanpa pandas/catboost saat runtime.
+
+Model oblivious-tree diekspor ke JSON lalu "dikompilasi" menjadi array NumPy:
+split float dievaluasi dengan perbandingan vektor + perkalian matriks bit,
+sedangkan split kategorikal (OnlineCtr / OneHot) dibaca dari tabel hash beku
+yang diprobe sekali dari CatBoost untuk setiap kombinasi nilai kategori.
+
+    python fast_inference.py --data final_employee_data.csv --out catboost_optimized.npz
+"""
+import argparse
+import itertools
+import json
+import os
+import tempfile
+
+import numpy as np
+
+from config import RISK_THRESHOLD
+from features import ENGINEERED_FEATURES, engineered_columns
+
+FAST_MODEL_PATH = "catboost_optimized.npz"
+UNSEEN = "__unseen__"
+
+
+class FastModel:
+
+    def __init__(self, arrays):
+        self.feature_names = [str(f) for f in arrays["feature_names"]]
+        self.cat_features = [str(f) for f in arrays["cat_features"]]
+        self.float_flat_index = arrays["float_flat_index"]
+        self.split_feature = arrays["split_feature"]
+        self.split_border = arrays["split_border"]
+        self.split_weight = arrays["split_weight"].astype(np.float32)
+        self.leaf_offsets = arrays["leaf_offsets"]
+        self.leaf_values = arrays["leaf_values"]
+        self.ctr_table = arrays["ctr_table"]
+        self.combo_float_feature = arrays["combo_float_feature"]
+        self.combo_float_borders = [arrays[f"combo_float_borders_{i}"] for i in range(len(self.combo_float_feature))]
+        self.radix = arrays["radix"]
+        self.scale = float(arrays["scale"])
+        self.bias = float(arrays["bias"])
+        # tabel hash beku: nilai kategori -> kode (nilai asing -> kode UNSEEN)
+        self.vocab = []
+        for i in range(len(self.cat_features)):
+            values = [str(v) for v in arrays[f"vocab_{i}"]]
+            self.vocab.append({v: code for code, v in enumerate(values)})
+        self._col_index = {name: j for j, name in enumerate(self.feature_names)}
+
+    @classmethod
+    def load(cls, path=FAST_MODEL_PATH):
+        with np.load(path, allow_pickle=False) as arrays:
+            return cls({key: arrays[key] for key in arrays.files})
+
+    def _combo_index(self, cat_values, float_matrix):
+        idx = np.zeros(len(float_matrix), dtype=np.int64)
+        digit = 0
+        for values, vocab in zip(cat_values, self.vocab):
+            unseen = vocab[UNSEEN]
+            codes = np.fromiter((vocab.get(str(v), unseen) for v in values), dtype=np.int64, count=len(values))
+            idx = idx * self.radix[digit] + codes
+            digit += 1
+        for feat, borders in zip(self.combo_float_feature, self.combo_float_borders):
+            codes = (float_matrix[:, feat, None] > borders[None, :]).sum(axis=1)
+            idx = idx * self.radix[digit] + codes
+            digit += 1
+        return idx
+
+    def raw_score(self, float_matrix, cat_values):
+        """float_matrix: (n, jumlah fitur float) sesuai urutan float model;
+        cat_values: list kolom nilai kategori sesuai urutan cat_features."""
+        bits = float_matrix[:, self.split_feature] > self.split_border
+        # matmul float32 (BLAS) jauh lebih cepat dari int; eksak untuk indeks leaf < 2**24
+        leaf = (bits.astype(np.float32) @ self.split_weight).astype(np.int64)
+        leaf |= self.ctr_table[self._combo_index(cat_values, float_matrix)]
+        return self.leaf_values[leaf + self.leaf_offsets].sum(axis=1) * self.scale + self.bias
+
+    def predict_proba(self, records):
+        """Probabilitas attrition untuk list record (dict kolom mentah seperti form tab5)."""
+        n = len(records)
+        columns = {
+            name: [record.get(name, 0) for record in records]
+            for name in self.feature_names if name not in ENGINEERED_FEATURES
+        }
+        columns.update(engineered_columns(columns))
+        float_matrix = np.empty((n, len(self.float_flat_index)), dtype=np.float64)
+        for j, flat in enumerate(self.float_flat_index):
+            float_matrix[:, j] = np.asarray(columns[self.feature_names[flat]], dtype=np.float64)
+        cat_values = [columns[name] for name in self.cat_features]
+        return 1.0 / (1.0 + np.exp(-self.raw_score(float_matrix, cat_values)))
+
+    def predict(self, records, threshold=RISK_THRESHOLD):
+        proba = self.predict_proba(records)
+        return proba, proba >= threshold
+
+
+def compile_model(model, feature_names, data, out_path=FAST_MODEL_PATH):
+    """Bangun artefak .npz dari CatBoostClassifier. `data` (DataFrame dengan kolom
+    feature_names) dipakai untuk kosakata kategori dan baris dasar probe."""
+    from catboost import Pool
+    import pandas as pd
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "model.json")
+        model.save_model(json_path, format="json")
+        with open(json_path) as f:
+            spec = json.load(f)
+
+    info = spec["features_info"]
+    float_features = info["float_features"]
+    cat_features = info["categorical_features"]
+    float_flat_index = np.array([f["flat_feature_index"] for f in float_features], dtype=np.int64)
+    trees = spec["oblivious_trees"]
+    n_trees = len(trees)
+
+    split_feature, split_border, split_tree, split_bit = [], [], [], []
+    nonfloat_mask = np.zeros(n_trees, dtype=np.int64)
+    leaf_values, leaf_offsets = [], []
+    max_depth = 0
+    for t, tree in enumerate(trees):
+        splits = tree["splits"] or []
+        max_depth = max(max_depth, len(splits))
+        for bit, split in enumerate(splits):
+            if split["split_type"] == "FloatFeature":
+                split_feature.append(split["float_feature_index"])
+                split_border.append(split["border"])
+                split_tree.append(t)
+                split_bit.append(bit)
+            else:
+                nonfloat_mask[t] |= 1 << bit
+        leaf_offsets.append(len(leaf_values))
+        leaf_values.extend(tree["leaf_values"])
+
+    split_weight = np.zeros((len(split_feature), n_trees), dtype=np.int32)
+    split_weight[np.arange(len(split_feature)), split_tree] = 1 << np.array(split_bit, dtype=np.int32)
+
+    # fitur float yang ikut kombinasi CTR -> interval border jadi bagian kunci tabel
+    combo_borders = {}
+    for ctr in info.get("ctrs", []):
+        for element in ctr["elements"]:
+            if element["combination_element"] == "float_feature":
+                combo_borders.setdefault(element["float_feature_index"], set()).add(element["border"])
+    combo_float_feature = sorted(combo_borders)
+    combo_float_borders = [np.array(sorted(combo_borders[f]), dtype=np.float64) for f in combo_float_feature]
+
+    cat_names = [feature_names[c["flat_feature_index"]] for c in cat_features]
+    vocab = [sorted(data[name].astype(str).unique().tolist()) + [UNSEEN] for name in cat_names]
+    float_choices = []
+    for borders in combo_float_borders:
+        points = np.concatenate(([borders[0] - 1.0], (borders[:-1] + borders[1:]) / 2, [borders[-1] + 1.0]))
+        float_choices.append(points.tolist())
+    radix = np.array([len(v) for v in vocab] + [len(c) for c in float_choices], dtype=np.int64)
+
+    base = data[feature_names].iloc[[0]]
+    grid = list(itertools.product(*vocab, *float_choices))
+    probe = pd.DataFrame(np.repeat(base.to_numpy(dtype=object), len(grid), axis=0), columns=feature_names)
+    for k, name in enumerate(cat_names):
+        probe[name] = [combo[k] for combo in grid]
+    for k, feat in enumerate(combo_float_feature):
+        probe[feature_names[float_flat_index[feat]]] = [combo[len(cat_names) + k] for combo in grid]
+    for name in cat_names:
+        probe[name] = probe[name].astype(str)
+
+    leaf_idx = model.calc_leaf_indexes(Pool(probe, cat_features=model.get_cat_feature_indices()))
+    dtype = np.uint8 if max_depth <= 8 else np.uint16
+    ctr_table = (leaf_idx & nonfloat_mask[None, :]).astype(dtype)
+
+    scale, bias = spec.get("scale_and_bias", [1, [0]])
+    bias = bias[0] if isinstance(bias, list) else bias
+
+    arrays = {
+        "feature_names": np.array(feature_names),
+        "cat_features": np.array(cat_names),
+        "float_flat_index": float_flat_index,
+        "split_feature": np.array(split_feature, dtype=np.int64),
+        "split_border": np.array(split_border, dtype=np.float64),
+        "split_weight": split_weight,
+        "leaf_offsets": np.array(leaf_offsets, dtype=np.int64),
+        "leaf_values": np.array(leaf_values, dtype=np.float64),
+        "ctr_table": ctr_table,
+        "combo_float_feature": np.array(combo_float_feature, dtype=np.int64),
+        "radix": radix,
+        "scale": np.float64(scale),
+        "bias": np.float64(bias),
+    }
+    for i, borders in enumerate(combo_float_borders):
+        arrays[f"combo_float_borders_{i}"] = borders
+    for i, values in enumerate(vocab):
+        arrays[f"vocab_{i}"] = np.array(values)
+    np.savez_compressed(out_path, **arrays)
+    return FastModel(arrays)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Kompilasi model CatBoost ke evaluator NumPy.")
+    parser.add_argument("--data", default="final_employee_data.csv", help="CSV untuk kosakata kategori")
+    parser.add_argument("--out", default=FAST_MODEL_PATH)
+    args = parser.parse_args(argv)
+
+    from columnar import read_frame
+    from features import add_engineered_features, build_feature_frame
+    from model_store import load_model_bundle
+
+    bundle = load_model_bundle()
+    model, feature_names = bundle.model, bundle.feature_names
+    data = build_feature_frame(add_engineered_features(read_frame(args.data)), feature_names)
+    fast = compile_model(model, feature_names, data, args.out)
+    print(f"Model terkompilasi: {args.out} ({len(fast.leaf_offsets)} tree, "
+          f"tabel kategori {fast.ctr_table.shape[0]:,} kombinasi)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+# kolom input mentah (sama dengan form di tab5)
+RAW_FEATURES = [
+    'Age', 'MonthlyIncome', 'TotalWorkingYears', 'OverTime', 'Department', 'JobRole',
+    'MaritalStatus', 'DistanceFromHome', 'Education', 'EducationField',
+    'BusinessTravel', 'StockOptionLevel', 'JobLevel', 'JobSatisfaction',
+    'EnvironmentSatisfaction', 'RelationshipSatisfaction', 'JobInvolvement',
+    'NumCompaniesWorked', 'TrainingTimesLastYear', 'WorkLifeBalance',
+    'YearsAtCompany', 'YearsInCurrentRole', 'YearsSinceLastPromotion', 'YearsWithCurrManager',
+]
+
+ENGINEERED_FEATURES = ['TotalSatisfaction', 'CareerStability', 'LoyaltyRatio', 'IncomePerAge']
+
+CATEGORICAL_FEATURES = ['BusinessTravel', 'Department', 'EducationField', 'JobRole', 'MaritalStatus', 'OverTime']
+
+
+def engineered_columns(columns):
+    """Hitung fitur rekayasa dari kolom mentah (Series/array) secara vektor.
+    Aturan sama dengan form tab5: YearsAtCompany 0 -> 0.1, TotalWorkingYears 0 -> 1, Age 0 -> 18."""
+    years_at_comp = np.asarray(columns['YearsAtCompany'], dtype=float)
+    total_working = np.asarray(columns['TotalWorkingYears'], dtype=float)
+    age = np.asarray(columns['Age'], dtype=float)
+
+    years_at_comp_safe = np.where(years_at_comp == 0, 0.1, years_at_comp)
+    total_working_safe = np.where(total_working == 0, 1, total_working)
+    age_safe = np.where(age == 0, 18, age)
+
+    return {
+        'TotalSatisfaction': (
+            np.asarray(columns['JobSatisfaction']) + np.asarray(columns['EnvironmentSatisfaction']) +
+            np.asarray(columns['RelationshipSatisfaction']) + np.asarray(columns['JobInvolvement'])
+        ),
+        'CareerStability': np.asarray(columns['YearsInCurrentRole'], dtype=float) / years_at_comp_safe,
+        'LoyaltyRatio': years_at_comp / total_working_safe,
+        'IncomePerAge': np.asarray(columns['MonthlyIncome'], dtype=float) / age_safe,
+    }
+
+
+def add_engineered_features(df):
+    """Tambahkan fitur rekayasa (TotalSatisfaction, CareerStability, LoyaltyRatio,
+    IncomePerAge) secara vektor pada seluruh baris sekaligus."""
+    return df.assign(**engineered_columns(df))
+
+
+def build_feature_frame(df, feature_names):
+    """Susun DataFrame dalam urutan feature_names; kolom yang tidak ada diisi 0."""
+    missing = [col for col in feature_names if col not in df.columns]
+    if missing:
+        df = df.assign(**{col: 0 for col in missing})
+    X = df[feature_names].copy()
+    for col in CATEGORICAL_FEATURES:
+        if col in X.columns:
+            X[col] = X[col].astype(str)
+    return X
+
+
+def with_missing_categories(X, df):
+    """build_feature_frame mengubah kategori kosong menjadi string "nan"; untuk statistik
+    (drift) kembalikan ke NaN agar dihitung sebagai missing, bukan kategori tersendiri."""
+    columns = [col for col in CATEGORICAL_FEATURES if col in X.columns and col in df.columns]
+    return X.assign(**{col: X[col].mask(df[col].isna().to_numpy()) for col in columns})
+
+
+def attrition_labels(values):
+    """Label Attrition 1/0 (dataset memakai 0/1, data IBM asli "Yes"/"No"); lainnya NaN."""
+    values = pd.Series(values).replace({"Yes": 1, "No": 0})
+    return pd.to_numeric(values, errors="coerce").to_numpy(dtype=np.float64)
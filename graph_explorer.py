@@ -0,0 +1,168 @@
+"""Graph explorer bertingkat (level-of-detail) untuk tab6.
+
+Level 0: supernode Department -> JobRole (jumlah karyawan & high risk) dari
+snapshot dashboard, tanpa query tambahan. Klik supernode JobRole untuk
+memuat karyawan di sel itu; klik karyawan untuk melihat detailnya dan
+memuat rekan paling mirip (edge SIMILAR_TO dari similarity.py).
+Lingkungan yang sudah pernah diambil disimpan di indeks node/edge sisi klien,
+jadi ekspansi ulang tidak memicu query lagi.
+"""
+import math
+
+HIGH_RISK_COLOR = "#ef476f"
+LOW_RISK_COLOR = "#06d6a0"
+DEPT_COLOR = "#26547c"
+ROLE_COLOR = "#ffd166"
+EDGE_COLOR = "#bdc3c7"
+
+
+def dept_node_id(dept):
+    return f"dept:{dept}"
+
+
+def role_node_id(dept, role):
+    return f"role:{dept}|{role}"
+
+
+def employee_node_id(employee_id):
+    return f"emp:{employee_id}"
+
+
+def parse_node_id(node_id):
+    kind, _, key = node_id.partition(":")
+    if kind == "role":
+        dept, _, role = key.partition("|")
+        return kind, (dept, role)
+    if kind == "emp":
+        return kind, int(key)
+    return kind, key
+
+
+def node_style(node_data, node_labels, threshold):
+    """Ubah node Neo4j (dict properti + label) jadi (id, label, shape, color, title)."""
+    if "Employee" in node_labels:
+        n_id = str(node_data.get('EmployeeID', 'Unknown'))
+        risk = node_data.get('AttritionRisk', 0)
+        color = HIGH_RISK_COLOR if risk >= threshold else LOW_RISK_COLOR
+        return n_id, f"Emp {n_id}", "dot", color, f"Risk: {risk:.1%}"
+    if "Department" in node_labels:
+        n_id = node_data.get('name', 'Unknown Dept')
+        return n_id, n_id, "hexagon", DEPT_COLOR, ""
+    if "JobRole" in node_labels:
+        n_id = node_data.get('name', 'Unknown Role')
+        return n_id, n_id, "diamond", ROLE_COLOR, ""
+    n_id = str(node_data.get('name', str(node_data)))
+    return n_id, n_id, "dot", "#999999", ""
+
+
+def _supernode_size(total, max_total):
+    return 15 + 25 * math.sqrt(total / max_total) if max_total else 15
+
+
+class GraphExplorer:
+
+    def __init__(self, threshold, member_limit=25):
+        self.threshold = threshold
+        self.member_limit = member_limit
+        self.version = None
+        self.nodes = {}
+        self.edges = {}
+        self.expanded = {}
+        self._neighborhoods = {}
+        self.fetches = 0
+
+    def load_overview(self, cells, version=None):
+        """Bangun level 0 dari sel snapshot (dept, role, total, risk_count)."""
+        if self.version == version and self.nodes:
+            return
+        self.version = version
+        self.nodes, self.edges, self.expanded, self._neighborhoods = {}, {}, {}, {}
+
+        dept_totals = cells.groupby("dept")[["total", "risk_count"]].sum()
+        max_dept = dept_totals["total"].max() if len(dept_totals) else 0
+        max_cell = cells["total"].max() if len(cells) else 0
+        for dept, row in dept_totals.iterrows():
+            self._add_node(dept_node_id(dept), f"{dept}", "hexagon", DEPT_COLOR,
+                           f"{int(row['risk_count'])} high risk dari {int(row['total'])} karyawan",
+                           _supernode_size(row["total"], max_dept) + 10)
+        for row in cells.itertuples(index=False):
+            node_id = role_node_id(row.dept, row.role)
+            share = row.risk_count / row.total if row.total else 0
+            self._add_node(node_id, f"{row.role} ({int(row.risk_count)}/{int(row.total)})", "diamond",
+                           HIGH_RISK_COLOR if share >= 0.5 else ROLE_COLOR,
+                           f"{share:.0%} high risk · klik untuk memuat karyawan",
+                           _supernode_size(row.total, max_cell))
+            self._add_edge(dept_node_id(row.dept), node_id, "INCLUDES_ROLE")
+
+    def toggle(self, node_id, fetch):
+        """Klik node: expand (memakai indeks lokal bila pernah diambil) atau collapse."""
+        if node_id not in self.nodes:
+            return
+        if node_id in self.expanded:
+            self._collapse(node_id)
+            return
+        if node_id not in self._neighborhoods:
+            neighborhood = fetch(node_id, self.member_limit)
+            if neighborhood is None:
+                return
+            self._neighborhoods[node_id] = neighborhood
+            self.fetches += 1
+        nodes, edges = self._neighborhoods[node_id]
+        added = []
+        for node in nodes:
+            if node["id"] not in self.nodes:
+                self.nodes[node["id"]] = node
+                added.append(node["id"])
+        for edge in edges:
+            self._add_edge(edge["source"], edge["target"], edge["label"])
+        self.expanded[node_id] = added
+
+    def _collapse(self, node_id):
+        for child in self.expanded.pop(node_id, []):
+            if child in self.expanded:
+                self._collapse(child)
+            self.nodes.pop(child, None)
+        self.edges = {
+            key: edge for key, edge in self.edges.items()
+            if edge["source"] in self.nodes and edge["target"] in self.nodes
+        }
+
+    def employee_neighborhood(self, parent_id, rows):
+        """rows: [{'id': EmployeeID, 'risk': AttritionRisk}] hasil query proyeksi."""
+        nodes, edges = [], []
+        for row in rows:
+            node_id = employee_node_id(row["id"])
+            risk = row["risk"] or 0
+            nodes.append({
+                "id": node_id, "label": f"Emp {row['id']}", "shape": "dot", "size": 12,
+                "color": HIGH_RISK_COLOR if risk >= self.threshold else LOW_RISK_COLOR,
+                "title": f"Risk: {risk:.1%}",
+            })
+            edges.append({"source": node_id, "target": parent_id, "label": "HAS_ROLE"})
+        return nodes, edges
+
+    def similar_neighborhood(self, parent_id, rows):
+        """rows: hasil query similar_employees (id, score, Risk, Attrition)."""
+        nodes, edges = [], []
+        for row in rows:
+            node_id = employee_node_id(row["id"])
+            risk = row["Risk"] or 0
+            left = row.get("Attrition") == 1
+            nodes.append({
+                "id": node_id, "label": f"Emp {row['id']}", "shape": "star" if left else "dot", "size": 12,
+                "color": HIGH_RISK_COLOR if risk >= self.threshold else LOW_RISK_COLOR,
+                "title": f"Risk: {risk:.1%} · kemiripan {row['score']:.2f}" + (" · keluar" if left else ""),
+            })
+            edges.append({"source": parent_id, "target": node_id, "label": "SIMILAR_TO"})
+        return nodes, edges
+
+    def stats(self):
+        return {"nodes": len(self.nodes), "edges": len(self.edges),
+                "expanded": len(self.expanded), "cached": len(self._neighborhoods), "fetches": self.fetches}
+
+    def _add_node(self, node_id, label, shape, color, title, size):
+        self.nodes[node_id] = {"id": node_id, "label": label, "shape": shape,
+                               "color": color, "title": title, "size": size}
+
+    def _add_edge(self, source, target, label):
+        self.edges[(source, target, label)] = {"source": source, "target": target, "label": label}
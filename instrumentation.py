@@ -0,0 +1,152 @@
+"""Span pengukuran waktu untuk hot path dashboard (query, model, DataFrame, chart).
+
+    tracer = Tracer(exporter=JsonlExporter("spans.jsonl"))
+    tracer.begin_rerun(session_id)
+    with tracer.span("query:high_risk_page", "query") as span:
+        rows = backend.run(...)
+        span["rows"] = len(rows)
+    tracer.end_rerun()
+
+Setiap span dicatat ke rerun yang sedang berjalan (per sesi, N rerun terakhir),
+ke jendela bergulir per nama span untuk p50/p95, dan ke exporter (JSON lines).
+"""
+import contextvars
+import json
+import os
+import threading
+import time
+from collections import deque, OrderedDict
+from contextlib import contextmanager
+
+import numpy as np
+
+_current_rerun = contextvars.ContextVar("current_rerun", default=None)
+
+
+class JsonlExporter:
+    """Tulis satu baris JSON per span; file diputar ke <path>.1 setelah max_bytes."""
+
+    def __init__(self, path, max_bytes=10 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def export(self, record):
+        line = json.dumps(record, default=str) + "\n"
+        with self._lock:
+            try:
+                if os.path.getsize(self.path) > self.max_bytes:
+                    os.replace(self.path, self.path + ".1")
+            except OSError:
+                pass
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+
+class Tracer:
+
+    def __init__(self, window=500, reruns_per_session=20, max_sessions=200, exporter=None):
+        self.window = window
+        self.reruns_per_session = reruns_per_session
+        self.max_sessions = max_sessions
+        self.exporter = exporter
+        self._rolling = {}
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def begin_rerun(self, session_id):
+        rerun = {"session": session_id, "started": time.perf_counter(), "ts": time.time(), "spans": []}
+        with self._lock:
+            reruns = self._sessions.pop(session_id, None) or deque(maxlen=self.reruns_per_session)
+            reruns.append(rerun)
+            self._sessions[session_id] = reruns
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        _current_rerun.set(rerun)
+        return rerun
+
+    def end_rerun(self):
+        rerun = _current_rerun.get()
+        if rerun is None:
+            return
+        rerun["ms"] = (time.perf_counter() - rerun["started"]) * 1000
+        self._record({"name": "rerun", "kind": "rerun", "ms": rerun["ms"], "spans": len(rerun["spans"])}, rerun)
+        _current_rerun.set(None)
+
+    @contextmanager
+    def span(self, name, kind="other", **attrs):
+        """Ukur blok kode. Set span["rows"] / span["bytes"] di dalam blok bila relevan;
+        exception dicatat di span["error"] lalu diteruskan."""
+        record = {"name": name, "kind": kind, **attrs}
+        started = time.perf_counter()
+        try:
+            yield record
+        except Exception as e:
+            record["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            record["ms"] = (time.perf_counter() - started) * 1000
+            self._record(record, _current_rerun.get())
+
+    def _record(self, record, rerun):
+        record["ts"] = time.time()
+        record["thread"] = threading.current_thread().name
+        if rerun is not None:
+            record["session"] = rerun["session"]
+        with self._lock:
+            if rerun is not None and record["kind"] != "rerun":
+                rerun["spans"].append(record)
+            stat = self._rolling.get(record["name"])
+            if stat is None:
+                stat = self._rolling[record["name"]] = {
+                    "kind": record["kind"], "ms": deque(maxlen=self.window), "calls": 0, "errors": 0,
+                    "rows": 0, "bytes": 0,
+                }
+            stat["ms"].append(record["ms"])
+            stat["calls"] += 1
+            stat["errors"] += "error" in record
+            stat["rows"] += record.get("rows") or 0
+            stat["bytes"] += record.get("bytes") or 0
+        if self.exporter is not None:
+            try:
+                self.exporter.export(record)
+            except OSError:
+                pass
+
+    def stats(self):
+        """p50/p95 per nama span atas `window` pengukuran terakhir."""
+        with self._lock:
+            items = [(name, dict(stat, ms=list(stat["ms"]))) for name, stat in self._rolling.items()]
+        rows = []
+        for name, stat in items:
+            ms = np.asarray(stat["ms"])
+            rows.append({
+                "span": name, "kind": stat["kind"], "calls": stat["calls"], "errors": stat["errors"],
+                "p50_ms": float(np.percentile(ms, 50)), "p95_ms": float(np.percentile(ms, 95)),
+                "max_ms": float(ms.max()), "avg_rows": stat["rows"] / stat["calls"],
+                "avg_bytes": stat["bytes"] / stat["calls"],
+            })
+        return sorted(rows, key=lambda r: -r["p95_ms"])
+
+    def reruns(self, session_id=None):
+        with self._lock:
+            if session_id is not None:
+                return list(self._sessions.get(session_id, []))
+            return [rerun for reruns in self._sessions.values() for rerun in reruns]
+
+    def slowest(self, session_id=None, last_reruns=5, n=20):
+        """Span paling lambat dari `last_reruns` rerun terakhir (satu sesi atau semua)."""
+        reruns = sorted(self.reruns(session_id), key=lambda r: r["ts"])[-last_reruns:]
+        spans = [dict(span, rerun=i) for i, rerun in enumerate(reruns) for span in rerun["spans"]]
+        return sorted(spans, key=lambda s: -s["ms"])[:n]
+
+    def session_stats(self, session_id):
+        reruns = [r for r in self.reruns(session_id) if "ms" in r]
+        if not reruns:
+            return {}
+        ms = np.asarray([r["ms"] for r in reruns])
+        return {"reruns": len(reruns), "p50_ms": float(np.percentile(ms, 50)),
+                "p95_ms": float(np.percentile(ms, 95)), "last_ms": float(ms[-1])}
@@ -0,0 +1,70 @@
+import json
+import os
+import pickle
+from collections import namedtuple
+
+from config import RISK_THRESHOLD
+
+MODEL_PATH = "catboost_optimized.cbm"
+FEATURE_NAMES_PATH = "feature_names.pkl"
+
+# artefak versi hasil train.py: models/<versi>/{model.cbm, metadata.json}
+ARTIFACT_ROOT = os.environ.get("MODEL_ARTIFACT_ROOT", "models")
+LATEST_FILE = "LATEST"
+
+ModelBundle = namedtuple("ModelBundle", ["model", "feature_names", "threshold", "version"])
+
+
+def load_model(model_path=MODEL_PATH, feature_names_path=FEATURE_NAMES_PATH):
+    # catboost diimport saat dipakai: artifact_threshold() tidak perlu menunggu import-nya
+    from catboost import CatBoostClassifier
+    model = CatBoostClassifier()
+    model.load_model(model_path)
+    with open(feature_names_path, 'rb') as f:
+        feature_names = pickle.load(f)
+    return model, feature_names
+
+
+def latest_artifact(root=ARTIFACT_ROOT):
+    try:
+        with open(os.path.join(root, LATEST_FILE)) as f:
+            version = f.read().strip()
+    except FileNotFoundError:
+        return None
+    return os.path.join(root, version) if version else None
+
+
+def load_artifact(path):
+    from catboost import CatBoostClassifier
+    with open(os.path.join(path, "metadata.json")) as f:
+        metadata = json.load(f)
+    model = CatBoostClassifier()
+    model.load_model(os.path.join(path, "model.cbm"))
+    return ModelBundle(model, metadata["feature_names"], metadata["threshold"], metadata["version"])
+
+
+def resolve_artifact(artifact=None):
+    return artifact or os.environ.get("MODEL_ARTIFACT") or latest_artifact()
+
+
+def artifact_threshold(artifact=None):
+    """Threshold artefak yang akan dimuat load_model_bundle, dibaca dari metadata.json
+    tanpa memuat model; RISK_THRESHOLD untuk model legacy atau metadata yang tidak terbaca."""
+    path = resolve_artifact(artifact)
+    if not path:
+        return RISK_THRESHOLD
+    try:
+        with open(os.path.join(path, "metadata.json")) as f:
+            return float(json.load(f)["threshold"])
+    except (OSError, ValueError, KeyError):
+        return RISK_THRESHOLD
+
+
+def load_model_bundle(artifact=None):
+    """Muat artefak versi terbaru (atau `artifact`), fallback ke file legacy
+    catboost_optimized.cbm + feature_names.pkl dengan threshold default."""
+    path = resolve_artifact(artifact)
+    if path:
+        return load_artifact(path)
+    model, feature_names = load_model()
+    return ModelBundle(model, feature_names, RISK_THRESHOLD, "legacy")
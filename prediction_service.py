@@ -0,0 +1,137 @@
+"""Layanan prediksi attrition dengan micro-batching.
+
+Bisa dipakai tanpa Streamlit:
+
+    service = PredictionService.from_files()
+    service.predict_many([record1, record2, ...])   # satu panggilan CatBoost
+    service.predict(record)                          # digabung dengan request lain
+"""
+import queue
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import Future
+
+import numpy as np
+from catboost import Pool
+
+from config import RISK_THRESHOLD
+from features import ENGINEERED_FEATURES, engineered_columns
+from model_store import load_model_bundle
+
+Prediction = namedtuple("Prediction", ["probability", "high_risk"])
+
+
+class PredictionService:
+
+    def __init__(self, model, feature_names, threshold=RISK_THRESHOLD,
+                 max_batch_size=256, max_wait_ms=5.0, thread_count=-1):
+        self.model = model
+        self.feature_names = list(feature_names)
+        self.threshold = threshold
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.thread_count = thread_count
+
+        self._cat_indices = model.get_cat_feature_indices()
+        self._col_index = {name: j for j, name in enumerate(self.feature_names)}
+        self._raw_features = [f for f in self.feature_names if f not in ENGINEERED_FEATURES]
+        # matriks fitur dialokasikan sekali, diisi ulang per batch (urutan feature_names)
+        self._buffer = np.zeros((max_batch_size, len(self.feature_names)), dtype=object)
+        self._buffer_lock = threading.Lock()
+
+        self._queue = queue.Queue()
+        self._worker = None
+        self._worker_lock = threading.Lock()
+        self._closed = False
+
+    @classmethod
+    def from_files(cls, **kwargs):
+        bundle = load_model_bundle()
+        kwargs.setdefault("threshold", bundle.threshold)
+        return cls(bundle.model, bundle.feature_names, **kwargs)
+
+    def predict_many(self, records):
+        """Prediksi banyak record (dict kolom mentah) sekaligus."""
+        results = []
+        for start in range(0, len(records), self.max_batch_size):
+            results.extend(self._predict_chunk(records[start:start + self.max_batch_size]))
+        return results
+
+    def _predict_chunk(self, records):
+        n = len(records)
+        with self._buffer_lock:
+            X = self._buffer[:n]
+            for name in self._raw_features:
+                j = self._col_index[name]
+                X[:, j] = [record.get(name, 0) for record in records]
+            raw = {name: X[:, self._col_index[name]] for name in self._raw_features}
+            for name, values in engineered_columns(raw).items():
+                if name in self._col_index:
+                    X[:, self._col_index[name]] = values
+            for j in self._cat_indices:
+                X[:, j] = [str(v) for v in X[:, j]]
+            proba = self.model.predict_proba(
+                Pool(X, cat_features=self._cat_indices), thread_count=self.thread_count
+            )[:, 1]
+        return [Prediction(float(p), bool(p >= self.threshold)) for p in proba]
+
+    def submit(self, record):
+        """Masukkan satu record ke antrean; hasil digabung dengan request lain yang
+        datang dalam jendela max_wait_ms. Mengembalikan Future[Prediction]."""
+        if self._closed:
+            raise RuntimeError("PredictionService sudah ditutup")
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((record, future))
+        return future
+
+    def predict(self, record, timeout=None):
+        return self.submit(record).result(timeout=timeout)
+
+    def close(self):
+        self._closed = True
+        if self._worker is not None:
+            self._queue.put(None)
+            self._worker.join()
+            self._worker = None
+
+    def _ensure_worker(self):
+        if self._worker is None:
+            with self._worker_lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._run, name="prediction-service", daemon=True)
+                    self._worker.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.max_wait
+            stop = False
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+
+            records = [record for record, _ in batch]
+            try:
+                predictions = self._predict_chunk(records)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+            else:
+                for (_, future), prediction in zip(batch, predictions):
+                    future.set_result(prediction)
+            if stop:
+                return
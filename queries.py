@@ -0,0 +1,146 @@
+import textwrap
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+from features import RAW_FEATURES
+from risk_index import RISK_DISTRIBUTION_QUERY
+from snapshot import GRAPH_VERSION_QUERY
+
+
+@dataclass(frozen=True)
+class NamedQuery:
+    name: str
+    cypher: str
+    # None = TTL default cache, 0 = tidak di-cache
+    ttl: Optional[int] = None
+
+
+class QueryRegistry:
+    """Daftar query Cypher bernama. Teks query tetap (hanya parameter yang berubah),
+    sehingga plan cache Neo4j bisa dipakai ulang, plus statistik waktu per query."""
+
+    def __init__(self):
+        self._queries = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def register(self, name, cypher, ttl=None):
+        if name in self._queries:
+            raise ValueError(f"query '{name}' sudah terdaftar")
+        query = NamedQuery(name=name, cypher=textwrap.dedent(cypher).strip(), ttl=ttl)
+        self._queries[name] = query
+        return query
+
+    def get(self, name):
+        try:
+            return self._queries[name]
+        except KeyError:
+            raise KeyError(f"query '{name}' tidak ada di registry") from None
+
+    def names(self):
+        return list(self._queries)
+
+    def record(self, name, seconds, rows):
+        with self._lock:
+            stat = self._stats.setdefault(name, {"calls": 0, "total_ms": 0.0, "max_ms": 0.0, "last_ms": 0.0, "rows": 0})
+            ms = seconds * 1000
+            stat["calls"] += 1
+            stat["total_ms"] += ms
+            stat["max_ms"] = max(stat["max_ms"], ms)
+            stat["last_ms"] = ms
+            stat["rows"] = rows
+
+    def stats(self):
+        with self._lock:
+            return [
+                {"query": name, "avg_ms": s["total_ms"] / s["calls"], **s}
+                for name, s in sorted(self._stats.items())
+            ]
+
+
+HIGH_RISK_MATCH = """
+MATCH (e:Employee)-[:WORKS_IN]->(d:Department)
+MATCH (e)-[:HAS_ROLE]->(r:JobRole)
+WHERE e.AttritionRisk >= $threshold
+  AND ($dept IS NULL OR d.name = $dept)
+  AND ($role IS NULL OR r.name = $role)
+"""
+
+HIGH_RISK_RETURN = """
+RETURN e.EmployeeID, r.name as Role, d.name as Dept, e.MonthlyIncome as Gaji,
+       toFloat(e.AttritionRisk) as Risk
+ORDER BY e.AttritionRisk DESC, e.EmployeeID
+"""
+
+GRAPH_REL_TYPES = ["HAS_ROLE", "WORKS_IN", "INCLUDES_ROLE"]
+
+QUERIES = QueryRegistry()
+
+QUERIES.register("graph_version", GRAPH_VERSION_QUERY, ttl=0)
+# di-cache per versi graph di app sebagai RiskIndex (slider threshold)
+QUERIES.register("risk_distribution", RISK_DISTRIBUTION_QUERY, ttl=0)
+
+QUERIES.register("high_risk_page", HIGH_RISK_MATCH + """
+  AND ($after_risk IS NULL OR e.AttritionRisk < $after_risk
+       OR (e.AttritionRisk = $after_risk AND e.EmployeeID > $after_id))
+""" + HIGH_RISK_RETURN + "LIMIT $limit")
+QUERIES.register("high_risk_export", HIGH_RISK_MATCH + HIGH_RISK_RETURN, ttl=0)
+
+QUERIES.register("graph_paths", """
+MATCH (a)-[r:HAS_ROLE|WORKS_IN|INCLUDES_ROLE]->(b)
+WHERE type(r) IN $rel_types
+RETURN a, labels(a) as a_labels, type(r) as rel, b, labels(b) as b_labels
+LIMIT $limit
+""")
+
+# graph explorer: hanya properti yang dibutuhkan renderer
+QUERIES.register("graph_role_members", """
+MATCH (e:Employee)-[:WORKS_IN]->(:Department {name: $dept})
+MATCH (e)-[:HAS_ROLE]->(:JobRole {name: $role})
+RETURN e.EmployeeID AS id, e.AttritionRisk AS risk
+ORDER BY e.AttritionRisk DESC, e.EmployeeID
+LIMIT $limit
+""")
+QUERIES.register("graph_employee_detail", """
+MATCH (e:Employee {EmployeeID: $id})
+RETURN e.EmployeeID AS EmployeeID, e.Department AS Department, e.JobRole AS JobRole,
+       e.Age AS Age, e.MonthlyIncome AS MonthlyIncome, e.OverTime AS OverTime,
+       e.YearsAtCompany AS YearsAtCompany, e.AttritionRisk AS AttritionRisk
+""")
+
+# profil mentah satu karyawan (input model) untuk what-if sweep tab5
+QUERIES.register("employee_record", """
+MATCH (e:Employee {EmployeeID: $id})
+RETURN e {.EmployeeID, %s} AS e
+""" % ", ".join("." + col for col in RAW_FEATURES))
+
+# penjelasan SHAP hasil shap_batch.py
+QUERIES.register("employee_drivers", """
+UNWIND $ids AS id
+MATCH (e:Employee {EmployeeID: id})
+WHERE e.TopDrivers IS NOT NULL
+RETURN e.EmployeeID AS id, e.TopDrivers AS drivers, e.TopDriverShap AS shap
+""")
+# di-cache per versi graph di app (seperti snapshot)
+QUERIES.register("driver_summary", """
+MATCH (s:DriverSummary)
+UNWIND range(0, size(s.features) - 1) AS i
+RETURN s.dept AS dept, s.role AS role, s.n AS n, s.risk_n AS risk_n, s.threshold AS threshold,
+       s.features[i] AS feature, s.shap_sum[i] AS shap_sum, s.risk_shap_sum[i] AS risk_shap_sum
+""", ttl=0)
+
+# karyawan serupa (edge SIMILAR_TO dari similarity.py)
+ATTRITION_LABEL = "CASE n.Attrition WHEN 'Yes' THEN 1 WHEN 'No' THEN 0 ELSE toInteger(n.Attrition) END"
+QUERIES.register("similar_employees", """
+MATCH (:Employee {EmployeeID: $id})-[s:SIMILAR_TO]->(n:Employee)
+RETURN n.EmployeeID AS id, s.rank AS rank, s.score AS score, n.Department AS Dept, n.JobRole AS Role,
+       toFloat(n.AttritionRisk) AS Risk, %s AS Attrition
+ORDER BY s.rank
+LIMIT $limit
+""" % ATTRITION_LABEL)
+QUERIES.register("similar_attrition", """
+UNWIND $ids AS id
+MATCH (:Employee {EmployeeID: id})-[:SIMILAR_TO]->(n:Employee)
+RETURN id, count(n) AS k, sum(%s) AS left
+""" % ATTRITION_LABEL)
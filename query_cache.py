@@ -0,0 +1,97 @@
+import json
+import pickle
+import re
+import threading
+import time
+from collections import OrderedDict
+
+_WS = re.compile(r"\s+")
+
+
+def normalize_query(query):
+    return _WS.sub(" ", query).strip()
+
+
+def make_key(query, params=None):
+    return normalize_query(query) + "|" + json.dumps(params or {}, sort_keys=True, default=str)
+
+
+class QueryCache:
+    """LRU cache hasil run_cypher dengan TTL per entry dan batas memori (byte)."""
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, default_ttl=300):
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, query, params=None):
+        key = make_key(query, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, size, value = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                self._drop(key)
+            self.misses += 1
+            return False, None
+
+    def put(self, query, params, value, ttl=None):
+        """Simpan value; mengembalikan ukurannya (byte pickle) atau None bila tidak disimpan."""
+        ttl = self.default_ttl if ttl is None else ttl
+        if ttl <= 0:
+            return None
+        size = len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        if size > self.max_bytes:
+            return size
+        key = make_key(query, params)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + ttl, size, value)
+            self._size += size
+            while self._size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+        return size
+
+    def invalidate(self, query=None, params=None):
+        """Tanpa argumen: kosongkan seluruh cache. Dengan query: hapus entry itu saja
+        (atau semua varian parameternya bila params None)."""
+        with self._lock:
+            if query is None:
+                self._entries.clear()
+                self._size = 0
+                return
+            if params is not None:
+                key = make_key(query, params)
+                if key in self._entries:
+                    self._drop(key)
+                return
+            prefix = normalize_query(query) + "|"
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                self._drop(key)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def _drop(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._size -= size
@@ -0,0 +1,193 @@
+"""Retry dengan backoff, circuit breaker dan metrik kesehatan untuk akses database.
+
+    breaker = CircuitBreaker(failure_threshold=5, reset_timeout=30)
+    rows = breaker.call(lambda: retry(fetch, retries=2, base_delay=0.2, retry_if=is_transient))
+
+Breaker terbuka setelah `failure_threshold` kegagalan beruntun. Selama terbuka,
+panggilan langsung gagal dengan CircuitOpenError (tanpa menunggu timeout jaringan).
+Setelah `reset_timeout` detik satu panggilan percobaan dibiarkan lewat (half-open):
+sukses menutup breaker, gagal membukanya lagi.
+"""
+import random
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Panggilan ditolak karena breaker terbuka."""
+
+    def __init__(self, retry_in):
+        super().__init__(f"database sedang tidak tersedia, dicoba lagi otomatis dalam {retry_in:.0f} detik")
+        self.retry_in = retry_in
+
+
+def is_transient(exc):
+    """Error yang layak diulang: driver Neo4j menandainya lewat is_retryable()
+    (ServiceUnavailable, SessionExpired, TransientError)."""
+    check = getattr(exc, "is_retryable", None)
+    return bool(check()) if callable(check) else isinstance(exc, (ConnectionError, TimeoutError))
+
+
+def is_pool_timeout(exc):
+    # antrean pool koneksi penuh: bukan tanda database mati, jadi tidak diulang
+    # dan tidak dihitung breaker
+    return type(exc).__name__ == "ConnectionAcquisitionTimeoutError"
+
+
+def backoff_delays(retries, base_delay=0.2, max_delay=5.0):
+    """Exponential backoff dengan full jitter: acak di [0, min(max, base * 2^i)]."""
+    for attempt in range(retries):
+        yield random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+
+
+def retry(fn, retries=2, base_delay=0.2, max_delay=5.0, retry_if=is_transient, on_retry=None):
+    """Panggil fn(); ulangi maksimal `retries` kali bila retry_if(exc) benar."""
+    delays = backoff_delays(retries, base_delay, max_delay)
+    while True:
+        try:
+            return fn()
+        except Exception as e:
+            delay = next(delays, None) if retry_if(e) else None
+            if delay is None:
+                raise
+            if on_retry is not None:
+                on_retry(e, delay)
+            time.sleep(delay)
+
+
+class CircuitBreaker:
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+        self.opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self):
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            return HALF_OPEN
+        return self._state
+
+    def before_call(self):
+        """Izinkan panggilan atau lempar CircuitOpenError. Mengembalikan True bila panggilan
+        ini adalah percobaan half-open; teruskan ke record_* / release sebagai `probe`."""
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return False
+            if state == HALF_OPEN and not self._probing:
+                # hanya satu panggilan percobaan; sisanya tetap ditolak sampai hasilnya jelas
+                self._probing = True
+                return True
+            self.rejected += 1
+            retry_in = max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+        raise CircuitOpenError(retry_in)
+
+    def record_success(self, probe=False):
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            if probe:
+                self._probing = False
+
+    def record_failure(self, probe=False):
+        # hanya panggilan pemilik probe yang menutup status probing; kegagalan panggilan
+        # lama yang sudah berjalan sebelum half-open tidak boleh membuka probe kedua
+        with self._lock:
+            self._failures += 1
+            if probe or (self._state == CLOSED and self._failures >= self.failure_threshold):
+                self.opened += 1
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                # periode open baru: probe berikutnya boleh lewat setelah reset_timeout
+                self._probing = False
+
+    def release(self, probe=False):
+        # panggilan selesai tanpa vonis (mis. error query, bukan error koneksi)
+        if probe:
+            with self._lock:
+                self._probing = False
+
+    def call(self, fn, is_failure=is_transient):
+        probe = self.before_call()
+        try:
+            result = fn()
+        except Exception as e:
+            if is_failure(e):
+                self.record_failure(probe)
+            else:
+                self.release(probe)
+            raise
+        self.record_success(probe)
+        return result
+
+    def stats(self):
+        with self._lock:
+            return {"state": self._current_state(), "consecutive_failures": self._failures,
+                    "opened": self.opened, "rejected": self.rejected}
+
+
+class AccessMetrics:
+    """Statistik bergulir: waktu antre pool (acquire + BEGIN) dipisah dari waktu query."""
+
+    def __init__(self, window=500):
+        self.acquire_ms = deque(maxlen=window)
+        self.query_ms = deque(maxlen=window)
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.pool_timeouts = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.last_error = None
+        self._lock = threading.Lock()
+
+    def begin(self):
+        with self._lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def end(self, acquire_ms=None, query_ms=None, error=None):
+        with self._lock:
+            self.in_flight -= 1
+            if acquire_ms is not None:
+                self.acquire_ms.append(acquire_ms)
+            if query_ms is not None:
+                self.query_ms.append(query_ms)
+            if error is not None:
+                self.errors += 1
+                self.pool_timeouts += is_pool_timeout(error)
+                self.last_error = f"{type(error).__name__}: {error}"
+
+    def retried(self):
+        with self._lock:
+            self.retries += 1
+
+    def stats(self):
+        with self._lock:
+            result = {"calls": self.calls, "errors": self.errors, "retries": self.retries,
+                      "pool_timeouts": self.pool_timeouts, "in_flight": self.in_flight,
+                      "peak_in_flight": self.peak_in_flight, "last_error": self.last_error}
+            for name, samples in (("acquire", self.acquire_ms), ("query", self.query_ms)):
+                ms = np.asarray(samples, dtype=float)
+                result[f"{name}_p50_ms"] = float(np.percentile(ms, 50)) if len(ms) else None
+                result[f"{name}_p95_ms"] = float(np.percentile(ms, 95)) if len(ms) else None
+            return result
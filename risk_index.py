@@ -0,0 +1,177 @@
+"""Indeks distribusi risiko per Department x JobRole untuk eksplorasi threshold.
+
+Satu query (risk_distribution) mengambil risiko semua karyawan per sel. Di
+Python setiap sel diurutkan menurut AttritionRisk dan disimpan prefix sum gaji,
+lembur, kepuasan lingkungan dan label Attrition. Angka KPI, tab1, tab4 dan
+jumlah high risk tab2 untuk threshold apa pun lalu dijawab dengan binary
+search per sel, tanpa query ke database.
+
+    index = build_risk_index(rows, version)
+    snap = index.snapshot(0.35)            # DashboardSnapshot
+    index.count(0.35, dept="Sales")
+    index.tradeoff(np.linspace(0.05, 0.95, 91))
+"""
+import numpy as np
+import pandas as pd
+
+from snapshot import build_snapshot
+
+# Satu baris per sel; list paralel per karyawan. Elemen null tetap ikut di collect
+# karena yang dikumpulkan adalah list, sehingga urutan antar kolom tetap sejajar.
+RISK_DISTRIBUTION_QUERY = """
+MATCH (e:Employee)
+WITH e.Department AS dept, e.JobRole AS role,
+     collect([e.AttritionRisk, e.MonthlyIncome, e.OverTime = 'Yes',
+              e.EnvironmentSatisfaction,
+              CASE e.Attrition WHEN 'Yes' THEN 1 WHEN 'No' THEN 0 ELSE toInteger(e.Attrition) END]) AS m
+RETURN dept, role, size(m) AS total,
+       [x IN m | x[0]] AS risk,
+       [x IN m | x[1]] AS income,
+       [x IN m | x[2]] AS overtime,
+       [x IN m | x[3]] AS env_sat,
+       [x IN m | x[4]] AS attrition
+"""
+
+VALUE_COLUMNS = ["income", "overtime", "env_sat", "attrition"]
+
+
+def _prefix(values):
+    """Prefix sum dengan 0 di depan; NaN dihitung 0."""
+    return np.concatenate([[0.0], np.cumsum(np.nan_to_num(values))])
+
+
+def _prefix_count(values):
+    return np.concatenate([[0], np.cumsum(~np.isnan(values))])
+
+
+class RiskIndex:
+    """Risiko terurut naik per sel (segmen [start, end) di array gabungan) plus prefix sum.
+
+    Karyawan tanpa AttritionRisk ikut `total` tetapi tidak masuk risiko maupun aman,
+    sama seperti perbandingan null di Cypher."""
+
+    def __init__(self, dept, role, total, risk, values, version=None):
+        self.dept = list(dept)
+        self.role = list(role)
+        self.total = np.asarray(total, dtype=np.int64)
+        self.version = version
+        self.starts = np.zeros(len(self.dept), dtype=np.int64)
+        self.ends = np.zeros(len(self.dept), dtype=np.int64)
+
+        risks, columns, offset = [], {name: [] for name in VALUE_COLUMNS}, 0
+        for i, cell_risk in enumerate(risk):
+            cell_risk = np.asarray(cell_risk, dtype=np.float64)
+            keep = ~np.isnan(cell_risk)
+            order = np.argsort(cell_risk[keep], kind="stable")
+            risks.append(cell_risk[keep][order])
+            for name in VALUE_COLUMNS:
+                columns[name].append(np.asarray(values[name][i], dtype=np.float64)[keep][order])
+            self.starts[i], offset = offset, offset + len(order)
+            self.ends[i] = offset
+
+        self.risk = np.concatenate(risks) if risks else np.zeros(0)
+        self.risk_prefix = _prefix(self.risk)
+        self.sums = {name: _prefix(np.concatenate(columns[name]) if risks else np.zeros(0))
+                     for name in VALUE_COLUMNS}
+        self.counts = {name: _prefix_count(np.concatenate(columns[name]) if risks else np.zeros(0))
+                       for name in VALUE_COLUMNS}
+
+        # distribusi global untuk kurva trade-off (precision/recall per threshold)
+        order = np.argsort(self.risk, kind="stable")
+        self.global_risk = self.risk[order]
+        labels = np.concatenate(columns["attrition"])[order] if risks else np.zeros(0)
+        self.label_prefix = _prefix(labels)
+        self.label_count = _prefix_count(labels)
+
+    @property
+    def n(self):
+        return int(self.total.sum())
+
+    @property
+    def has_labels(self):
+        return bool(self.label_count[-1])
+
+    def _splits(self, threshold):
+        """Posisi pertama dengan risk >= threshold di setiap sel."""
+        return np.fromiter(
+            (start + np.searchsorted(self.risk[start:end], threshold, side="left")
+             for start, end in zip(self.starts, self.ends)),
+            dtype=np.int64, count=len(self.starts),
+        )
+
+    def _cell_mask(self, dept=None, role=None):
+        mask = np.ones(len(self.dept), dtype=bool)
+        if dept is not None:
+            mask &= np.asarray([d == dept for d in self.dept])
+        if role is not None:
+            mask &= np.asarray([r == role for r in self.role])
+        return mask
+
+    def cell_rows(self, threshold):
+        """Baris sel dengan kolom snapshot.CELL_COLUMNS untuk build_snapshot."""
+        starts, ends, splits = self.starts, self.ends, self._splits(threshold)
+
+        def between(prefix, lo, hi):
+            return prefix[hi] - prefix[lo]
+
+        sums, counts = self.sums, self.counts
+        cells = {
+            "total": self.total,
+            "risk_count": ends - splits,
+            "risk_sum": between(self.risk_prefix, starts, ends),
+            "risk_n": ends - starts,
+            "income_risk_sum": between(sums["income"], splits, ends),
+            "income_risk_n": between(counts["income"], splits, ends),
+            "income_safe_sum": between(sums["income"], starts, splits),
+            "income_safe_n": between(counts["income"], starts, splits),
+            "overtime_risk": between(sums["overtime"], splits, ends),
+            "env_sat_risk_sum": between(sums["env_sat"], splits, ends),
+            "env_sat_risk_n": between(counts["env_sat"], splits, ends),
+        }
+        rows = []
+        for i in range(len(self.dept)):
+            row = {"dept": self.dept[i], "role": self.role[i]}
+            row.update({key: values[i].item() for key, values in cells.items()})
+            rows.append(row)
+        return rows
+
+    def snapshot(self, threshold):
+        return build_snapshot(self.cell_rows(threshold), threshold, self.version)
+
+    def count(self, threshold, dept=None, role=None):
+        """Jumlah karyawan dengan risk >= threshold, opsional per dept/role."""
+        mask = self._cell_mask(dept, role)
+        return int((self.ends[mask] - self._splits(threshold)[mask]).sum())
+
+    def tradeoff(self, thresholds):
+        """Per threshold: jumlah/porsi karyawan yang ditandai, serta precision & recall
+        terhadap label Attrition (NaN bila label tidak tersedia)."""
+        thresholds = np.asarray(thresholds, dtype=np.float64)
+        n = len(self.global_risk)
+        cut = np.searchsorted(self.global_risk, thresholds, side="left")
+        flagged = n - cut
+        positives = self.label_prefix[n] - self.label_prefix[cut]
+        labelled = self.label_count[n] - self.label_count[cut]
+        total_positive = self.label_prefix[n]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            precision = np.where(labelled > 0, positives / labelled, np.nan)
+            recall = np.full(len(thresholds), np.nan) if total_positive == 0 else positives / total_positive
+        return pd.DataFrame({
+            "Threshold": thresholds,
+            "Flagged": flagged,
+            "Share": flagged / n if n else np.zeros(len(thresholds)),
+            "Precision": precision,
+            "Recall": recall,
+        })
+
+
+def build_risk_index(rows, version=None):
+    """rows: hasil query risk_distribution (list per sel, boleh berisi None)."""
+    return RiskIndex(
+        dept=[row["dept"] for row in rows],
+        role=[row["role"] for row in rows],
+        total=[row["total"] for row in rows],
+        risk=[row["risk"] for row in rows],
+        values={name: [row[name] for row in rows] for name in VALUE_COLUMNS},
+        version=version,
+    )
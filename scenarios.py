@@ -0,0 +1,111 @@
+"""What-if sweep intervensi untuk satu karyawan (tab5).
+
+Semua kombinasi intervensi (kenaikan gaji, lembur, opsi saham, promosi)
+disusun sebagai satu matriks, fitur rekayasa dihitung ulang secara vektor,
+lalu dinilai dalam satu panggilan predict_proba.
+
+    result = sweep(model, feature_names, record, threshold=0.279)
+    result.surface       # DataFrame: kombinasi intervensi + Risk + Cost
+    result.cheapest      # intervensi termurah yang menurunkan risiko di bawah threshold
+"""
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+from catboost import Pool
+
+from config import RISK_THRESHOLD
+from features import RAW_FEATURES, engineered_columns, build_feature_frame
+
+SWEEP_AXES = {
+    "RaisePct": [0, 5, 10, 15, 20, 25, 30],
+    "OverTime": ["No", "Yes"],
+    "StockOptionLevel": [0, 1, 2, 3],
+    "PromotionReset": [False, True],
+}
+
+# asumsi biaya tahunan (USD) untuk memilih intervensi termurah; sesuaikan kebijakan HR
+OVERTIME_OFF_COST_PCT = 0.10      # backfill jam lembur, % gaji tahunan
+STOCK_LEVEL_COST = 2000           # per kenaikan satu level opsi saham
+PROMOTION_COST_PCT = 0.05         # premi promosi, % gaji tahunan
+
+SweepResult = namedtuple("SweepResult", ["surface", "baseline_risk", "cheapest", "threshold"])
+
+
+def scenario_grid(axes=SWEEP_AXES):
+    """Produk kartesius semua nilai intervensi, satu baris per skenario."""
+    index = pd.MultiIndex.from_product(list(axes.values()), names=list(axes.keys()))
+    return index.to_frame(index=False)
+
+
+def apply_scenarios(record, grid):
+    """Salin record mentah ke setiap baris grid lalu terapkan intervensinya."""
+    n = len(grid)
+    columns = {name: np.repeat(np.asarray([record.get(name, 0)], dtype=object), n) for name in RAW_FEATURES}
+    base_income = float(record.get("MonthlyIncome", 0))
+    columns["MonthlyIncome"] = base_income * (1 + grid["RaisePct"].to_numpy(dtype=float) / 100)
+    columns["OverTime"] = grid["OverTime"].to_numpy(dtype=object)
+    columns["StockOptionLevel"] = grid["StockOptionLevel"].to_numpy()
+    columns["YearsSinceLastPromotion"] = np.where(
+        grid["PromotionReset"].to_numpy(), 0, record.get("YearsSinceLastPromotion", 0)
+    )
+    frame = pd.DataFrame(columns)
+    return frame.assign(**engineered_columns(frame))
+
+
+def scenario_cost(record, grid):
+    """Estimasi biaya tahunan tiap skenario relatif terhadap kondisi saat ini."""
+    annual = 12 * float(record.get("MonthlyIncome", 0))
+    raise_cost = annual * grid["RaisePct"].to_numpy(dtype=float) / 100
+    overtime_cost = np.where((record.get("OverTime") == "Yes") & (grid["OverTime"] == "No"),
+                             annual * OVERTIME_OFF_COST_PCT, 0.0)
+    stock_steps = np.maximum(grid["StockOptionLevel"].to_numpy() - int(record.get("StockOptionLevel", 0)), 0)
+    promotion_cost = np.where(grid["PromotionReset"].to_numpy(), annual * PROMOTION_COST_PCT, 0.0)
+    return raise_cost + overtime_cost + stock_steps * STOCK_LEVEL_COST + promotion_cost
+
+
+def is_intervention(record, grid):
+    """Skenario yang tidak memperburuk kondisi (mis. tidak menambah lembur atau mencabut saham)."""
+    overtime_ok = (grid["OverTime"] == record.get("OverTime")) | (grid["OverTime"] == "No")
+    stock_ok = grid["StockOptionLevel"] >= int(record.get("StockOptionLevel", 0))
+    return (overtime_ok & stock_ok).to_numpy()
+
+
+def sweep(model, feature_names, record, threshold=RISK_THRESHOLD, axes=SWEEP_AXES, thread_count=-1):
+    grid = scenario_grid(axes)
+    # baris 0 = kondisi saat ini, sisanya grid; semuanya satu panggilan model
+    baseline = pd.DataFrame([{name: record.get(name, 0) for name in RAW_FEATURES}])
+    frames = pd.concat([baseline.assign(**engineered_columns(baseline)), apply_scenarios(record, grid)],
+                       ignore_index=True)
+    pool = Pool(build_feature_frame(frames, feature_names), cat_features=model.get_cat_feature_indices())
+    proba = model.predict_proba(pool, thread_count=thread_count)[:, 1]
+    baseline_risk, risk = float(proba[0]), proba[1:]
+
+    surface = grid.assign(
+        Risk=risk,
+        Cost=scenario_cost(record, grid),
+        Feasible=is_intervention(record, grid),
+    )
+    below = surface[surface["Feasible"] & (surface["Risk"] < threshold)]
+    cheapest = None
+    if baseline_risk < threshold:
+        cheapest = {"RaisePct": 0, "OverTime": record.get("OverTime"),
+                    "StockOptionLevel": record.get("StockOptionLevel"), "PromotionReset": False,
+                    "Risk": baseline_risk, "Cost": 0.0}
+    elif not below.empty:
+        cheapest = below.sort_values(["Cost", "Risk"]).iloc[0].drop("Feasible").to_dict()
+    return SweepResult(surface, baseline_risk, cheapest, threshold)
+
+
+def describe_intervention(record, scenario):
+    """Ringkasan bahasa manusia untuk satu baris skenario."""
+    steps = []
+    if scenario["RaisePct"]:
+        steps.append(f"naikkan gaji {scenario['RaisePct']:.0f}%")
+    if scenario["OverTime"] != record.get("OverTime"):
+        steps.append("hentikan lembur" if scenario["OverTime"] == "No" else "tambah lembur")
+    if scenario["StockOptionLevel"] != record.get("StockOptionLevel"):
+        steps.append(f"opsi saham level {int(scenario['StockOptionLevel'])}")
+    if scenario["PromotionReset"]:
+        steps.append("promosikan")
+    return ", ".join(steps) if steps else "tanpa intervensi"
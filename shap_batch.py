@@ -0,0 +1,198 @@
+"""Batch penjelasan SHAP per karyawan ("kenapa orang ini high risk").
+
+ShapValues CatBoost dihitung per chunk (multi-thread), lalu top-k fitur
+dengan kontribusi terbesar disimpan per karyawan (properti TopDrivers /
+TopDriverShap di node Employee) dan agregat per Department x JobRole
+disimpan di node DriverSummary, sehingga dashboard tinggal membaca.
+
+    python shap_batch.py --source csv --output-dir .          # untuk mode lokal
+    python shap_batch.py --source neo4j --write-neo4j --top-k 5 --threads 8
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from catboost import Pool
+
+from config import db_uri, db_user, db_pass, db_name, LOCAL_DRIVERS_PATH, LOCAL_DRIVER_SUMMARY_PATH
+from features import add_engineered_features, build_feature_frame
+from model_store import load_model_bundle
+from snapshot import BUMP_GRAPH_VERSION_QUERY
+from batch_scoring import DEFAULT_CHUNK_SIZE, iter_csv_chunks, iter_neo4j_chunks
+
+DEFAULT_TOP_K = 3
+
+WRITE_DRIVERS_QUERY = """
+UNWIND $rows AS row
+MATCH (e:Employee {EmployeeID: row.EmployeeID})
+SET e.TopDrivers = row.TopDrivers,
+    e.TopDriverShap = row.TopDriverShap
+"""
+
+WRITE_SUMMARY_QUERY = """
+MATCH (s:DriverSummary) DETACH DELETE s
+WITH count(*) AS _
+UNWIND $cells AS cell
+CREATE (s:DriverSummary)
+SET s = cell, s.updated_at = datetime()
+"""
+
+# threshold: batas high risk yang dipakai untuk risk_n / risk_shap_sum saat batch dijalankan
+SUMMARY_COLUMNS = ["dept", "role", "feature", "n", "risk_n", "shap_sum", "risk_shap_sum", "threshold"]
+
+
+def shap_values(model, X, thread_count=-1):
+    """Matriks SHAP (n_baris, n_fitur) dalam skala log-odds, tanpa kolom expected value."""
+    pool = Pool(X, cat_features=model.get_cat_feature_indices())
+    values = model.get_feature_importance(pool, type="ShapValues", thread_count=thread_count)
+    return values[:, :-1]
+
+
+def top_drivers(shap, feature_names, k=DEFAULT_TOP_K):
+    """Top-k fitur per baris berdasarkan |SHAP|, diurutkan dari yang terbesar."""
+    idx = np.argsort(-np.abs(shap), axis=1)[:, :k]
+    names = np.asarray(feature_names, dtype=object)[idx]
+    return names, np.take_along_axis(shap, idx, axis=1)
+
+
+def drivers_frame(employee_ids, names, values):
+    """Format lebar: EmployeeID, Driver1, Driver1Shap, Driver2, ..."""
+    out = {"EmployeeID": np.asarray(employee_ids)}
+    for j in range(names.shape[1]):
+        out[f"Driver{j + 1}"] = names[:, j]
+        out[f"Driver{j + 1}Shap"] = values[:, j]
+    return pd.DataFrame(out)
+
+
+def cell_sums(df, shap, feature_names, is_risk):
+    """Jumlah SHAP per (dept, role, fitur), total & khusus high risk; bisa dijumlah antar chunk."""
+    keys = pd.MultiIndex.from_arrays([df["Department"].to_numpy(), df["JobRole"].to_numpy()], names=["dept", "role"])
+    frame = pd.DataFrame(shap, index=keys, columns=feature_names)
+    sums = frame.groupby(level=[0, 1]).sum()
+    risk_sums = frame[is_risk].groupby(level=[0, 1]).sum().reindex(sums.index, fill_value=0.0)
+    counts = pd.Series(1, index=keys).groupby(level=[0, 1]).sum()
+    risk_counts = pd.Series(is_risk.astype(np.int64), index=keys).groupby(level=[0, 1]).sum()
+    return sums, risk_sums, counts, risk_counts
+
+
+def summary_rows(sums, risk_sums, counts, risk_counts, threshold):
+    """Agregat -> baris panjang (dept, role, feature, n, risk_n, shap_sum, risk_shap_sum, threshold)."""
+    long = sums.stack().rename("shap_sum").to_frame()
+    long["risk_shap_sum"] = risk_sums.stack()
+    long = long.reset_index()
+    long.columns = ["dept", "role", "feature", "shap_sum", "risk_shap_sum"]
+    cell_index = pd.MultiIndex.from_frame(long[["dept", "role"]])
+    long["n"] = counts.reindex(cell_index).to_numpy()
+    long["risk_n"] = risk_counts.reindex(cell_index).to_numpy()
+    long["threshold"] = float(threshold)
+    return long[SUMMARY_COLUMNS]
+
+
+def summary_cells(summary):
+    """Baris panjang -> satu dict per sel untuk node DriverSummary (properti list)."""
+    cells = []
+    for (dept, role), group in summary.groupby(["dept", "role"], sort=True):
+        cells.append({
+            "dept": dept, "role": role,
+            "n": int(group["n"].iloc[0]), "risk_n": int(group["risk_n"].iloc[0]),
+            "threshold": float(group["threshold"].iloc[0]),
+            "features": group["feature"].tolist(),
+            "shap_sum": group["shap_sum"].astype(float).tolist(),
+            "risk_shap_sum": group["risk_shap_sum"].astype(float).tolist(),
+        })
+    return cells
+
+
+def write_drivers(driver, drivers, database=db_name, batch_size=DEFAULT_CHUNK_SIZE):
+    names = drivers.filter(regex=r"^Driver\d+$").to_numpy()
+    values = drivers.filter(regex=r"^Driver\d+Shap$").to_numpy(dtype=np.float64)
+    rows = [
+        {"EmployeeID": int(emp_id), "TopDrivers": list(n), "TopDriverShap": [float(v) for v in vals]}
+        for emp_id, n, vals in zip(drivers["EmployeeID"], names, values)
+    ]
+    with driver.session(database=database) as session:
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            session.execute_write(lambda tx: tx.run(WRITE_DRIVERS_QUERY, rows=batch).consume())
+
+
+def run_explain(chunks, model, feature_names, threshold, top_k=DEFAULT_TOP_K, thread_count=-1,
+                driver=None, database=db_name, drivers_output=None):
+    started = time.perf_counter()
+    n_rows = 0
+    totals = None
+    wrote_header = False
+    for df in chunks:
+        X = build_feature_frame(add_engineered_features(df), feature_names)
+        shap = shap_values(model, X, thread_count)
+        names, values = top_drivers(shap, feature_names, top_k)
+        drivers = drivers_frame(df["EmployeeID"], names, values)
+        if driver is not None:
+            write_drivers(driver, drivers, database=database)
+        if drivers_output is not None:
+            drivers.to_csv(drivers_output, mode="a" if wrote_header else "w", header=not wrote_header, index=False)
+            wrote_header = True
+
+        is_risk = df["AttritionRisk"].to_numpy(dtype=np.float64) >= threshold
+        parts = cell_sums(df, shap, feature_names, is_risk)
+        totals = parts if totals is None else tuple(a.add(b, fill_value=0) for a, b in zip(totals, parts))
+        n_rows += len(df)
+        elapsed = time.perf_counter() - started
+        print(f"  {n_rows:,} karyawan dijelaskan ({n_rows / elapsed:,.0f} baris/detik)")
+
+    summary = summary_rows(*totals, threshold) if totals is not None else pd.DataFrame(columns=SUMMARY_COLUMNS)
+    if driver is not None and n_rows:
+        with driver.session(database=database) as session:
+            session.execute_write(lambda tx: tx.run(WRITE_SUMMARY_QUERY, cells=summary_cells(summary)).consume())
+            session.run(BUMP_GRAPH_VERSION_QUERY).consume()
+    return summary, {"rows": n_rows, "seconds": time.perf_counter() - started}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hitung top-k pemicu risiko (SHAP) per karyawan.")
+    parser.add_argument("--source", choices=["csv", "neo4j"], default="csv")
+    parser.add_argument("--csv", default="final_employee_data.csv", help="file input untuk --source csv")
+    parser.add_argument("--output-dir", help="tulis employee_drivers.csv & driver_summary.csv (mode lokal)")
+    parser.add_argument("--write-neo4j", action="store_true", help="tulis TopDrivers & DriverSummary ke Neo4j")
+    parser.add_argument("--top-k", type=int, default=DEFAULT_TOP_K)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--threads", type=int, default=-1, help="thread CatBoost per chunk (-1 = semua core)")
+    parser.add_argument("--artifact", help="direktori artefak train.py (default: models/LATEST)")
+    args = parser.parse_args(argv)
+
+    bundle = load_model_bundle(args.artifact)
+
+    driver = None
+    if args.source == "neo4j" or args.write_neo4j:
+        from neo4j import GraphDatabase
+        driver = GraphDatabase.driver(db_uri, auth=(db_user, db_pass))
+
+    drivers_output = summary_output = None
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+        drivers_output = os.path.join(args.output_dir, os.path.basename(LOCAL_DRIVERS_PATH))
+        summary_output = os.path.join(args.output_dir, os.path.basename(LOCAL_DRIVER_SUMMARY_PATH))
+
+    try:
+        if args.source == "neo4j":
+            chunks = iter_neo4j_chunks(driver, args.chunk_size)
+        else:
+            chunks = iter_csv_chunks(args.csv, args.chunk_size)
+        summary, stats = run_explain(
+            chunks, bundle.model, bundle.feature_names, bundle.threshold, args.top_k, args.threads,
+            driver=driver if args.write_neo4j else None, drivers_output=drivers_output,
+        )
+    finally:
+        if driver is not None:
+            driver.close()
+
+    if summary_output is not None:
+        summary.to_csv(summary_output, index=False)
+    print(f"Selesai: {stats['rows']:,} karyawan, {summary[['dept', 'role']].drop_duplicates().shape[0]} sel "
+          f"dept x role, {stats['seconds']:.1f} detik")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""Cache bersama antar proses Streamlit di satu host (tier kedua di belakang QueryCache).
+
+Setiap entry adalah satu file di direktori bersama (default /dev/shm, yaitu shared
+memory). Isinya pickle protocol 5; buffer NumPy disimpan out-of-band sesudah pickle
+lalu dibaca lewat mmap, sehingga array besar (mis. RiskIndex) memakai halaman
+memori yang sama di semua worker, bukan salinan per proses.
+
+Entry ditulis ke file sementara lalu os.replace (atomik). Recompute entry yang
+kedaluwarsa memakai flock (single-flight): satu worker menghitung, worker lain
+menunggu lalu membaca hasilnya. File lock berjumlah tetap (LOCK_STRIPES, dipilih
+dari hash key) sehingga tidak menumpuk di direktori seiring bertambahnya key.
+
+    cache = SharedCache("/dev/shm/hr-dashboard", max_bytes=256 * 1024 * 1024)
+    rows = cache.get_or_compute("neo4j|driver_summary|{}", lambda: backend.run("driver_summary"), ttl=300)
+"""
+import hashlib
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: tanpa single-flight antar proses
+    fcntl = None
+
+MAGIC = b"HRC1"
+# magic, expires_at (epoch), panjang pickle, jumlah buffer out-of-band
+HEADER = struct.Struct("<4sdQI")
+ALIGN = 64
+ENTRY_SUFFIX = ".entry"
+LOCK_SUFFIX = ".lock"
+# key berbeda bisa berbagi stripe; akibatnya hanya sesekali menunggu recompute key lain
+LOCK_STRIPES = 64
+
+
+def _digest(key):
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def _aligned(offset):
+    return (offset + ALIGN - 1) // ALIGN * ALIGN
+
+
+class SharedCache:
+    """Cache key -> value berbasis file mmap dengan TTL, batas ukuran dan single-flight."""
+
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024, default_ttl=300, lock_timeout=60):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.lock_timeout = lock_timeout
+        os.makedirs(self.directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.waits = 0
+        self.computes = 0
+        self.evictions = 0
+
+    def _path(self, key, suffix=ENTRY_SUFFIX):
+        return os.path.join(self.directory, _digest(key) + suffix)
+
+    def _count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _read(self, key):
+        try:
+            with open(self._path(key), "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                if size < HEADER.size:
+                    return False, None
+                mm = mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            return False, None
+        magic, expires_at, pickle_len, n_buffers = HEADER.unpack_from(mm, 0)
+        if magic != MAGIC or expires_at <= time.time():
+            mm.close()
+            return False, None
+        view = memoryview(mm)
+        offset = HEADER.size
+        lengths = struct.unpack_from(f"<{n_buffers}Q", mm, offset)
+        offset += 8 * n_buffers
+        data = view[offset:offset + pickle_len]
+        offset += pickle_len
+        buffers = []
+        for length in lengths:
+            offset = _aligned(offset)
+            buffers.append(view[offset:offset + length])
+            offset += length
+        # array NumPy hasil unpickle menunjuk langsung ke mmap (read-only); mmap tetap
+        # hidup selama masih ada array yang mereferensikannya
+        return True, pickle.loads(data, buffers=buffers)
+
+    def get(self, key):
+        hit, value = self._read(key)
+        self._count("hits" if hit else "misses")
+        return hit, value
+
+    def put(self, key, value, ttl=None):
+        """Simpan value; mengembalikan ukuran file (byte) atau None bila tidak disimpan."""
+        ttl = self.default_ttl if ttl is None else ttl
+        if ttl <= 0:
+            return None
+        buffers = []
+        data = pickle.dumps(value, protocol=5, buffer_callback=buffers.append)
+        raws = [buffer.raw() for buffer in buffers]
+        header = HEADER.pack(MAGIC, time.time() + ttl, len(data), len(raws))
+        header += struct.pack(f"<{len(raws)}Q", *(raw.nbytes for raw in raws))
+        size = len(header) + len(data) + sum(_aligned(raw.nbytes) + ALIGN for raw in raws)
+        if size > self.max_bytes:
+            return size
+
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(header)
+                f.write(data)
+                for raw in raws:
+                    f.write(b"\0" * (_aligned(f.tell()) - f.tell()))
+                    f.write(raw)
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        self._evict()
+        return size
+
+    def get_or_compute(self, key, compute, ttl=None):
+        """Nilai dari cache, atau compute() oleh tepat satu proses bila kosong/kedaluwarsa.
+        Mengembalikan (value, computed); exception dari compute diteruskan, tidak di-cache."""
+        hit, value = self._read(key)
+        if hit:
+            self._count("hits")
+            return value, False
+        self._count("misses")
+        with self._key_lock(key):
+            # proses lain mungkin baru saja menghitung entry ini selagi kita menunggu lock
+            hit, value = self._read(key)
+            if hit:
+                self._count("waits")
+                return value, False
+            value = compute()
+            self._count("computes")
+            self.put(key, value, ttl)
+        return value, True
+
+    def _key_lock(self, key):
+        stripe = int(_digest(key)[:8], 16) % LOCK_STRIPES
+        return _FileLock(os.path.join(self.directory, f"stripe-{stripe:02d}{LOCK_SUFFIX}"), self.lock_timeout)
+
+    def _entries(self):
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(ENTRY_SUFFIX):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def _evict(self):
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return
+        now = time.time()
+        # yang tertua ditulis dibuang lebih dulu (mtime = waktu terakhir dihitung)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            self._count("evictions")
+        # file .tmp yatim dari proses yang mati di tengah put, dan file lock per key
+        # peninggalan versi sebelum stripe
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                legacy_lock = entry.name.endswith(LOCK_SUFFIX) and not entry.name.startswith("stripe-")
+                if not (entry.name.endswith(".tmp") or legacy_lock):
+                    continue
+                # writer lain bisa me-rename file .tmp-nya kapan saja di antara scandir dan stat
+                try:
+                    if now - entry.stat().st_mtime > self.lock_timeout:
+                        os.unlink(entry.path)
+                except OSError:
+                    pass
+
+    def invalidate(self, key=None):
+        """Tanpa argumen: hapus semua entry (berlaku untuk semua worker). Dengan key: entry itu saja."""
+        paths = [self._path(key)] if key is not None else [path for _, _, path in self._entries()]
+        for path in paths:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+    def stats(self):
+        entries = self._entries()
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(entries),
+                "bytes": sum(size for _, size, _ in entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "waits": self.waits,
+                "computes": self.computes,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+class _FileLock:
+    """flock eksklusif per stripe key; setelah timeout dilepas agar worker tidak menunggu selamanya."""
+
+    def __init__(self, path, timeout):
+        self.path = path
+        self.timeout = timeout
+        self._file = None
+
+    def __enter__(self):
+        if fcntl is None:
+            return self
+        self._file = open(self.path, "a+b")
+        deadline = time.monotonic() + self.timeout
+        delay = 0.005
+        while True:
+            try:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return self
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    break
+            time.sleep(delay)
+            delay = min(delay * 2, 0.1)
+        # pemegang lock macet: hitung sendiri daripada menunggu tanpa batas
+        self._file.close()
+        self._file = None
+        return self
+
+    def __exit__(self, *exc):
+        if self._file is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+        return False
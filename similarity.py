@@ -0,0 +1,263 @@
+"""Indeks k-NN "karyawan serupa" dan edge SIMILAR_TO.
+
+Karyawan di-embed dari fitur model: kolom numerik di-standardisasi, kolom
+kategori di-one-hot, lalu setiap fitur diberi bobot akar feature importance
+CatBoost sehingga jarak mengikuti apa yang dianggap penting oleh model.
+Vektor dinormalisasi L2 dan kemiripan = cosine (satu perkalian matriks).
+
+Tetangga dicari sekali secara batch, bukan saat query di Cypher (O(n^2)):
+exact per blok untuk organisasi kecil, IVF (k-means + probe cluster terdekat)
+untuk organisasi besar. Top-k disimpan sebagai edge (:Employee)-[:SIMILAR_TO
+{rank, score}]->(:Employee) atau employee_neighbors.csv untuk mode lokal.
+
+    python similarity.py --source csv --output-dir .
+    python similarity.py --source neo4j --write-neo4j --top-k 10 --method ivf
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from config import db_uri, db_user, db_pass, db_name, LOCAL_NEIGHBORS_PATH
+from features import CATEGORICAL_FEATURES, add_engineered_features, build_feature_frame
+from model_store import load_model_bundle
+from snapshot import BUMP_GRAPH_VERSION_QUERY
+from batch_scoring import DEFAULT_CHUNK_SIZE, iter_csv_chunks, iter_neo4j_chunks
+
+DEFAULT_TOP_K = 10
+# di atas ini exact (n^2) terlalu mahal, pakai IVF
+EXACT_MAX_ROWS = 50_000
+DEFAULT_BLOCK_SIZE = 2048
+# batas elemen matriks kemiripan per blok (~128 MB float32)
+MAX_BLOCK_ELEMENTS = 32 * 1024 * 1024
+DEFAULT_N_PROBE = 8
+RECALL_SAMPLE = 1000
+
+# edge lama yang tidak lagi termasuk top-k dihapus per sumber, jadi penulisan ulang idempotent
+WRITE_SIMILAR_QUERY = """
+UNWIND $rows AS row
+MATCH (a:Employee {EmployeeID: row.id})
+OPTIONAL MATCH (a)-[old:SIMILAR_TO]->(x:Employee)
+WHERE NOT x.EmployeeID IN row.neighbors
+DELETE old
+WITH DISTINCT a, row
+UNWIND range(0, size(row.neighbors) - 1) AS i
+MATCH (b:Employee {EmployeeID: row.neighbors[i]})
+MERGE (a)-[s:SIMILAR_TO]->(b)
+SET s.rank = i + 1, s.score = row.scores[i], s.version = $version
+"""
+
+
+def embed(df, feature_names, importance=None):
+    """Matriks embedding float32 (n, d) dengan baris ber-norma 1."""
+    X = build_feature_frame(add_engineered_features(df), feature_names)
+    weights = np.ones(len(feature_names)) if importance is None else np.asarray(importance, dtype=np.float64)
+    weights = np.sqrt(weights / weights.sum() * len(feature_names))
+
+    blocks = []
+    for name, weight in zip(feature_names, weights):
+        if weight == 0:
+            continue
+        if name in CATEGORICAL_FEATURES:
+            # selisih satu kategori = jarak kuadrat 1, setara satu simpangan baku
+            onehot = pd.get_dummies(X[name], dtype=np.float32).to_numpy() / np.sqrt(2)
+            blocks.append(onehot * weight)
+        else:
+            values = pd.to_numeric(X[name], errors="coerce").to_numpy(dtype=np.float64)
+            values = np.nan_to_num(values, nan=np.nanmean(values) if np.isfinite(values).any() else 0.0)
+            std = values.std()
+            blocks.append((((values - values.mean()) / std if std else values * 0) * weight)[:, None])
+    E = np.hstack(blocks).astype(np.float32)
+    norms = np.linalg.norm(E, axis=1, keepdims=True)
+    return E / np.where(norms == 0, 1, norms)
+
+
+def _top_k(S, k, exclude=None):
+    """Top-k kolom per baris dari matriks kemiripan S; exclude = kolom diri sendiri per baris."""
+    if exclude is not None:
+        S[np.arange(len(S)), exclude] = -np.inf
+    if S.shape[1] <= k:
+        S = np.hstack([S, np.full((len(S), k + 1 - S.shape[1]), -np.inf, dtype=S.dtype)])
+    part = np.argpartition(-S, k, axis=1)[:, :k]
+    values = np.take_along_axis(S, part, axis=1)
+    order = np.argsort(-values, axis=1, kind="stable")
+    return np.take_along_axis(part, order, axis=1), np.take_along_axis(values, order, axis=1)
+
+
+def _block_rows(block_size, n_columns):
+    return max(1, min(block_size, MAX_BLOCK_ELEMENTS // max(n_columns, 1)))
+
+
+def exact_knn(E, k=DEFAULT_TOP_K, block_size=DEFAULT_BLOCK_SIZE, rows=None):
+    """Top-k tetangga per baris (tanpa diri sendiri), dihitung per blok baris.
+    Kembalikan (indeks, kemiripan); indeks -1 bila tetangga kurang dari k."""
+    rows = np.arange(len(E)) if rows is None else np.asarray(rows)
+    block_size = _block_rows(block_size, len(E))
+    neighbors = np.empty((len(rows), k), dtype=np.int64)
+    scores = np.empty((len(rows), k), dtype=np.float32)
+    for start in range(0, len(rows), block_size):
+        block = rows[start:start + block_size]
+        idx, val = _top_k(E[block] @ E.T, k, exclude=block)
+        neighbors[start:start + len(block)] = np.where(np.isfinite(val), idx, -1)
+        scores[start:start + len(block)] = val
+    return neighbors, scores
+
+
+def kmeans(E, n_lists, iters=10, seed=0, sample=100_000, block_size=DEFAULT_BLOCK_SIZE):
+    """Spherical k-means (centroid ber-norma 1) pada sampel baris."""
+    rng = np.random.default_rng(seed)
+    X = E[rng.choice(len(E), min(sample, len(E)), replace=False)]
+    centroids = X[rng.choice(len(X), n_lists, replace=False)].copy()
+    for _ in range(iters):
+        assign = assign_lists(X, centroids, block_size)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, X)
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        # cluster kosong mempertahankan centroid lama
+        centroids = np.where(norms > 0, sums / np.where(norms == 0, 1, norms), centroids)
+    return centroids
+
+
+def assign_lists(E, centroids, block_size=DEFAULT_BLOCK_SIZE):
+    return np.concatenate([
+        np.argmax(E[start:start + block_size] @ centroids.T, axis=1)
+        for start in range(0, len(E), block_size)
+    ]) if len(E) else np.zeros(0, dtype=np.int64)
+
+
+def ivf_knn(E, k=DEFAULT_TOP_K, n_lists=None, n_probe=DEFAULT_N_PROBE, iters=10, seed=0,
+            block_size=DEFAULT_BLOCK_SIZE):
+    """Top-k approximate: baris dikelompokkan ke n_lists cluster, lalu anggota satu
+    cluster dibandingkan hanya dengan anggota n_probe cluster terdekat (termasuk dirinya)."""
+    n = len(E)
+    n_lists = n_lists or max(1, int(np.sqrt(n)))
+    n_probe = min(n_probe, n_lists)
+    centroids = kmeans(E, n_lists, iters, seed, block_size=block_size)
+    assign = assign_lists(E, centroids, block_size)
+    order = np.argsort(assign, kind="stable")
+    members = np.split(order, np.flatnonzero(np.diff(assign[order])) + 1)
+    list_of = {int(assign[m[0]]): m for m in members if len(m)}
+    centroid_sims = centroids @ centroids.T
+    np.fill_diagonal(centroid_sims, np.inf)  # cluster sendiri selalu diperiksa
+    probes = np.argsort(-centroid_sims, axis=1)[:, :n_probe]
+
+    neighbors = np.full((n, k), -1, dtype=np.int64)
+    scores = np.full((n, k), -np.inf, dtype=np.float32)
+    for c, queries in list_of.items():
+        candidates = np.concatenate([list_of[p] for p in probes[c] if p in list_of])
+        position = {int(row): j for j, row in enumerate(candidates)}
+        step = _block_rows(block_size, len(candidates))
+        for start in range(0, len(queries), step):
+            block = queries[start:start + step]
+            self_col = np.fromiter((position[int(row)] for row in block), dtype=np.int64, count=len(block))
+            idx, val = _top_k(E[block] @ E[candidates].T, k, exclude=self_col)
+            found = np.isfinite(val)
+            neighbors[block] = np.where(found, candidates[np.minimum(idx, len(candidates) - 1)], -1)
+            scores[block] = val
+    return neighbors, scores
+
+
+def recall_at_k(E, neighbors, sample=RECALL_SAMPLE, seed=0):
+    """Porsi tetangga exact yang ikut ditemukan, pada sampel baris."""
+    rng = np.random.default_rng(seed)
+    rows = rng.choice(len(E), min(sample, len(E)), replace=False)
+    exact, _ = exact_knn(E, neighbors.shape[1], rows=rows)
+    hits = [len(np.intersect1d(a[a >= 0], b[b >= 0])) for a, b in zip(neighbors[rows], exact)]
+    return float(np.sum(hits) / max((exact >= 0).sum(), 1))
+
+
+def neighbors_frame(employee_ids, neighbors, scores):
+    """Format panjang: EmployeeID, NeighborID, Rank, Similarity (satu baris per edge)."""
+    employee_ids = np.asarray(employee_ids)
+    k = neighbors.shape[1]
+    found = neighbors >= 0
+    return pd.DataFrame({
+        "EmployeeID": np.repeat(employee_ids, k)[found.ravel()],
+        "NeighborID": employee_ids[neighbors[found]],
+        "Rank": np.tile(np.arange(1, k + 1), len(employee_ids))[found.ravel()],
+        "Similarity": scores[found].astype(np.float64).round(4),
+    })
+
+
+def write_similar(driver, frame, version, database=db_name, batch_size=DEFAULT_CHUNK_SIZE):
+    rows = [
+        {"id": int(emp_id), "neighbors": group["NeighborID"].astype(int).tolist(),
+         "scores": group["Similarity"].astype(float).tolist()}
+        for emp_id, group in frame.sort_values(["EmployeeID", "Rank"]).groupby("EmployeeID", sort=False)
+    ]
+    with driver.session(database=database) as session:
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            session.execute_write(lambda tx: tx.run(WRITE_SIMILAR_QUERY, rows=batch, version=version).consume())
+        session.run(BUMP_GRAPH_VERSION_QUERY).consume()
+
+
+def build_neighbors(df, model, feature_names, k=DEFAULT_TOP_K, method="auto", n_probe=DEFAULT_N_PROBE, seed=0):
+    started = time.perf_counter()
+    E = embed(df, feature_names, model.get_feature_importance())
+    embed_seconds = time.perf_counter() - started
+    if method == "auto":
+        method = "exact" if len(E) <= EXACT_MAX_ROWS else "ivf"
+    if method == "exact":
+        neighbors, scores = exact_knn(E, k)
+    else:
+        neighbors, scores = ivf_knn(E, k, n_probe=n_probe, seed=seed)
+    stats = {"rows": len(E), "dims": E.shape[1], "method": method, "embed_seconds": embed_seconds,
+             "knn_seconds": time.perf_counter() - started - embed_seconds}
+    if method != "exact":
+        stats["recall"] = recall_at_k(E, neighbors, seed=seed)
+    return neighbors_frame(df["EmployeeID"].to_numpy(), neighbors, scores), stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bangun indeks karyawan serupa (k-NN) dan edge SIMILAR_TO.")
+    parser.add_argument("--source", choices=["csv", "neo4j"], default="csv")
+    parser.add_argument("--csv", default="final_employee_data.csv", help="file input untuk --source csv")
+    parser.add_argument("--output-dir", help="tulis employee_neighbors.csv (mode lokal)")
+    parser.add_argument("--write-neo4j", action="store_true", help="tulis edge SIMILAR_TO ke Neo4j")
+    parser.add_argument("--top-k", type=int, default=DEFAULT_TOP_K)
+    parser.add_argument("--method", choices=["auto", "exact", "ivf"], default="auto",
+                        help=f"auto = exact sampai {EXACT_MAX_ROWS:,} karyawan, selebihnya ivf")
+    parser.add_argument("--n-probe", type=int, default=DEFAULT_N_PROBE, help="cluster yang diperiksa (ivf)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--artifact", help="direktori artefak train.py (default: models/LATEST)")
+    args = parser.parse_args(argv)
+
+    bundle = load_model_bundle(args.artifact)
+
+    driver = None
+    if args.source == "neo4j" or args.write_neo4j:
+        from neo4j import GraphDatabase
+        driver = GraphDatabase.driver(db_uri, auth=(db_user, db_pass))
+
+    try:
+        if args.source == "neo4j":
+            chunks = iter_neo4j_chunks(driver, args.chunk_size)
+        else:
+            chunks = iter_csv_chunks(args.csv, args.chunk_size)
+        df = pd.concat(list(chunks), ignore_index=True)
+        frame, stats = build_neighbors(df, bundle.model, bundle.feature_names, args.top_k, args.method,
+                                       args.n_probe, args.seed)
+        if args.write_neo4j:
+            started = time.perf_counter()
+            write_similar(driver, frame, bundle.version)
+            stats["write_seconds"] = time.perf_counter() - started
+    finally:
+        if driver is not None:
+            driver.close()
+
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+        frame.to_csv(os.path.join(args.output_dir, os.path.basename(LOCAL_NEIGHBORS_PATH)), index=False)
+    recall = f", recall@{args.top_k} ~{stats['recall']:.1%}" if "recall" in stats else ""
+    print(f"Selesai: {stats['rows']:,} karyawan, {len(frame):,} edge SIMILAR_TO ({stats['method']}, "
+          f"{stats['dims']} dimensi{recall}); embed {stats['embed_seconds']:.1f} detik, "
+          f"k-NN {stats['knn_seconds']:.1f} detik "
+          f"({stats['rows'] / max(stats['knn_seconds'], 1e-9):,.0f} baris/detik)")
+
+
+if __name__ == "__main__":
+    main()
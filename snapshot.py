@@ -0,0 +1,94 @@
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+# Versi dataset dinaikkan setiap kali graph di-load ulang / di-score ulang,
+# dipakai sebagai bagian dari cache key snapshot.
+GRAPH_VERSION_QUERY = """
+OPTIONAL MATCH (m:GraphMeta {key: 'dataset'})
+RETURN m.version AS version
+"""
+
+BUMP_GRAPH_VERSION_QUERY = """
+MERGE (m:GraphMeta {key: 'dataset'})
+SET m.version = coalesce(m.version, 0) + 1,
+    m.updated_at = datetime()
+RETURN m.version AS version
+"""
+
+# Agregat per (Department, JobRole) dari risk_index.RiskIndex.cell_rows; semua angka
+# di KPI, tab1 dan tab4 diturunkan dari sel-sel ini di Python.
+CELL_COLUMNS = [
+    "dept", "role", "total", "risk_count", "risk_sum", "risk_n",
+    "income_risk_sum", "income_risk_n", "income_safe_sum", "income_safe_n",
+    "overtime_risk", "env_sat_risk_sum", "env_sat_risk_n",
+]
+
+
+def _ratio(num, den):
+    return num / den if den else None
+
+
+@dataclass(frozen=True)
+class DashboardSnapshot:
+    threshold: float
+    cells: pd.DataFrame = field(repr=False)
+    version: object = None
+
+    @property
+    def total(self):
+        return int(self.cells["total"].sum())
+
+    @property
+    def risk_count(self):
+        return int(self.cells["risk_count"].sum())
+
+    @property
+    def risk_pct(self):
+        return (self.risk_count / self.total * 100) if self.total > 0 else 0
+
+    @property
+    def avg_risk(self):
+        return _ratio(self.cells["risk_sum"].sum(), self.cells["risk_n"].sum())
+
+    @property
+    def avg_income_risk(self):
+        return _ratio(self.cells["income_risk_sum"].sum(), self.cells["income_risk_n"].sum())
+
+    @property
+    def avg_income_safe(self):
+        return _ratio(self.cells["income_safe_sum"].sum(), self.cells["income_safe_n"].sum())
+
+    @property
+    def overtime_risk(self):
+        return int(self.cells["overtime_risk"].sum())
+
+    @property
+    def avg_env_satisfaction_risk(self):
+        return _ratio(self.cells["env_sat_risk_sum"].sum(), self.cells["env_sat_risk_n"].sum())
+
+    @property
+    def dept_to_roles(self):
+        mapping = {}
+        for dept, group in self.cells.dropna(subset=["dept", "role"]).groupby("dept", sort=True):
+            mapping[dept] = sorted(group["role"].unique().tolist())
+        return mapping
+
+    def risk_hierarchy(self):
+        df = self.cells[self.cells["risk_count"] > 0]
+        return df.rename(columns={"dept": "Dept", "role": "Role", "risk_count": "Jumlah"})[["Dept", "Role", "Jumlah"]]
+
+    def top_roles(self, n=5):
+        df = self.cells.groupby("role", as_index=False)["risk_count"].sum()
+        df = df[df["risk_count"] > 0].sort_values("risk_count", ascending=False).head(n)
+        return df.rename(columns={"role": "Role", "risk_count": "Count"}).reset_index(drop=True)
+
+    def top_departments(self, n=3):
+        df = self.cells.groupby("dept", as_index=False)["risk_count"].sum()
+        df = df[df["risk_count"] > 0].sort_values("risk_count", ascending=False).head(n)
+        return df.rename(columns={"dept": "Dept", "risk_count": "Jumlah"}).reset_index(drop=True)
+
+
+def build_snapshot(rows, threshold, version=None):
+    cells = pd.DataFrame(rows, columns=CELL_COLUMNS)
+    return DashboardSnapshot(threshold=threshold, cells=cells, version=version)
@@ -0,0 +1,79 @@
+"""Pencatatan waktu startup dan pemuatan resource berat di background."""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class StartupTimer:
+
+    def __init__(self):
+        self.created = time.perf_counter()
+        self._phases = {}
+        self._lock = threading.Lock()
+
+    def record(self, phase, ms, once=False):
+        with self._lock:
+            if once and phase in self._phases:
+                return
+            self._phases[phase] = {
+                "phase": phase,
+                "ms": ms,
+                "thread": threading.current_thread().name,
+            }
+
+    def timed(self, phase, fn):
+        def wrapper():
+            started = time.perf_counter()
+            try:
+                return fn()
+            finally:
+                self.record(phase, (time.perf_counter() - started) * 1000)
+        return wrapper
+
+    def report(self):
+        with self._lock:
+            return sorted(self._phases.values(), key=lambda p: -p["ms"])
+
+
+class Deferred:
+    """Resource yang mulai dimuat di background dan baru ditunggu saat dipakai."""
+
+    def __init__(self, phase, fn, timer, executor):
+        self.phase = phase
+        self._fn = timer.timed(phase, fn)
+        self._executor = executor
+        self._future = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._future is None:
+                self._future = self._executor.submit(self._fn)
+            return self._future
+
+    def ready(self):
+        return self._future is not None and self._future.done()
+
+    def get(self, timeout=None):
+        return self.start().result(timeout=timeout)
+
+    def reset(self):
+        # get() berikutnya memuat ulang resource
+        with self._lock:
+            self._future = None
+
+
+class Startup:
+
+    def __init__(self, loaders, max_workers=2):
+        self.timer = StartupTimer()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="startup")
+        self.resources = {
+            name: Deferred(phase, fn, self.timer, self._executor)
+            for name, (phase, fn) in loaders.items()
+        }
+        for resource in self.resources.values():
+            resource.start()
+
+    def __getitem__(self, name):
+        return self.resources[name]
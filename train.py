@@ -0,0 +1,232 @@
+"""Training CatBoost + tuning Optuna (versi skrip dari notebook training).
+
+Study disimpan di SQLite sehingga bisa dilanjutkan, trial dijalankan paralel
+oleh beberapa proses worker yang berbagi storage yang sama, dan trial yang
+buruk dipangkas (MedianPruner) setelah setiap fold CV.
+
+    python train.py --trials 100 --workers 8
+    python train.py --trials 50 --workers 8 --study attrition-v2   # lanjutkan / study baru
+"""
+import argparse
+import datetime
+import json
+import os
+import pickle
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from model_store import ARTIFACT_ROOT, LATEST_FILE, MODEL_PATH, FEATURE_NAMES_PATH
+
+DEFAULT_DATA = os.path.join("ML Training & Dataset", "HR-Employee-Attrition.csv")
+DEFAULT_STORAGE = "sqlite:///optuna_attrition.db"
+SEED = 42
+
+
+def load_training_data(path=DEFAULT_DATA):
+    df = pd.read_csv(path, encoding="utf-8-sig")
+    df = df.drop(['EmployeeCount', 'StandardHours', 'Over18', 'EmployeeNumber'], axis=1, errors='ignore')
+    df['Attrition'] = df['Attrition'].map({'Yes': 1, 'No': 0})
+
+    df['TotalSatisfaction'] = df['JobSatisfaction'] + df['EnvironmentSatisfaction'] + df['RelationshipSatisfaction'] + df['JobInvolvement']
+    df['YearsAtCompany'] = df['YearsAtCompany'].replace(0, 0.1)
+    df['YearsInCurrentRole'] = df['YearsInCurrentRole'].replace(0, 0.1)
+    df['CareerStability'] = df['YearsInCurrentRole'] / df['YearsAtCompany']
+    df['LoyaltyRatio'] = df['YearsAtCompany'] / df['TotalWorkingYears'].replace(0, 1)
+    # overwork tanpa pay raise
+    df['IncomePerAge'] = df['MonthlyIncome'] / df['Age']
+
+    drop_cols = ['Gender', 'PerformanceRating', 'DailyRate', 'HourlyRate', 'MonthlyRate', 'PercentSalaryHike']
+    df = df.drop(drop_cols, axis=1, errors='ignore')
+
+    X = df.drop('Attrition', axis=1)
+    y = df['Attrition']
+    categorical_features = X.select_dtypes(include=['object', 'category', 'string']).columns.tolist()
+    for col in categorical_features:
+        X[col] = X[col].astype(str)
+    return X, y, categorical_features
+
+
+def split_data(X, y):
+    from sklearn.model_selection import train_test_split
+    return train_test_split(X, y, test_size=0.2, random_state=SEED, stratify=y)
+
+
+def suggest_params(trial, categorical_features, thread_count):
+    return {
+        'iterations': trial.suggest_int('iterations', 200, 400),
+        'learning_rate': trial.suggest_float('learning_rate', 0.01, 0.1),
+        'depth': trial.suggest_int('depth', 4, 8),
+        'random_seed': SEED,
+        'task_type': 'CPU',
+        'thread_count': thread_count,
+        'l2_leaf_reg': trial.suggest_float('l2_leaf_reg', 3, 10),
+        'scale_pos_weight': trial.suggest_float('scale_pos_weight', 1.0, 3.5),
+        'loss_function': 'Logloss',
+        'eval_metric': 'Recall',
+        'verbose': False,
+        # tanpa catboost_info/ di direktori kerja (worker paralel juga tidak saling tulis)
+        'allow_writing_files': False,
+        'cat_features': categorical_features,
+        'bootstrap_type': 'Bernoulli',
+        'subsample': 1.0,
+    }
+
+
+def make_objective(X_train, y_train, categorical_features, n_folds, thread_count):
+    from catboost import CatBoostClassifier
+    from sklearn.metrics import accuracy_score
+    from sklearn.model_selection import StratifiedKFold
+    import optuna
+
+    def objective(trial):
+        params = suggest_params(trial, categorical_features, thread_count)
+        cv = StratifiedKFold(n_splits=n_folds, shuffle=True, random_state=SEED)
+        scores = []
+        for fold, (train_idx, val_idx) in enumerate(cv.split(X_train, y_train)):
+            X_tr, X_val = X_train.iloc[train_idx], X_train.iloc[val_idx]
+            y_tr, y_val = y_train.iloc[train_idx], y_train.iloc[val_idx]
+
+            model = CatBoostClassifier(**params)
+            model.fit(X_tr, y_tr, eval_set=(X_val, y_val), early_stopping_rounds=10, verbose=False)
+            scores.append(accuracy_score(y_val, model.predict(X_val)))
+
+            trial.report(float(np.mean(scores)), fold)
+            if trial.should_prune():
+                raise optuna.TrialPruned()
+        return float(np.mean(scores))
+
+    return objective
+
+
+def open_study(study_name, storage):
+    import optuna
+    return optuna.create_study(
+        study_name=study_name,
+        storage=storage,
+        direction='maximize',
+        sampler=optuna.samplers.TPESampler(seed=SEED),
+        pruner=optuna.pruners.MedianPruner(n_startup_trials=5, n_warmup_steps=1),
+        load_if_exists=True,
+    )
+
+
+def _worker(study_name, storage, data_path, n_trials, n_folds, thread_count, worker_id):
+    import optuna
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    X, y, categorical_features = load_training_data(data_path)
+    X_train, _, y_train, _ = split_data(X, y)
+    study = open_study(study_name, storage)
+    # seed sampler berbeda per worker agar trial paralel tidak identik
+    study.sampler = optuna.samplers.TPESampler(seed=SEED + worker_id)
+    study.optimize(make_objective(X_train, y_train, categorical_features, n_folds, thread_count), n_trials=n_trials)
+    return n_trials
+
+
+def run_search(study_name, storage, data_path, n_trials, n_workers, n_folds, cpu_count=None):
+    cpu_count = cpu_count or os.cpu_count() or 1
+    n_workers = max(1, min(n_workers, n_trials))
+    thread_count = max(1, cpu_count // n_workers)
+    per_worker = [n_trials // n_workers + (1 if i < n_trials % n_workers else 0) for i in range(n_workers)]
+
+    open_study(study_name, storage)  # buat tabel storage sebelum worker paralel mulai
+    if n_workers == 1:
+        _worker(study_name, storage, data_path, per_worker[0], n_folds, thread_count, 0)
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            futures = [
+                pool.submit(_worker, study_name, storage, data_path, count, n_folds, thread_count, i)
+                for i, count in enumerate(per_worker)
+            ]
+            for future in futures:
+                future.result()
+    return open_study(study_name, storage)
+
+
+def fit_final(best_params, X, y, categorical_features):
+    from catboost import CatBoostClassifier
+    from sklearn.metrics import accuracy_score, f1_score, precision_recall_curve, roc_auc_score
+
+    X_train, X_test, y_train, y_test = split_data(X, y)
+    params = dict(best_params, cat_features=categorical_features, verbose=False, random_seed=SEED,
+                  allow_writing_files=False)
+    model = CatBoostClassifier(**params)
+    model.fit(X_train, y_train, eval_set=(X_test, y_test), early_stopping_rounds=50)
+
+    y_prob = model.predict_proba(X_test)[:, 1]
+    precision, recall, thresholds = precision_recall_curve(y_test, y_prob)
+    f1_scores = 2 * (precision * recall) / (precision + recall + 1e-9)
+    best_idx = int(f1_scores[:-1].argmax())
+    threshold = float(thresholds[best_idx])
+    y_pred = (y_prob >= threshold).astype(int)
+
+    metrics = {
+        "roc_auc": float(roc_auc_score(y_test, y_prob)),
+        "accuracy_at_threshold": float(accuracy_score(y_test, y_pred)),
+        "f1_at_threshold": float(f1_score(y_test, y_pred)),
+    }
+    return model, threshold, metrics
+
+
+def save_artifact(model, feature_names, threshold, metadata, root=ARTIFACT_ROOT, export_legacy=False):
+    version = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+    path = os.path.join(root, version)
+    os.makedirs(path, exist_ok=True)
+    model.save_model(os.path.join(path, "model.cbm"))
+    metadata = dict(metadata, version=version, threshold=threshold, feature_names=list(feature_names),
+                    created_at=datetime.datetime.now().isoformat(timespec="seconds"))
+    with open(os.path.join(path, "metadata.json"), "w") as f:
+        json.dump(metadata, f, indent=2)
+
+    # tulis LATEST terakhir supaya loader tidak pernah melihat artefak setengah jadi
+    tmp_latest = os.path.join(root, LATEST_FILE + ".tmp")
+    with open(tmp_latest, "w") as f:
+        f.write(version)
+    os.replace(tmp_latest, os.path.join(root, LATEST_FILE))
+
+    if export_legacy:
+        shutil.copyfile(os.path.join(path, "model.cbm"), MODEL_PATH)
+        with open(FEATURE_NAMES_PATH, "wb") as f:
+            pickle.dump(list(feature_names), f)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tuning & training model attrition CatBoost.")
+    parser.add_argument("--data", default=DEFAULT_DATA)
+    parser.add_argument("--trials", type=int, default=20, help="jumlah trial baru yang dijalankan")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="proses worker paralel")
+    parser.add_argument("--folds", type=int, default=3)
+    parser.add_argument("--study", default="attrition-catboost")
+    parser.add_argument("--storage", default=DEFAULT_STORAGE)
+    parser.add_argument("--artifact-root", default=ARTIFACT_ROOT)
+    parser.add_argument("--export-legacy", action="store_true",
+                        help="juga timpa catboost_optimized.cbm / feature_names.pkl")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    study = run_search(args.study, args.storage, args.data, args.trials, args.workers, args.folds)
+    complete = [t for t in study.trials if t.state.name == "COMPLETE"]
+    pruned = [t for t in study.trials if t.state.name == "PRUNED"]
+    print(f"Study '{args.study}': {len(complete)} selesai, {len(pruned)} dipangkas. "
+          f"Best CV Accuracy: {study.best_value:.4f}")
+    print("Best Params:", study.best_params)
+
+    X, y, categorical_features = load_training_data(args.data)
+    model, threshold, metrics = fit_final(study.best_params, X, y, categorical_features)
+    path = save_artifact(
+        model, X.columns, threshold,
+        {"study": args.study, "best_cv_accuracy": study.best_value, "params": study.best_params,
+         "metrics": metrics, "n_trials": len(study.trials)},
+        root=args.artifact_root, export_legacy=args.export_legacy,
+    )
+    print(f"Threshold: {threshold:.3f} | ROC AUC: {metrics['roc_auc']:.4f} | "
+          f"F1: {metrics['f1_at_threshold']:.4f}")
+    print(f"Artefak disimpan di {path} ({time.perf_counter() - started:.0f} detik)")
+
+
+if __name__ == "__main__":
+    main()